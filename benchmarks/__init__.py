@@ -0,0 +1,7 @@
+"""
+战地插件的性能基准测试。
+
+需要在AstrBot环境中以插件包的方式运行，例如在 data/plugins 目录下执行:
+    python -m astrbot_plugin_battlefield_tool.benchmarks.run --save baseline.json
+    python -m astrbot_plugin_battlefield_tool.benchmarks.run --baseline baseline.json
+"""
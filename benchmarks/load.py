@@ -0,0 +1,190 @@
+"""
+压测驱动：启动接口替身，把插件的接口地址指向替身，按目标速率发送模拟指令并统计延迟分位数。
+
+需要在AstrBot环境中运行:
+    python -m astrbot_plugin_battlefield_tool.benchmarks.load --rate 20 --duration 30 --error-rate 0.05
+"""
+from ..core import request_util
+from ..main import BattlefieldTool
+from .mock_server import MockUpstream
+
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, List
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+# (指令处理函数名, 消息内容)
+COMMAND_MIX = (
+    ("bf_stat", "stat BenchPlayer,game=bfv"),
+    ("bf_stat", "stat VetPlayer,game=bf1"),
+    ("bf_weapons", "weapons VetPlayer,game=bfv"),
+    ("bf_vehicles", "vehicles BenchPlayer,game=bf4"),
+    ("bf_stat", "stat BenchPlayer,game=bf2042"),
+    ("bf_weapons", "weapons BenchPlayer,game=bf2042"),
+    ("bf_stat", "stat BenchPlayer,game=bf6"),
+    ("bf_stat", "stat MultiPlayer,game=bf6"),
+    ("bf_servers", "servers BENCH,game=bfv"),
+)
+
+
+class SimulatedEvent:
+    """模拟 AstrMessageEvent 中插件用到的接口"""
+
+    def __init__(self, message_str: str, sender_id: str, group_id: str = "", platform: str = "aiocqhttp"):
+        self.message_str = message_str
+        self._sender_id = sender_id
+        self._group_id = group_id
+        self._platform = platform
+
+    def get_sender_id(self) -> str:
+        return self._sender_id
+
+    def get_group_id(self) -> str:
+        return self._group_id
+
+    def is_private_chat(self) -> bool:
+        return not self._group_id
+
+    def is_admin(self) -> bool:
+        return False
+
+    def get_platform_name(self) -> str:
+        return self._platform
+
+    def plain_result(self, text: str):
+        return SimpleNamespace(kind="plain", content=text)
+
+    def image_result(self, url_or_path: str):
+        return SimpleNamespace(kind="image", content=url_or_path)
+
+
+class SimulatedContext:
+    """模拟 Context 中插件用到的接口，推送的消息只计数"""
+
+    def __init__(self):
+        self.sent = 0
+
+    def get_config(self) -> dict:
+        return {"wake_prefix": ["/"]}
+
+    async def send_message(self, origin: str, chain) -> bool:
+        self.sent += 1
+        return True
+
+
+@dataclass
+class CommandStats:
+    latencies: List[float] = field(default_factory=list)
+    images: int = 0
+    texts: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _stub_html_render(html: str, data: dict = None, return_url: bool = True, options: dict = None) -> str:
+    """不启动浏览器，只模拟一次渲染的耗时"""
+    await asyncio.sleep(0.01)
+    return "http://127.0.0.1/stub.jpg"
+
+
+async def fire(plugin: BattlefieldTool, handler_name: str, message: str, sender: str, stats: CommandStats):
+    event = SimulatedEvent(message, sender, group_id="10000")
+    start = time.perf_counter()
+    try:
+        async for result in getattr(plugin, handler_name)(event):
+            if getattr(result, "kind", None) == "image":
+                stats.images += 1
+            else:
+                stats.texts += 1
+    except Exception as e:
+        name = type(e).__name__
+        stats.errors[name] = stats.errors.get(name, 0) + 1
+    finally:
+        stats.latencies.append(time.perf_counter() - start)
+
+
+async def run(args) -> int:
+    upstream = MockUpstream(args.latency, args.jitter, args.error_rate, args.rate_limit, args.seed)
+    base = await upstream.start(args.host, args.port)
+    original_sites = request_util.GAMETOOLS_API_SITE, request_util.BTR_API_SITE
+    request_util.GAMETOOLS_API_SITE = f"{base}/"
+    request_util.BTR_API_SITE = f"{base}/api"
+
+    config = {"refresh_enabled": False, "cache_ttl": args.cache_ttl}
+    plugin = BattlefieldTool(SimulatedContext(), config)
+    if not args.real_render:
+        # 渲染队列调用的是渲染后端，替换后端的 render 对 remote 和 local 都生效
+        plugin.renderer.render = _stub_html_render
+    await plugin.initialize()
+
+    stats: Dict[str, CommandStats] = {}
+    tasks = []
+    rng = random.Random(args.seed)
+    interval = 1 / args.rate
+    mix = itertools.cycle(COMMAND_MIX)
+    started = time.perf_counter()
+    try:
+        for i in itertools.count():
+            # 按固定速率发送，不等待上一条完成(开环压测)
+            target = started + i * interval
+            if target - started >= args.duration:
+                break
+            await asyncio.sleep(max(0.0, target - time.perf_counter()))
+            handler_name, message = next(mix)
+            command_stats = stats.setdefault(f"{handler_name} {message.split(',game=')[-1]}", CommandStats())
+            sender = str(rng.randint(1, args.users))
+            tasks.append(asyncio.create_task(fire(plugin, handler_name, message, sender, command_stats)))
+        await asyncio.gather(*tasks)
+    finally:
+        elapsed = time.perf_counter() - started
+        await plugin.terminate()
+        await upstream.stop()
+        request_util.GAMETOOLS_API_SITE, request_util.BTR_API_SITE = original_sites
+
+    print(f"共发送 {len(tasks)} 条指令，用时 {elapsed:.1f}s，上游请求 {upstream.requests} 次，状态码 {upstream.status_counts}")
+    print(f"{'指令':<24} {'次数':>6} {'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9} {'图片':>6} {'文本':>6}  异常")
+    all_latencies = []
+    for name, s in sorted(stats.items()):
+        all_latencies += s.latencies
+        print(f"{name:<24} {len(s.latencies):>6} {percentile(s.latencies, 50) * 1000:>9.0f} "
+              f"{percentile(s.latencies, 90) * 1000:>9.0f} {percentile(s.latencies, 99) * 1000:>9.0f} "
+              f"{max(s.latencies, default=0) * 1000:>9.0f} {s.images:>6} {s.texts:>6}  {s.errors or ''}")
+    print(f"{'全部':<24} {len(all_latencies):>6} {percentile(all_latencies, 50) * 1000:>9.0f} "
+          f"{percentile(all_latencies, 90) * 1000:>9.0f} {percentile(all_latencies, 99) * 1000:>9.0f} "
+          f"{max(all_latencies, default=0) * 1000:>9.0f}")
+    print(f"渲染队列: {plugin.render_scheduler.stats()}")
+    print(f"缓存: {plugin.api_handlers.cache.stats()}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="战地插件压测")
+    parser.add_argument("--rate", type=float, default=10, help="每秒发送的指令数")
+    parser.add_argument("--duration", type=float, default=30, help="压测时长(秒)")
+    parser.add_argument("--users", type=int, default=50, help="模拟的用户数")
+    parser.add_argument("--cache-ttl", type=int, default=300, help="插件接口缓存时间，0为不缓存")
+    parser.add_argument("--real-render", action="store_true", help="使用真实的html_render")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="替身接口的平均延迟(秒)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="替身接口延迟的随机浮动(秒)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="替身接口返回500的比例")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="替身接口返回429的比例")
+    parser.add_argument("--seed", type=int, default=1)
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
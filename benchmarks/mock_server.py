@@ -0,0 +1,140 @@
+"""
+GameTools / BTR 接口的本地替身，用于压测完整的指令链路。
+
+    python -m astrbot_plugin_battlefield_tool.benchmarks.mock_server --port 8765 --latency 0.2 --error-rate 0.05
+"""
+from .fixtures import fixture_bytes
+
+from aiohttp import web
+
+import argparse
+import asyncio
+import random
+import time
+
+_BTR_PLAYER_FIXTURES = {
+    "stat": "btr_stat",
+    "weapons": "btr_weapons",
+    "vehicles": "btr_vehicles",
+    "soldiers": "btr_soldiers",
+}
+
+
+class MockUpstream:
+    """按固定数据响应的接口替身，可以模拟延迟、服务端错误和限流"""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.02, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, seed: int = None):
+        """
+        Args:
+            latency: 平均响应延迟(秒)
+            jitter: 延迟的随机浮动(秒)
+            error_rate: 返回500的比例
+            rate_limit_rate: 返回429的比例
+            seed: 随机数种子，便于复现
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._rng = random.Random(seed)
+        # 预先序列化，避免压测时把替身自身的开销算进去
+        self._payloads = {}
+        self.requests = 0
+        self.status_counts = {}
+        self._runner = None
+
+    def _payload(self, name: str) -> bytes:
+        payload = self._payloads.get(name)
+        if payload is None:
+            payload = self._payloads[name] = fixture_bytes(name)
+        return payload
+
+    async def _respond(self, fixture: str) -> web.Response:
+        self.requests += 1
+        delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        await asyncio.sleep(delay)
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            status, body = 429, b'{"errors":["rate limited"]}'
+        elif roll < self.rate_limit_rate + self.error_rate:
+            status, body = 500, b'{"errors":["mock server error"]}'
+        else:
+            status, body = 200, self._payload(fixture)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        return web.Response(body=body, status=status, content_type="application/json")
+
+    async def handle_gametools(self, request: web.Request) -> web.Response:
+        prop = request.match_info["prop"]
+        if prop == "servers":
+            return await self._respond("gt_servers")
+        # 名称以 vet 开头的玩家返回大数据量
+        name = request.query.get("name", "")
+        return await self._respond("gt_veteran" if name.lower().startswith("vet") else "gt_small")
+
+    async def handle_btr_player(self, request: web.Request) -> web.Response:
+        fixture = _BTR_PLAYER_FIXTURES.get(request.match_info["kind"])
+        if fixture is None:
+            return web.json_response({"errors": ["not found"]}, status=404)
+        return await self._respond(fixture)
+
+    async def handle_bf6_stat(self, request: web.Request) -> web.Response:
+        # 名称以 multi 开头的玩家模拟查询到多个steam用户
+        name = request.query.get("player_name", "")
+        return await self._respond("bf6_multi_user" if name.lower().startswith("multi") else "bf6_player")
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/player/{kind}", self.handle_btr_player)
+        app.router.add_get("/api/bf6/stat", self.handle_bf6_stat)
+        app.router.add_get("/{game}/{prop}", self.handle_gametools)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> str:
+        """
+        启动替身服务
+        Returns:
+            服务的根地址
+        """
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args):
+    upstream = MockUpstream(args.latency, args.jitter, args.error_rate, args.rate_limit, args.seed)
+    base = await upstream.start(args.host, args.port)
+    print(f"GAMETOOLS_API_SITE = {base}/")
+    print(f"BTR_API_SITE = {base}/api")
+    started = time.monotonic()
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"{time.monotonic() - started:.0f}s 请求数 {upstream.requests} 状态码 {upstream.status_counts}")
+    finally:
+        await upstream.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GameTools / BTR 接口替身")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="平均响应延迟(秒)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="延迟的随机浮动(秒)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回500的比例")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="返回429的比例")
+    parser.add_argument("--seed", type=int, default=None)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
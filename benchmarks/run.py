@@ -0,0 +1,229 @@
+"""
+运行基准测试，输出每个用例的 ops/sec 和单次调用的内存分配，并可与基线结果对比。
+
+    python -m astrbot_plugin_battlefield_tool.benchmarks.run [--save out.json] [--baseline base.json]
+"""
+from ..core import json_util
+from ..core.cache_util import CompressedPayload
+from ..core.fragment_cache import card_fragments
+from ..core.gametool.gt_template import gt_main_html_builder, gt_weapons_html_builder, gt_vehicles_html_builder
+from ..core.gametool.gt_llm import gt_main_llm_builder
+from ..core.gametool.gt_image_generator import GtImageGenerator
+from ..core.gametool.gt_raster import GtRasterRenderer, raster_available
+from ..core.btr.btr_template import btr_main_html_builder, btr_weapons_html_builder, btr_vehicles_html_builder
+from ..core.btr.btr_llm import btr_main_llm_builder
+from ..models import btr_entities
+from ..models.gt_entities import PlayerStats as GtPlayerStats
+from ..models.btr_entities import PlayerStats as BtrPlayerStats
+from .fixtures import load_fixture, fixture_bytes
+
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import argparse
+import asyncio
+import inspect
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+_STUB_IMAGE = "data:image/png;base64,iVBORw0KGgo="
+_RASTER_DIR = Path(tempfile.gettempdir()) / "battlefield_tool_bench_raster"
+
+
+async def _stub_image_base64(image_url: str, timeout: int = 15) -> str:
+    """替代 get_image_base64，基准测试不访问网络"""
+    return _STUB_IMAGE
+
+
+async def _stub_html_render(html: str, data: dict = None, return_url: bool = True, options: dict = None) -> str:
+    """替代 html_render，只计算构建和调用开销"""
+    return "http://127.0.0.1/stub.jpg"
+
+
+async def _stub_load_icon(url: str, size: tuple):
+    """替代 GtRasterRenderer.load_icon，基准测试不下载图标"""
+    return None
+
+
+@dataclass
+class BenchResult:
+    name: str
+    ops_per_sec: float
+    mean_us: float
+    alloc_bytes: int
+    peak_bytes: int
+    iterations: int
+
+
+def _raster_cases(gt_small: dict) -> Dict[str, Callable[[], Any]]:
+    """Pillow绘制stat卡片的用例，包含绘制和JPEG编码，不下载图标，未安装Pillow时跳过"""
+    if not raster_available():
+        return {}
+    raster = GtRasterRenderer(_RASTER_DIR)
+    raster.load_icon = _stub_load_icon
+    return {"gt stat render (raster, stub icons)": lambda: raster.render_main(gt_small, "bfv")}
+
+
+def build_cases() -> Dict[str, Callable[[], Any]]:
+    """构建所有用例，每个用例是无参数的函数或协程函数"""
+    gt_small = load_fixture("gt_small")
+    gt_veteran = load_fixture("gt_veteran")
+    gt_veteran_raw = fixture_bytes("gt_veteran")
+    btr_stat = load_fixture("btr_stat")
+    btr_weapons = load_fixture("btr_weapons")
+    btr_vehicles = load_fixture("btr_vehicles")
+    btr_soldiers = load_fixture("btr_soldiers")
+    bf6_player = load_fixture("bf6_player")
+    bf6_multi_raw = fixture_bytes("bf6_multi_user")
+    bf6_segments = bf6_player["segments"]
+    bf6_weapons = [s for s in bf6_segments if s["type"] == "weapon"]
+    bf6_vehicles = [s for s in bf6_segments if s["type"] == "vehicle"]
+    bf6_soldiers = [s for s in bf6_segments if s["type"] == "kit"]
+    packed_veteran = CompressedPayload.pack(json_util.project_gt_payload(gt_veteran))
+    generator = GtImageGenerator()
+
+    return {
+        "json.loads gt_veteran": lambda: json_util.loads(gt_veteran_raw),
+        "json.loads bf6_multi_user": lambda: json_util.loads(bf6_multi_raw),
+        "project_gt_payload gt_veteran": lambda: json_util.project_gt_payload(gt_veteran),
+        "cache.pack gt_veteran": lambda: CompressedPayload.pack(gt_veteran),
+        "cache.unpack gt_veteran": packed_veteran.unpack,
+        "gt.PlayerStats.from_gt_dict": lambda: GtPlayerStats.from_gt_dict(gt_small),
+        "gt_main_html_builder small": lambda: gt_main_html_builder(gt_small, "bfv"),
+        "gt_main_html_builder veteran": lambda: gt_main_html_builder(gt_veteran, "bfv"),
+        "gt_weapons_html_builder veteran": lambda: gt_weapons_html_builder(gt_veteran, "bfv"),
+        "gt_vehicles_html_builder veteran": lambda: gt_vehicles_html_builder(gt_veteran, "bf1"),
+        "gt_main_llm_builder veteran": lambda: gt_main_llm_builder(gt_veteran, "bfv", ""),
+        "gt stat render (stub html_render)": lambda: generator.generate_main_gt_data_pic(
+            gt_small, "bfv", _stub_html_render, gt_main_html_builder),
+        **_raster_cases(gt_small),
+        "btr.PlayerStats.from_btr_dict": lambda: BtrPlayerStats.from_btr_dict(btr_stat),
+        "btr.PlayerStats.from_bf6_dict": lambda: BtrPlayerStats.from_bf6_dict(bf6_player),
+        "btr_main_html_builder bf2042": lambda: btr_main_html_builder(
+            btr_stat, btr_weapons, btr_vehicles, btr_soldiers, "bf2042"),
+        "btr_weapons_html_builder bf2042": lambda: btr_weapons_html_builder(
+            btr_stat, btr_weapons, btr_vehicles, btr_soldiers, "bf2042"),
+        "btr_vehicles_html_builder bf2042": lambda: btr_vehicles_html_builder(
+            btr_stat, btr_weapons, btr_vehicles, btr_soldiers, "bf2042"),
+        "btr_main_html_builder bf6": lambda: btr_main_html_builder(
+            bf6_player, bf6_weapons, bf6_vehicles, bf6_soldiers, "bf6"),
+        "btr_main_llm_builder bf6": lambda: btr_main_llm_builder(
+            bf6_player, bf6_weapons, bf6_vehicles, bf6_soldiers, "bf6", ""),
+    }
+
+
+async def _call(func: Callable[[], Any]) -> Any:
+    result = func()
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def measure(name: str, func: Callable[[], Any], min_time: float, max_iterations: int,
+                  cold: bool = False) -> BenchResult:
+    """
+    测量单个用例
+    Args:
+        name: 用例名称
+        func: 用例函数
+        min_time: 最少运行时间(秒)
+        max_iterations: 最多运行次数
+        cold: 每次运行前清空卡片片段缓存
+    """
+    for _ in range(3):
+        await _call(func)
+
+    iterations = 0
+    elapsed = 0.0
+    while elapsed < min_time and iterations < max_iterations:
+        if cold:
+            card_fragments.clear()
+        start = time.perf_counter()
+        await _call(func)
+        elapsed += time.perf_counter() - start
+        iterations += 1
+
+    if cold:
+        card_fragments.clear()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    await _call(func)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mean = elapsed / iterations
+    return BenchResult(name, round(1 / mean, 1), round(mean * 1e6, 1), max(after - before, 0),
+                       max(peak - before, 0), iterations)
+
+
+def compare(results: List[BenchResult], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """返回比基线慢超过阈值的用例"""
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if not base:
+            continue
+        change = result.ops_per_sec / base["ops_per_sec"] - 1
+        marker = ""
+        if change < -threshold:
+            marker = "  <-- 变慢"
+            regressions.append(result.name)
+        print(f"{result.name:<42} {base['ops_per_sec']:>10.1f} -> {result.ops_per_sec:>10.1f} ops/s "
+              f"({change:+.1%}){marker}")
+    return regressions
+
+
+async def run(args) -> int:
+    original_image_base64 = btr_entities.get_image_base64
+    btr_entities.get_image_base64 = _stub_image_base64
+    try:
+        cases = build_cases()
+        results = []
+        for name, func in cases.items():
+            if args.filter and args.filter not in name:
+                continue
+            results.append(await measure(name, func, args.min_time, args.iterations, args.cold))
+    finally:
+        btr_entities.get_image_base64 = original_image_base64
+        shutil.rmtree(_RASTER_DIR, ignore_errors=True)
+
+    print(f"{'用例':<40} {'ops/s':>10} {'平均(us)':>10} {'分配(B)':>10} {'峰值(B)':>10}")
+    for r in results:
+        print(f"{r.name:<42} {r.ops_per_sec:>10.1f} {r.mean_us:>10.1f} {r.alloc_bytes:>10} {r.peak_bytes:>10}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({r.name: asdict(r) for r in results}, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n与基线 {args.baseline} 对比:")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} 个用例变慢超过 {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="战地插件基准测试")
+    parser.add_argument("--filter", default="", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--min-time", type=float, default=0.5, help="每个用例最少运行时间(秒)")
+    parser.add_argument("--iterations", type=int, default=10000, help="每个用例最多运行次数")
+    parser.add_argument("--cold", action="store_true", help="每次运行前清空卡片片段缓存")
+    parser.add_argument("--save", help="把结果保存为基线json")
+    parser.add_argument("--baseline", help="与该基线json对比")
+    parser.add_argument("--threshold", type=float, default=0.15, help="判定为变慢的比例")
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
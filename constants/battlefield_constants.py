@@ -3,7 +3,8 @@
 """
 import random
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from typing import Dict, Optional
+from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader, Template
 
 
 class ImageUrls:
@@ -748,13 +749,6 @@ class ImageUrls:
     def DEFAULT_AVATAR(self):
         return random.choice(self._DEFAULT_AVATAR_URLS)
 
-    # 错误图片修复URL
-    ERROR_IMG = [
-        {"name": "su-50", "repair_url": "https://s21.ax1x.com/2025/07/23/pVGGFeK.png"},
-        {"name": "lav-25", "repair_url": "https://s21.ax1x.com/2025/08/13/pVwK8dP.png"},
-        {"name": "lav-ad", "repair_url": "https://s21.ax1x.com/2025/08/13/pVwKUzQ.png"},
-    ]
-
     # 其他静态图片
     SU_50 = "https://s21.ax1x.com/2025/07/23/pVGGFeK.png"
 
@@ -821,39 +815,138 @@ class TemplateConstants:
     """模板常量类"""
     PARENT_FOLDER = Path(__file__).parent.parent.resolve()
 
+    # 模板名 -> (模板目录, 文件名)
+    TEMPLATE_FILES = {
+        "gt_main": ("gametool", "template.html"),
+        "gt_weapons": ("gametool", "template_weapons.html"),
+        "gt_vehicles": ("gametool", "template_vehicles.html"),
+        "gt_servers": ("gametool", "template_servers.html"),
+        "gt_weapon_card": ("gametool", "weapon_card.html"),
+        "gt_vehicle_card": ("gametool", "vehicle_card.html"),
+        "gt_server_card": ("gametool", "server_card.html"),
+
+        "btr_main": ("btr", "template.html"),
+        "btr_weapons": ("btr", "template_weapons.html"),
+        "btr_vehicles": ("btr", "template_vehicles.html"),
+        "btr_soldiers": ("btr", "template_soldier.html"),
+        # "btr_servers": ("btr", "template_servers.html"),
+        "btr_weapon_card": ("btr", "weapon_card.html"),
+        "btr_vehicle_card": ("btr", "vehicle_card.html"),
+        "btr_soldier_card": ("btr", "soldier_card.html"),
+        # "btr_server_card": ("btr", "server_card.html"),
+    }
+
+    # 预编译模板的输出目录，为None时直接从html文件加载
+    compiled_dir: Optional[Path] = None
+    # 字节码缓存目录，为None时不缓存
+    bytecode_cache_dir: Optional[Path] = None
+    # 开发模式：模板文件修改后自动重新加载
+    dev_reload: bool = False
+    _envs: Dict[str, Environment] = {}
+    _templates: Dict[str, Template] = {}
+
+    @classmethod
+    def configure(cls, bytecode_cache_dir: Optional[Path] = None, dev_reload: bool = False):
+        """
+        配置模板环境，已创建的环境会被丢弃
+        Args:
+            bytecode_cache_dir: 字节码缓存目录，重启后直接加载编译结果，跳过模板解析
+            dev_reload: 是否在模板文件修改后自动重新加载
+        """
+        cls.bytecode_cache_dir = Path(bytecode_cache_dir) if bytecode_cache_dir is not None else None
+        if cls.bytecode_cache_dir is not None:
+            cls.bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+        cls.dev_reload = dev_reload
+        cls.reset()
+
+    @classmethod
+    def _create_env(cls, folder: str, use_compiled: bool = True) -> Environment:
+        """
+        创建模板环境，所有模板环境都由这里创建
+        Args:
+            folder: template 下的模板目录
+            use_compiled: 存在预编译模块时是否优先加载预编译模块
+        """
+        template_dir = cls.PARENT_FOLDER / "template" / folder
+        loader = FileSystemLoader(template_dir)
+        if use_compiled and cls.compiled_dir is not None and (cls.compiled_dir / folder).is_dir():
+            loader = ChoiceLoader([ModuleLoader(str(cls.compiled_dir / folder)), loader])
+        bytecode_cache = None
+        if cls.bytecode_cache_dir is not None:
+            bytecode_cache = FileSystemBytecodeCache(str(cls.bytecode_cache_dir), f"{folder}_%s.cache")
+        env = Environment(loader=loader, bytecode_cache=bytecode_cache, auto_reload=cls.dev_reload)
+        # 卡片上的固定文字按当前请求的语言翻译，避免 constants 与 core 循环导入在这里才导入
+        from ..core.translation import ui
+        env.globals["_"] = ui
+        return env
+
+    @classmethod
+    def _get_env(cls, folder: str) -> Environment:
+        env = cls._envs.get(folder)
+        if env is None:
+            env = cls._envs[folder] = cls._create_env(folder)
+        return env
+
     @classmethod
     def get_gt_template_env(cls):
         """获取Jinja2模板环境"""
-        template_dir = cls.PARENT_FOLDER / "template/gametool"
-        return Environment(loader=FileSystemLoader(template_dir))
+        return cls._get_env("gametool")
 
     @classmethod
     def get_btr_template_env(cls):
         """获取Jinja2模板环境"""
-        template_dir = cls.PARENT_FOLDER / "template/btr"
-        return Environment(loader=FileSystemLoader(template_dir))
+        return cls._get_env("btr")
+
+    @classmethod
+    def get_template(cls, name: str) -> Template:
+        """按需加载并缓存模板，首次使用时才编译"""
+        template = cls._templates.get(name)
+        if template is None:
+            folder, file_name = cls.TEMPLATE_FILES[name]
+            template = cls._get_env(folder).get_template(file_name)
+            if cls.dev_reload:
+                # 开发模式下交给 Jinja2 检查文件是否修改
+                return template
+            cls._templates[name] = template
+        return template
 
     @classmethod
     def get_templates(cls):
         """获取所有模板"""
-        gt_env = cls.get_gt_template_env()
-        btr_env = cls.get_btr_template_env()
-        return {
-            "gt_main": gt_env.get_template("template.html"),
-            "gt_weapons": gt_env.get_template("template_weapons.html"),
-            "gt_vehicles": gt_env.get_template("template_vehicles.html"),
-            "gt_servers": gt_env.get_template("template_servers.html"),
-            "gt_weapon_card": gt_env.get_template("weapon_card.html"),
-            "gt_vehicle_card": gt_env.get_template("vehicle_card.html"),
-            "gt_server_card": gt_env.get_template("server_card.html"),
+        return {name: cls.get_template(name) for name in cls.TEMPLATE_FILES}
 
-            "btr_main": btr_env.get_template("template.html"),
-            "btr_weapons": btr_env.get_template("template_weapons.html"),
-            "btr_vehicles": btr_env.get_template("template_vehicles.html"),
-            "btr_soldiers": btr_env.get_template("template_soldier.html"),
-            # "btr_servers": env.get_template("template_servers.html"),
-            "btr_weapon_card": btr_env.get_template("weapon_card.html"),
-            "btr_vehicle_card": btr_env.get_template("vehicle_card.html"),
-            "btr_soldier_card": btr_env.get_template("soldier_card.html"),
-            # "btr_server_card": env.get_template("/btr/server_card.html"),
-        }
+    @classmethod
+    def reset(cls):
+        """丢弃已加载的模板环境，下次使用时重新创建"""
+        cls._envs.clear()
+        cls._templates.clear()
+
+    @classmethod
+    def _is_compiled_stale(cls, target_dir: Path) -> bool:
+        marker = target_dir / ".compiled"
+        if not marker.exists():
+            return True
+        compiled_at = marker.stat().st_mtime
+        source_dir = cls.PARENT_FOLDER / "template"
+        return any(path.stat().st_mtime > compiled_at for path in source_dir.rglob("*.html"))
+
+    @classmethod
+    def precompile(cls, target_dir: Path) -> bool:
+        """
+        把所有模板预编译为Python模块，之后通过 ModuleLoader 加载，省去模板解析
+        Args:
+            target_dir: 预编译模块的输出目录
+        Returns:
+            是否重新编译了模板（已是最新时返回False）
+        """
+        target_dir = Path(target_dir)
+        cls.compiled_dir = target_dir
+        if not cls._is_compiled_stale(target_dir):
+            cls.reset()
+            return False
+        for folder in {folder for folder, _ in cls.TEMPLATE_FILES.values()}:
+            env = cls._create_env(folder, use_compiled=False)
+            env.compile_templates(str(target_dir / folder), zip=None)
+        (target_dir / ".compiled").touch()
+        cls.reset()
+        return True
@@ -3,29 +3,87 @@ from astrbot.api import logger
 
 from ..core.request_util import (gt_request_api, btr_request_api)
 from ..core.plugin_logic import PlayerDataRequest, BattlefieldPluginLogic
+from ..core.cache_util import TTLCache, CompressedPayload
+from ..core.server_index import ServerSearchIndex
+from ..core.json_util import project_btr_payload
+from ..core.timing import span
+
+from typing import Awaitable, Callable, Optional
+
+import time
 
 
 class ApiHandlers:
+    BTR_PROP_MAP = {
+        "stat": "/player/stat",
+        "weapons": "/player/weapons",
+        "vehicles": "/player/vehicles",
+        "soldiers": "/player/soldiers",
+        "bf6_stat": "/bf6/stat",
+    }
+
     def __init__(self, plugin_logic: BattlefieldPluginLogic, html_render_func, timeout_config: int, ssc_token: str,
-                 session):
+                 session, cache_ttl: int = 300, cache_max_bytes: int = 64 * 1024 * 1024,
+                 server_search_ttl: int = 60):
         self.plugin_logic = plugin_logic
         self.html_render = html_render_func
         self.timeout_config = timeout_config
         self.ssc_token = ssc_token
         self._session = session
+        # 缓存值为压缩后的数据，容量按字节数限制
+        self.cache = TTLCache(ttl=cache_ttl, max_entries=4096, max_bytes=cache_max_bytes)
+        # 服务器搜索结果，包含已搜索过的关键字的搜索直接在本地过滤
+        self.server_index = ServerSearchIndex(ttl=server_search_ttl)
+
+    @staticmethod
+    def _cache_key(source: str, prop: str, params: dict) -> tuple:
+        """生成缓存键，玩家名不区分大小写"""
+        return (source, prop) + tuple(sorted((k, str(v).lower()) for k, v in params.items()))
+
+    async def _request_gt(self, game: str, prop: str, params: dict, force_refresh: bool = False):
+        """带缓存的GameTools请求，仅缓存成功的响应"""
+        key = self._cache_key(f"gt_{game}", prop, params)
+        if not force_refresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached.unpack()
+
+        with span("gt_request"):
+            api_data = await gt_request_api(game, prop, params, self.timeout_config, session=self._session)
+        if isinstance(api_data, dict) and api_data.get("code") == 200:
+            api_data["__update_time"] = time.time()
+            self.cache.set(key, CompressedPayload.pack(api_data))
+        return api_data
+
+    async def _request_btr(self, btr_prop: str, params: dict, force_refresh: bool = False):
+        """带缓存的BTR请求"""
+        key = self._cache_key("btr", btr_prop, params)
+        if not force_refresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached.unpack()
+
+        with span("btr_request"):
+            api_data = await btr_request_api(btr_prop, params, self.timeout_config, self.ssc_token,
+                                             session=self._session)
+        if api_data is not None:
+            api_data = project_btr_payload(api_data)
+            self.cache.set(key, CompressedPayload.pack(api_data))
+        return api_data
+
+    def _gt_player_params(self, request_data: PlayerDataRequest) -> dict:
+        return {"name": request_data.ea_name, "lang": request_data.lang, "platform": self.plugin_logic.default_platform}
+
+    @staticmethod
+    def _btr_player_params(request_data: PlayerDataRequest) -> dict:
+        return {"player_name": request_data.ea_name, "game": request_data.game, "pider": request_data.pider}
 
     async def fetch_gt_data(self, event: AstrMessageEvent, request_data: PlayerDataRequest, data_type: str,
                             prop: str = None,is_llm:bool = False):
         """
         根据游戏类型获取数据并处理响应 (非bf6/bf2042)。
         """
-        api_data = await gt_request_api(
-            request_data.game,
-            prop,
-            {"name": request_data.ea_name, "lang": request_data.lang, "platform": self.plugin_logic.default_platform},
-            self.timeout_config,
-            session=self._session,
-        )
+        api_data = await self._request_gt(request_data.game, prop, self._gt_player_params(request_data))
 
         async for result in self.plugin_logic.process_api_response(
                 event, api_data, data_type, request_data.game, self.html_render,is_llm
@@ -36,14 +94,7 @@ class ApiHandlers:
         """
         根据游戏类型获取数据并处理响应 (bf6/bf2042)。
         """
-        btr_prop_map = {
-            "stat": "/player/stat",
-            "weapons": "/player/weapons",
-            "vehicles": "/player/vehicles",
-            "soldiers": "/player/soldiers",
-            "bf6_stat": "/bf6/stat",
-        }
-        btr_prop = btr_prop_map.get(data_type)
+        btr_prop = self.BTR_PROP_MAP.get(data_type)
         if btr_prop is None:
             yield event.plain_result(f"不支持的游戏类型 '{data_type}' 用于bf6/bf2042查询。")
             return
@@ -53,13 +104,7 @@ class ApiHandlers:
             yield event.plain_result("士兵查询目前仅支持战地2042。")
             return
 
-        api_data = await btr_request_api(
-            btr_prop,
-            {"player_name": request_data.ea_name, "game": request_data.game,"pider": request_data.pider},
-            self.timeout_config,
-            self.ssc_token,
-            session=self._session,
-        )
+        api_data = await self._request_btr(btr_prop, self._btr_player_params(request_data))
         yield api_data
 
     async def handle_btr_game(self, event: AstrMessageEvent, request_data: PlayerDataRequest, prop,
@@ -115,23 +160,55 @@ class ApiHandlers:
                                                                   vehicle_data, soldier_data, is_llm):
             yield result
 
-    async def fetch_gt_servers_data(self, request_data: PlayerDataRequest, timeout_config: int, session):
+    async def warm_stat_cache(self, request_data: PlayerDataRequest,
+                              before_btr_request: Optional[Callable[[], Awaitable]] = None):
         """
-        获取GT服务器数据。
+        强制刷新玩家stat查询所需的数据并写入缓存，供后台刷新任务使用。
+        Args:
+            request_data: 请求数据
+            before_btr_request: 每次请求BTR接口前等待的函数，用于后台任务限速
         """
-        servers_data = await gt_request_api(
-            request_data.game,
-            "servers",
-            {
-                "name": request_data.server_name,
-                "lang": request_data.lang,
-                "platform": self.plugin_logic.default_platform,
-                "region": "all",
-                "limit": 30,
-            },
-            timeout_config,
-            session=session,
-        )
+        if request_data.game in ["bf2042", "bf6"]:
+            data_types = ["bf6_stat"] if request_data.game == "bf6" else ["stat", "weapons", "vehicles", "soldiers"]
+            params = self._btr_player_params(request_data)
+            for data_type in data_types:
+                if before_btr_request is not None:
+                    await before_btr_request()
+                await self._request_btr(self.BTR_PROP_MAP[data_type], dict(params), force_refresh=True)
+        else:
+            await self._request_gt(request_data.game, "all", self._gt_player_params(request_data), force_refresh=True)
+
+    async def fetch_gt_servers_data(self, request_data: PlayerDataRequest, timeout_config: int, session,
+                                    force_refresh: bool = False):
+        """
+        获取GT服务器数据，短时间内的重复搜索和已搜索过的关键字的子搜索不请求上游。
+        """
+        params = {
+            "name": request_data.server_name,
+            "lang": request_data.lang,
+            "platform": self.plugin_logic.default_platform,
+            "region": "all",
+            "limit": 30,
+        }
+        scope = (request_data.game, params["region"], params["lang"], params["platform"])
+        if not force_refresh:
+            local = self.server_index.lookup(scope, request_data.server_name)
+            if local is not None:
+                fetched_at, servers = local
+                return {"code": 200, "servers": [dict(server) for server in servers], "__update_time": fetched_at}
+
+        with span("gt_request"):
+            servers_data = await gt_request_api(
+                request_data.game,
+                "servers",
+                params,
+                timeout_config,
+                session=session,
+            )
+        if isinstance(servers_data, dict) and servers_data.get("code") == 200:
+            servers_data["__update_time"] = time.time()
+            self.server_index.record(scope, request_data.server_name, servers_data.get("servers") or [],
+                                     params["limit"], servers_data["__update_time"])
         return servers_data
 
     async def check_ea_name(self, request_data: PlayerDataRequest, timeout_config: int, session):
@@ -1,6 +1,7 @@
 from typing import Dict, Any, Callable
 
 from ...constants.battlefield_constants import ImageUrls
+from ..timing import span
 
 class BtrImageGenerator:
     """图片生成工具类，负责将各种数据转换为图片"""
@@ -27,7 +28,8 @@ class BtrImageGenerator:
         Returns:
             返回生成的图片URL
         """
-        html = await html_builder_func(stat_data,weapon_data,vehicle_data,soldier_data, game)
+        with span("build"):
+            html = await html_builder_func(stat_data,weapon_data,vehicle_data,soldier_data, game)
         url = await html_render_func(
             html,
             {},
@@ -54,7 +56,8 @@ class BtrImageGenerator:
         Returns:
             返回生成的图片URL
         """
-        html = await html_builder_func(stat_data,weapon_data,vehicle_data,soldier_data, game)
+        with span("build"):
+            html = await html_builder_func(stat_data,weapon_data,vehicle_data,soldier_data, game)
         url = await html_render_func(
             html,
             {},
@@ -81,7 +84,8 @@ class BtrImageGenerator:
         Returns:
             返回生成的图片URL
         """
-        html = await html_builder_func(stat_data,weapon_data,vehicle_data,soldier_data, game)
+        with span("build"):
+            html = await html_builder_func(stat_data,weapon_data,vehicle_data,soldier_data, game)
         url = await html_render_func(
             html,
             {},
@@ -109,7 +113,8 @@ class BtrImageGenerator:
         Returns:
             返回生成的图片URL
         """
-        html = await html_builder_func(stat_data,weapon_data,vehicle_data,soldier_data, game)
+        with span("build"):
+            html = await html_builder_func(stat_data,weapon_data,vehicle_data,soldier_data, game)
         url = await html_render_func(
             html,
             {},
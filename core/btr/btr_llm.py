@@ -1,5 +1,7 @@
-from astrbot.api import logger
 from ...models.btr_entities import PlayerStats, Weapon, Vehicle, Soldier
+from ..log_policy import get_logger, truncate
+
+_log = get_logger("llm")
 
 def sort_list_of_dicts(list_of_dicts, key):
     """降序排序，支持点分隔的嵌套键，如果值为零就删除该项"""
@@ -69,6 +71,6 @@ async def btr_main_llm_builder(stat_data: dict, weapons_data, vehicles_data, sol
             else:
                 llm_text += soldier.to_llm_text()
 
-    logger.info(llm_text)
+    _log.debug("Battlefield Tool LLM数据(%s字符): %s", len(llm_text), lambda: truncate(llm_text, 500))
 
     return llm_text
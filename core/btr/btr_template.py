@@ -1,16 +1,12 @@
 from astrbot.api import logger
 from ...constants.battlefield_constants import (ImageUrls, BackgroundColors, GameMappings, TemplateConstants)
+from ..fragment_cache import render_card
+from ..timing import span
+from ..utils import page_count, page_slice
 from ...models.btr_entities import PlayerStats, Weapon, Vehicle, Soldier
 
 import time
 
-# 获取模板
-templates = TemplateConstants.get_templates()
-MAIN_TEMPLATE = templates["btr_main"]
-WEAPONS_TEMPLATE = templates["btr_weapons"]
-VEHICLES_TEMPLATE = templates["btr_vehicles"]
-SOLDIERS_TEMPLATE = templates["btr_soldiers"]
-
 
 def sort_list_of_dicts(list_of_dicts, key):
     """降序排序，支持点分隔的嵌套键，如果值为零就删除该项"""
@@ -70,20 +66,23 @@ async def btr_main_html_builder(stat_data: dict, weapons_data, vehicles_data, so
         soldiers_entities = [Soldier.from_btr_dict(soldier_dict) for soldier_dict in soldier_data[:1]]
     stat_entity.avatar = ImageUrls().DEFAULT_AVATAR
 
-    html = MAIN_TEMPLATE.render(
-        banner=banner,
-        update_time=update_time,
-        stat_entity=stat_entity,
-        weapon_data=weapons_entities,
-        vehicle_data=vehicles_entities,
-        soldier_data=soldiers_entities,
-        game=game,
-        background_color=background_color,
-    )
+    with span("template"):
+        html = TemplateConstants.get_template("btr_main").render(
+            banner=banner,
+            update_time=update_time,
+            stat_entity=stat_entity,
+            weapon_data=weapons_entities,
+            vehicle_data=vehicles_entities,
+            soldier_data=soldiers_entities,
+            game=game,
+            background_color=background_color,
+            card=render_card,
+        )
     return html
 
 
-async def btr_weapons_html_builder(stat_data: dict, weapons_data,vehicles_data, soldier_data, game: str) -> str:
+async def btr_weapons_html_builder(stat_data: dict, weapons_data,vehicles_data, soldier_data, game: str,
+                                   page: int = 0, page_size: int = 0) -> str:
     """
         构建武器html
         Args:
@@ -92,11 +91,15 @@ async def btr_weapons_html_builder(stat_data: dict, weapons_data,vehicles_data,
             vehicles_data: 查询到的载具数据字典
             soldier_data: 查询到的士兵数据字典
             game: 所查询的游戏
+            page: 页码，从0开始，只有第一页显示玩家信息
+            page_size: 每页数量，0为不分页
         Returns:
             构建的Html
     """
     #排序
     weapons_data = sort_list_of_dicts(weapons_data, "stats.kills.value")
+    pages = page_count(len(weapons_data), page_size)
+    weapons_data = page_slice(weapons_data, page, page_size)
     soldier_data = sort_list_of_dicts(soldier_data, "stats.kills.value")
     background_color = GameMappings.BACKGROUND_COLORS.get(game, BackgroundColors.BF2042_BACKGROUND_COLOR)
     update_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
@@ -117,18 +120,23 @@ async def btr_weapons_html_builder(stat_data: dict, weapons_data,vehicles_data,
         weapons_entities = [Weapon.from_btr_dict(weapon_dict) for weapon_dict in weapons_data]
     stat_entity.avatar = ImageUrls().DEFAULT_AVATAR
 
-    html = WEAPONS_TEMPLATE.render(
-        banner=banner,
-        update_time=update_time,
-        stat_entity=stat_entity,
-        weapon_data=weapons_entities,
-        game=game,
-        background_color=background_color,
-    )
+    with span("template"):
+        html = TemplateConstants.get_template("btr_weapons").render(
+            banner=banner,
+            update_time=update_time,
+            stat_entity=stat_entity,
+            weapon_data=weapons_entities,
+            page=page,
+            pages=pages,
+            game=game,
+            background_color=background_color,
+            card=render_card,
+        )
     return html
 
 
-async def btr_vehicles_html_builder(stat_data: dict,weapons_data, vehicles_data,soldier_data, game: str) -> str:
+async def btr_vehicles_html_builder(stat_data: dict,weapons_data, vehicles_data,soldier_data, game: str,
+                                    page: int = 0, page_size: int = 0) -> str:
     """
         构建载具html
         Args:
@@ -137,12 +145,16 @@ async def btr_vehicles_html_builder(stat_data: dict,weapons_data, vehicles_data,
             vehicles_data: 查询到的载具数据字典
             soldier_data: 查询到的士兵数据字典
             game: 所查询的游戏
+            page: 页码，从0开始，只有第一页显示玩家信息
+            page_size: 每页数量，0为不分页
         Returns:
             构建的Html
     """
     # 创建对象
 
     vehicles_data = sort_list_of_dicts(vehicles_data, "stats.kills.value")
+    pages = page_count(len(vehicles_data), page_size)
+    vehicles_data = page_slice(vehicles_data, page, page_size)
     soldier_data = sort_list_of_dicts(soldier_data, "stats.kills.value")
     background_color = GameMappings.BACKGROUND_COLORS.get(game, BackgroundColors.BF2042_BACKGROUND_COLOR)
     update_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
@@ -162,14 +174,18 @@ async def btr_vehicles_html_builder(stat_data: dict,weapons_data, vehicles_data,
         vehicles_entities = [Vehicle.from_btr_dict(vehicle_dict) for vehicle_dict in vehicles_data]
     stat_entity.avatar = ImageUrls().DEFAULT_AVATAR
 
-    html = VEHICLES_TEMPLATE.render(
-        banner=banner,
-        update_time=update_time,
-        stat_entity=stat_entity,
-        vehicle_data=vehicles_entities,
-        game=game,
-        background_color=background_color,
-    )
+    with span("template"):
+        html = TemplateConstants.get_template("btr_vehicles").render(
+            banner=banner,
+            update_time=update_time,
+            stat_entity=stat_entity,
+            vehicle_data=vehicles_entities,
+            page=page,
+            pages=pages,
+            game=game,
+            background_color=background_color,
+            card=render_card,
+        )
     return html
 
 
@@ -202,12 +218,20 @@ async def btr_soldier_html_builder(stat_data: dict,weapons_data, vehicles_data,
 
     stat_entity.avatar = ImageUrls().DEFAULT_AVATAR
 
-    html = SOLDIERS_TEMPLATE.render(
-        banner=banner,
-        update_time=update_time,
-        stat_entity=stat_entity,
-        soldier_data=soldiers_entities,
-        game=game,
-        background_color=background_color,
-    )
+    with span("template"):
+        html = TemplateConstants.get_template("btr_soldiers").render(
+            banner=banner,
+            update_time=update_time,
+            stat_entity=stat_entity,
+            soldier_data=soldiers_entities,
+            game=game,
+            background_color=background_color,
+            card=render_card,
+        )
     return html
+
+
+def btr_list_total(weapons_data, vehicles_data, data_type: str) -> int:
+    """weapons/vehicles 卡片中的条目数，与 sort_list_of_dicts 的筛选一致(击杀为0的不显示)"""
+    items = weapons_data if data_type == "weapons" else vehicles_data
+    return len(sort_list_of_dicts(items or [], "stats.kills.value"))
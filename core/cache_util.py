@@ -0,0 +1,184 @@
+import sys
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from . import json_util
+
+try:
+    import zstandard
+except ImportError:  # zstandard 为可选依赖，未安装时使用 zlib
+    zstandard = None
+
+_CODEC_ZSTD = "zstd"
+_CODEC_ZLIB = "zlib"
+_STATS_COLUMNS = ("value", "displayValue", "percentile")
+
+
+def pack_stats(obj: Any) -> Any:
+    """
+    把BTR数据中 stats 下的 {"value":..,"displayValue":..,"percentile":..} 字典转换为列式数组，
+    只保留实体类会读取的三个字段
+    """
+    if isinstance(obj, list):
+        return [pack_stats(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    packed = {}
+    for key, value in obj.items():
+        if key == "stats" and isinstance(value, dict) and value and all(isinstance(v, dict) for v in value.values()):
+            names = list(value.keys())
+            packed[key] = {
+                "__cols__": names,
+                **{col: [value[name].get(col) for name in names] for col in _STATS_COLUMNS},
+            }
+        else:
+            packed[key] = pack_stats(value)
+    return packed
+
+
+def unpack_stats(obj: Any) -> Any:
+    """pack_stats 的逆操作，值为None的字段不会还原"""
+    if isinstance(obj, list):
+        return [unpack_stats(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    unpacked = {}
+    for key, value in obj.items():
+        if key == "stats" and isinstance(value, dict) and "__cols__" in value:
+            unpacked[key] = {
+                name: {col: value[col][i] for col in _STATS_COLUMNS if value[col][i] is not None}
+                for i, name in enumerate(value["__cols__"])
+            }
+        else:
+            unpacked[key] = unpack_stats(value)
+    return unpacked
+
+
+class CompressedPayload:
+    """压缩存储的接口数据，只有在读取时才解压"""
+
+    __slots__ = ("blob", "codec")
+
+    def __init__(self, blob: bytes, codec: str):
+        self.blob = blob
+        self.codec = codec
+
+    @classmethod
+    def pack(cls, data: Any, level: int = 3) -> "CompressedPayload":
+        """序列化并压缩数据"""
+        raw = json_util.dumps(pack_stats(data))
+        if zstandard is not None:
+            return cls(zstandard.ZstdCompressor(level=level).compress(raw), _CODEC_ZSTD)
+        return cls(zlib.compress(raw, level), _CODEC_ZLIB)
+
+    def unpack(self) -> Any:
+        """解压并还原数据，每次调用都返回新的对象"""
+        if self.codec == _CODEC_ZSTD:
+            raw = zstandard.ZstdDecompressor().decompress(self.blob)
+        else:
+            raw = zlib.decompress(self.blob)
+        return unpack_stats(json_util.loads(raw))
+
+    @property
+    def nbytes(self) -> int:
+        """压缩后占用的字节数"""
+        return len(self.blob)
+
+
+def estimate_size(value: Any) -> int:
+    """估算缓存值占用的字节数，优先使用对象自带的 nbytes"""
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return nbytes
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+    """带过期时间的内存缓存，超过条目数或字节数上限时淘汰最久未使用的条目"""
+
+    def __init__(self, ttl: float = 300, max_entries: int = 512, max_bytes: Optional[int] = None,
+                 size_func: Callable[[Any], int] = estimate_size):
+        """
+        初始化缓存
+        Args:
+            ttl: 条目存活时间(秒)
+            max_entries: 最大条目数
+            max_bytes: 最大占用字节数，为None时不限制
+            size_func: 计算单个缓存值字节数的函数
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_func = size_func
+        self._data: "OrderedDict[Hashable, tuple[float, Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """获取未过期的缓存值，不存在或已过期时返回None"""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        expire_at, value, _ = item
+        if expire_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """写入缓存值"""
+        expire_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        size = self.size_func(value)
+        self._remove(key)
+        self._data[key] = (expire_at, value, size)
+        self._total_bytes += size
+        while self._data and (len(self._data) > self.max_entries or
+                              (self.max_bytes is not None and self._total_bytes > self.max_bytes)):
+            self._remove(next(iter(self._data)))
+
+    def _remove(self, key: Hashable):
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._total_bytes -= item[2]
+        return item
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """移除并返回缓存值"""
+        item = self._remove(key)
+        return item[1] if item else None
+
+    def clear(self):
+        """清空缓存"""
+        self._data.clear()
+        self._total_bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """当前缓存占用的字节数"""
+        return self._total_bytes
+
+    def stats(self) -> dict:
+        """返回缓存命中统计"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and item[0] >= time.monotonic()
@@ -0,0 +1,76 @@
+from astrbot.api import logger
+
+from .request_util import upstream_health
+from .fragment_cache import card_fragments
+from .gametool.gt_image_generator import GtImageGenerator
+from .gametool.gt_template import gt_main_html_builder
+from .sample_data import gt_player
+
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import os
+import time
+
+
+def format_upstream_health() -> List[str]:
+    """各上游接口最近一次请求的延迟、错误和熔断状态"""
+    snapshot = upstream_health.snapshot()
+    if not snapshot:
+        return ["上游接口: 暂无请求"]
+    lines = ["上游接口:"]
+    for host, state in sorted(snapshot.items()):
+        latency = state["last_latency"]
+        latency_text = f"{latency * 1000:.0f}ms" if latency is not None else "-"
+        line = (f"  {host} 熔断:{state['circuit']} 延迟:{latency_text} 状态码:{state['last_status'] or '-'} "
+                f"连续失败:{state['consecutive_failures']}")
+        if state["last_error"]:
+            line += f" 最近错误:{state['last_error']}"
+        lines.append(line)
+    return lines
+
+
+def format_cache_stats(name: str, stats: dict) -> str:
+    return (f"  {name}: {stats['size']}条 {stats['bytes'] / 1024:.0f}KB "
+            f"命中率{stats['hit_ratio']:.1%} ({stats['hits']}/{stats['hits'] + stats['misses']})")
+
+
+def format_cache_section(api_cache) -> List[str]:
+    """接口数据缓存和卡片片段缓存的占用和命中率"""
+    return [
+        "缓存:",
+        format_cache_stats("接口数据", api_cache.stats()),
+        format_cache_stats("卡片片段", card_fragments.cache.stats()),
+    ]
+
+
+def format_render_stats(stats: dict) -> str:
+    return (f"渲染队列: 进行中{stats['running']}/{stats['concurrency']} 排队{stats['waiting']} "
+            f"完成{stats['completed']} 失败{stats['failed']} 拒绝{stats['rejected']} 超时{stats['timed_out']} "
+            f"平均排队{stats['avg_wait_ms']}ms 平均渲染{stats['avg_render_ms']}ms")
+
+
+def format_db_stats(db_path: Path, counts: dict) -> str:
+    size = os.path.getsize(db_path) if os.path.exists(db_path) else 0
+    rows = " ".join(f"{table}:{count}" for table, count in counts.items())
+    return f"数据库: {size / 1024:.0f}KB {rows}"
+
+
+async def render_self_test(html_render_func: Callable, img_quality: int = 90) -> Tuple[bool, float, Optional[str]]:
+    """
+    用内置的样例数据渲染一张stat卡片
+    Args:
+        html_render_func: 插件使用的渲染函数(经过渲染队列)
+        img_quality: 图片质量
+    Returns:
+        (是否成功, 耗时毫秒, 图片地址或错误信息)
+    """
+    data = gt_player(weapons=12, vehicles=6)
+    start = time.perf_counter()
+    try:
+        url = await GtImageGenerator(img_quality).generate_main_gt_data_pic(
+            data, "bfv", html_render_func, gt_main_html_builder)
+        return True, (time.perf_counter() - start) * 1000, url
+    except Exception as e:
+        logger.error(f"Battlefield Tool 渲染自检失败: {e}")
+        return False, (time.perf_counter() - start) * 1000, str(e)
@@ -0,0 +1,75 @@
+from ..constants.battlefield_constants import TemplateConstants
+from .cache_util import TTLCache
+from .translation import current_locale
+
+from pathlib import Path
+from typing import Any, Hashable
+
+from markupsafe import Markup
+
+import hashlib
+
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _key_value(value: Any) -> Hashable:
+    if isinstance(value, str) and value.startswith("data:"):
+        # bf6的图标是base64数据，键中只保留摘要，避免每个键都带一份图片
+        return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+    return value if isinstance(value, _SIMPLE_TYPES) else repr(value)
+
+
+def entity_key(entity: Any) -> Hashable:
+    """根据实体对象的字段内容生成缓存键，字段相同的实体得到相同的键"""
+    fields = getattr(entity, "__dict__", None)
+    if fields is None:
+        return repr(entity)
+    return tuple((name, _key_value(value)) for name, value in sorted(fields.items()))
+
+
+class CardFragmentCache:
+    """缓存武器/载具/士兵卡片渲染后的html片段，相同内容的卡片只渲染一次"""
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 3600, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Args:
+            max_entries: 最多缓存的卡片数量
+            ttl: 卡片片段的存活时间(秒)
+            max_bytes: 片段的最大总大小，bf6卡片内嵌base64图标，单个片段可达数十KB
+        """
+        self.cache = TTLCache(ttl=ttl, max_entries=max_entries, max_bytes=max_bytes, size_func=len)
+
+    def render(self, template_name: str, entity: Any, game: str, bg_opacity_class: str) -> Markup:
+        """
+        渲染一张卡片，模板中通过 card(...) 调用
+        Args:
+            template_name: TemplateConstants.TEMPLATE_FILES 中的卡片模板名
+            entity: 卡片对应的实体对象
+            game: 游戏代号
+            bg_opacity_class: 卡片背景透明度样式
+        Returns:
+            卡片的html片段
+        """
+        template = TemplateConstants.get_template(template_name)
+        macro = getattr(template.module, Path(TemplateConstants.TEMPLATE_FILES[template_name][1]).stem)
+        if TemplateConstants.dev_reload:
+            return macro(entity, game, bg_opacity_class)
+
+        # 卡片上的固定文字随语言变化
+        key = (template_name, game, bg_opacity_class, current_locale(), entity_key(entity))
+        fragment = self.cache.get(key)
+        if fragment is None:
+            fragment = Markup(macro(entity, game, bg_opacity_class))
+            self.cache.set(key, fragment)
+        return fragment
+
+    def clear(self):
+        self.cache.clear()
+
+
+card_fragments = CardFragmentCache()
+
+
+def render_card(template_name: str, entity: Any, game: str, bg_opacity_class: str) -> Markup:
+    """使用共享的片段缓存渲染卡片"""
+    return card_fragments.render(template_name, entity, game, bg_opacity_class)
@@ -2,6 +2,7 @@ from typing import Dict, Any, Callable
 
 # 定义图片裁剪的通用参数
 from ...constants.battlefield_constants import ImageUrls
+from ..timing import span
 
 
 class GtImageGenerator:
@@ -26,7 +27,8 @@ class GtImageGenerator:
         Returns:
             返回生成的图片URL
         """
-        html = html_builder_func(data, game)
+        with span("build"):
+            html = html_builder_func(data, game)
         url = await html_render_func(
             html,
             {},
@@ -50,7 +52,8 @@ class GtImageGenerator:
         Returns:
             返回生成的图片URL
         """
-        html = html_builder_func(data, game)
+        with span("build"):
+            html = html_builder_func(data, game)
         url = await html_render_func(
             html,
             {},
@@ -74,7 +77,8 @@ class GtImageGenerator:
         Returns:
             返回生成的图片URL
         """
-        html = html_builder_func(data, game)
+        with span("build"):
+            html = html_builder_func(data, game)
         url = await html_render_func(
             html,
             {},
@@ -105,7 +109,8 @@ class GtImageGenerator:
         elif data["servers"] is not None and len(data["servers"]) == 2:
             height = 670
             
-        html = html_builder_func(data, game)
+        with span("build"):
+            html = html_builder_func(data, game)
         url = await html_render_func(
             html,
             {},
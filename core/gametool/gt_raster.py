@@ -0,0 +1,257 @@
+from astrbot.api import logger
+from ...constants.battlefield_constants import (ImageUrls, BackgroundColors, GameMappings)
+from ...models.gt_entities import PlayerStats, Weapon, Vehicle
+from ..image_util import get_local_image_path, save_image_to_local
+from ..request_util import fetch_image
+from ..render_backend import cleanup_render_outputs
+from ..translation import ui
+from .gt_template import prepare_weapons_data, prepare_vehicles_data
+
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import asyncio
+import os
+import re
+import time
+import uuid
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Pillow 为可选依赖，未安装时只能使用html渲染
+    Image = ImageDraw = ImageFont = None
+
+# 常见系统中的中文字体，按顺序查找
+FONT_CANDIDATES = (
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/wenquanyi/wqy-microhei/wqy-microhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "C:/Windows/Fonts/msyh.ttc",
+)
+
+CARD_WIDTH = ImageUrls.COMMON_CLIP_PARAMS["width"]
+PADDING = 24
+AVATAR_SIZE = (96, 96)
+ICON_SIZE = (160, 48)
+ROW_HEIGHT = 64
+TEXT_COLOR = (255, 255, 255)
+MUTED_COLOR = (200, 200, 200)
+PANEL_COLOR = (0, 0, 0, 90)
+
+
+def raster_available() -> bool:
+    """是否安装了 Pillow"""
+    return Image is not None
+
+
+def parse_css_color(color: str) -> Tuple[int, int, int]:
+    """解析模板中使用的 #RRGGBB 或 rgb(r g b) 颜色"""
+    if color.startswith("#") and len(color) == 7:
+        return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+    numbers = re.findall(r"\d+", color)
+    if len(numbers) >= 3:
+        return tuple(int(n) for n in numbers[:3])
+    return 17, 27, 43
+
+
+@lru_cache(maxsize=None)
+def _find_font_path(font_path: str = "") -> Optional[str]:
+    for path in (font_path, *FONT_CANDIDATES):
+        if path and os.path.exists(path):
+            return path
+    logger.warning("Battlefield Tool 未找到中文字体，快速渲染的中文可能无法显示，可在配置中指定字体路径")
+    return None
+
+
+@lru_cache(maxsize=32)
+def get_font(size: int, font_path: str = ""):
+    """获取指定字号的字体，同一字号只加载一次"""
+    path = _find_font_path(font_path)
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size)
+
+
+class GtRasterRenderer:
+    """不经过浏览器，直接用 Pillow 绘制GameTools的stat卡片"""
+
+    def __init__(self, output_dir: Path, img_quality: int = 90, font_path: str = "", max_icons: int = 256,
+                 timeout: int = 15):
+        """
+        Args:
+            output_dir: 图片的保存目录
+            img_quality: JPEG质量
+            font_path: 字体文件路径，为空时自动查找
+            max_icons: 内存中缓存的已解码图标数量
+            timeout: 下载图标的超时时间(秒)
+        """
+        self.output_dir = Path(output_dir)
+        self.img_quality = img_quality
+        self.font_path = font_path
+        self.max_icons = max_icons
+        self.timeout = timeout
+        self._icons: "OrderedDict[tuple, Optional[Image.Image]]" = OrderedDict()
+
+    def _decode_icon(self, path: str, size: Tuple[int, int]) -> Optional["Image.Image"]:
+        try:
+            with Image.open(path) as img:
+                icon = img.convert("RGBA")
+            icon.thumbnail(size)
+            return icon
+        except Exception as e:
+            logger.debug(f"Battlefield Tool 图标解码失败 {path}: {e}")
+            return None
+
+    async def load_icon(self, url: str, size: Tuple[int, int]) -> Optional["Image.Image"]:
+        """获取已解码并缩放好的图标，优先使用内存和本地缓存"""
+        if not url:
+            return None
+        key = (url, size)
+        if key in self._icons:
+            self._icons.move_to_end(key)
+            return self._icons[key]
+
+        local_path = get_local_image_path(url)
+        if not os.path.exists(local_path):
+            image_data = await fetch_image(url, self.timeout)
+            if image_data:
+                save_image_to_local(local_path, image_data)
+        icon = None
+        if os.path.exists(local_path) and not local_path.lower().endswith(".svg"):
+            icon = await asyncio.to_thread(self._decode_icon, local_path, size)
+
+        self._icons[key] = icon
+        while len(self._icons) > self.max_icons:
+            self._icons.popitem(last=False)
+        return icon
+
+    @staticmethod
+    def prepare(raw_data: dict, game: str) -> Tuple[PlayerStats, List[Weapon], List[Vehicle]]:
+        """与 gt_main_html_builder 相同的预处理，得到实体对象"""
+        processed_data = raw_data.copy()
+        if processed_data.get("avatar") is None:
+            processed_data["avatar"] = ImageUrls().DEFAULT_AVATAR
+        processed_data["__hours_played"] = str(round(processed_data.get("secondsPlayed", 0) / 3600, 1))
+        processed_data["revives"] = int(processed_data.get("revives", 0))
+        player_stats = PlayerStats.from_gt_dict(processed_data)
+        return (player_stats, prepare_weapons_data(processed_data, 3, game),
+                prepare_vehicles_data(processed_data, 3, game))
+
+    def draw_main(self, player_stats: PlayerStats, weapons: List[Weapon], vehicles: List[Vehicle], game: str,
+                  update_time: float, icons: Dict[str, "Image.Image"] = None) -> "Image.Image":
+        """
+        绘制stat卡片
+        Args:
+            player_stats: 玩家数据
+            weapons: 前3把武器
+            vehicles: 前3个载具
+            game: 游戏代号
+            update_time: 数据更新时间戳
+            icons: 图片URL到已解码图标的映射
+        Returns:
+            绘制好的图片
+        """
+        icons = icons or {}
+        font_title = get_font(30, self.font_path)
+        font_text = get_font(20, self.font_path)
+        font_small = get_font(16, self.font_path)
+
+        stat_items = [
+            (ui("击杀"), player_stats.kills), ("K/D", player_stats.kill_death),
+            ("KPM", player_stats.kills_per_minute), (ui("爆头率"), player_stats.headshots),
+            (ui("命中率"), player_stats.accuracy), (ui("急救"), player_stats.revives),
+            (ui("爆头"), player_stats.head_shots_num), (ui("最远爆头"), player_stats.longest_head_shot),
+            (ui("胜利场次"), player_stats.wins), (ui("最高连杀"), player_stats.highest_kill_streak),
+        ]
+        stat_rows = (len(stat_items) + 2) // 3
+        sections = [(ui("武器信息"), weapons, ui("暂无武器数据")), (ui("载具信息"), vehicles, ui("暂无载具数据"))]
+        height = PADDING + AVATAR_SIZE[1] + PADDING + 40 + stat_rows * 60 + PADDING
+        for _, items, _ in sections:
+            height += 40 + max(len(items), 1) * ROW_HEIGHT + PADDING
+        height += 40
+
+        background = parse_css_color(GameMappings.BACKGROUND_COLORS.get(game, BackgroundColors.BFV_BACKGROUND_COLOR))
+        card = Image.new("RGB", (CARD_WIDTH, height), background)
+        overlay = Image.new("RGBA", card.size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+
+        # 头像和基本信息
+        y = PADDING
+        avatar = icons.get(player_stats.avatar)
+        if avatar is not None:
+            overlay.paste(avatar, (PADDING, y), avatar)
+        x = PADDING + AVATAR_SIZE[0] + 16
+        draw.text((x, y + 4), player_stats.user_name, font=font_title, fill=TEXT_COLOR)
+        draw.text((x, y + 48), f"{ui('等级')}：{player_stats.rank}    {ui('游戏时间')}：{player_stats.hours_played} h",
+                  font=font_text, fill=MUTED_COLOR)
+        rank_img = icons.get(player_stats.rank_img)
+        if rank_img is not None:
+            overlay.paste(rank_img, (CARD_WIDTH - PADDING - rank_img.width, y), rank_img)
+        y += AVATAR_SIZE[1] + PADDING
+
+        # 基本数据
+        draw.text((PADDING, y), ui("基本信息"), font=font_text, fill=TEXT_COLOR)
+        y += 40
+        col_width = (CARD_WIDTH - PADDING * 2) // 3
+        draw.rounded_rectangle((PADDING, y - 8, CARD_WIDTH - PADDING, y + stat_rows * 60), 12, fill=PANEL_COLOR)
+        for i, (label, value) in enumerate(stat_items):
+            cx = PADDING + 16 + (i % 3) * col_width
+            cy = y + (i // 3) * 60
+            draw.text((cx, cy), label, font=font_small, fill=MUTED_COLOR)
+            draw.text((cx, cy + 22), str(value), font=font_text, fill=TEXT_COLOR)
+        y += stat_rows * 60 + PADDING
+
+        # 武器和载具
+        for title, items, empty_text in sections:
+            draw.text((PADDING, y), title, font=font_text, fill=TEXT_COLOR)
+            y += 40
+            if not items:
+                draw.text((PADDING + 16, y + 18), empty_text, font=font_text, fill=MUTED_COLOR)
+                y += ROW_HEIGHT
+            for item in items:
+                draw.rounded_rectangle((PADDING, y, CARD_WIDTH - PADDING, y + ROW_HEIGHT - 8), 10, fill=PANEL_COLOR)
+                icon = icons.get(item.image)
+                if icon is not None:
+                    overlay.paste(icon, (PADDING + 8, y + 4), icon)
+                tx = PADDING + ICON_SIZE[0] + 20
+                draw.text((tx, y + 6), item.name, font=font_text, fill=TEXT_COLOR)
+                detail = f"{ui('击杀')} {item.kills}    KPM {item.kills_per_minute}    {ui('使用时间')} {item.time_spent} h"
+                draw.text((tx, y + 32), detail, font=font_small, fill=MUTED_COLOR)
+                y += ROW_HEIGHT
+            y += PADDING
+
+        update_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(update_time))
+        draw.text((PADDING, height - 32), f"{ui('数据更新时间')}：{update_text}", font=font_small, fill=MUTED_COLOR)
+
+        card.paste(overlay, (0, 0), overlay)
+        return card
+
+    async def render_main(self, raw_data: dict, game: str) -> str:
+        """
+        绘制stat卡片并保存为图片
+        Args:
+            raw_data: GameTools接口返回的数据
+            game: 游戏代号
+        Returns:
+            图片的本地路径
+        """
+        player_stats, weapons, vehicles = self.prepare(raw_data, game)
+        requests = [(player_stats.avatar, AVATAR_SIZE), (player_stats.rank_img, AVATAR_SIZE)]
+        requests += [(item.image, ICON_SIZE) for item in (*weapons, *vehicles)]
+        loaded = await asyncio.gather(*(self.load_icon(url, size) for url, size in requests))
+        icons = {url: icon for (url, _), icon in zip(requests, loaded) if icon is not None}
+
+        def _draw_and_save() -> str:
+            card = self.draw_main(player_stats, weapons, vehicles, game,
+                                  raw_data.get("__update_time", time.time()), icons)
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path = self.output_dir / f"render_{uuid.uuid4().hex}.jpg"
+            card.save(path, "JPEG", quality=self.img_quality)
+            cleanup_render_outputs(self.output_dir)
+            return str(path)
+
+        return await asyncio.to_thread(_draw_and_save)
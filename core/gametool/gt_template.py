@@ -1,21 +1,15 @@
 from astrbot.api import logger
 from ...constants.battlefield_constants import (ImageUrls, BackgroundColors, GameMappings, TemplateConstants)
+from ..fragment_cache import render_card
+from ..timing import span
+from ..image_override import override_image
+from ..utils import page_count, page_slice
 from ...models.gt_entities import PlayerStats, Weapon, Vehicle, Server # 导入实体类
 
 from typing import List, Dict, Any
 
 import time
 
-# 获取模板
-templates = TemplateConstants.get_templates()
-MAIN_TEMPLATE = templates["gt_main"]
-WEAPONS_TEMPLATE = templates["gt_weapons"]
-VEHICLES_TEMPLATE = templates["gt_vehicles"]
-SERVERS_TEMPLATE = templates["gt_servers"]
-WEAPON_CARD = templates["gt_weapon_card"]
-VEHICLE_CARD = templates["gt_vehicle_card"]
-SERVER_CARD = templates["gt_server_card"]
-
 
 def sort_list_of_dicts(list_of_dicts, key):
     """降序排序"""
@@ -32,11 +26,12 @@ def prepare_weapons_data(d: dict, lens: int, game: str) -> List[Weapon]:
         if w_data.get("kills", 0) > 0:
             # 创建 Weapon 对象
             weapon = Weapon.from_dict(w_data)
+            weapon.image = override_image("weapon", w_data.get("weaponName", ""), weapon.image, game)
             weapons_objects.append(weapon)
             
     return weapons_objects
 
-def prepare_vehicles_data(d: dict, lens: int) -> List[Vehicle]:
+def prepare_vehicles_data(d: dict, lens: int, game: str = None) -> List[Vehicle]:
     """提取载具数据，格式化使用时间，并返回 Vehicle 对象列表"""
     vehicles_list_raw = d.get("vehicles", [])
     vehicles_list_raw = sort_list_of_dicts(vehicles_list_raw, "kills")
@@ -44,21 +39,14 @@ def prepare_vehicles_data(d: dict, lens: int) -> List[Vehicle]:
     vehicles_objects = []
     for v_data in vehicles_list_raw[:lens]:
         if v_data.get("kills", 0) > 0:
-            # 处理图片URL
-            v_data["image"] = img_repair_vehicles(v_data.get("vehicleName", "").lower(), v_data.get("image", ""))
             # 创建 Vehicle 对象
             vehicle = Vehicle.from_dict(v_data)
+            # 处理问题图片
+            vehicle.image = override_image("vehicle", v_data.get("vehicleName", ""), vehicle.image, game)
             vehicles_objects.append(vehicle)
             
     return vehicles_objects
 
-def img_repair_vehicles(item_name:str,url:str):
-    """处理问题图片"""
-    for item in ImageUrls.ERROR_IMG:
-        if item["name"] == item_name:
-            return item["repair_url"]
-    return url
-
 
 
 def gt_main_html_builder(raw_data: dict, game: str) -> str:
@@ -89,26 +77,30 @@ def gt_main_html_builder(raw_data: dict, game: str) -> str:
 
     # 整理武器和载具数据，返回实体对象列表
     weapons_objects = prepare_weapons_data(processed_data, 3, game)
-    vehicles_objects = prepare_vehicles_data(processed_data, 3)
-
-    html = MAIN_TEMPLATE.render(
-        banner=banner,
-        update_time=update_time,
-        d=player_stats, # 传递 PlayerStats 对象的字典表示
-        weapon_data=weapons_objects,
-        vehicle_data=vehicles_objects,
-        game=game,
-        background_color=background_color,
-    )
+    vehicles_objects = prepare_vehicles_data(processed_data, 3, game)
+
+    with span("template"):
+        html = TemplateConstants.get_template("gt_main").render(
+            banner=banner,
+            update_time=update_time,
+            d=player_stats, # 传递 PlayerStats 对象的字典表示
+            weapon_data=weapons_objects,
+            vehicle_data=vehicles_objects,
+            game=game,
+            background_color=background_color,
+            card=render_card,
+        )
     return html
 
 
-def gt_weapons_html_builder(raw_data: dict, game: str) -> str:
+def gt_weapons_html_builder(raw_data: dict, game: str, page: int = 0, page_size: int = 0) -> str:
     """
     构建武器html
     Args:
         raw_data: 查询到的原始数据字典
         game: 所查询的游戏
+        page: 页码，从0开始，只有第一页显示玩家信息
+        page_size: 每页数量，0为不分页
     Returns:
         构建的Html
     """
@@ -132,24 +124,32 @@ def gt_weapons_html_builder(raw_data: dict, game: str) -> str:
 
     # 整理武器数据，返回实体对象列表
     weapons_objects = prepare_weapons_data(processed_data, 50, game)
-
-    html = WEAPONS_TEMPLATE.render(
-        banner=banner,
-        update_time=update_time,
-        d=player_stats,
-        weapon_data=weapons_objects,
-        game=game,
-        background_color=background_color,
-    )
+    pages = page_count(len(weapons_objects), page_size)
+    weapons_objects = page_slice(weapons_objects, page, page_size)
+
+    with span("template"):
+        html = TemplateConstants.get_template("gt_weapons").render(
+            banner=banner,
+            update_time=update_time,
+            d=player_stats,
+            weapon_data=weapons_objects,
+            page=page,
+            pages=pages,
+            game=game,
+            background_color=background_color,
+            card=render_card,
+        )
     return html
 
 
-def gt_vehicles_html_builder(raw_data: dict, game: str) -> str:
+def gt_vehicles_html_builder(raw_data: dict, game: str, page: int = 0, page_size: int = 0) -> str:
     """
     构建载具html
     Args:
         raw_data: 查询到的原始数据字典
         game: 所查询的游戏
+        page: 页码，从0开始，只有第一页显示玩家信息
+        page_size: 每页数量，0为不分页
     Returns:
         构建的Html
     """
@@ -172,16 +172,22 @@ def gt_vehicles_html_builder(raw_data: dict, game: str) -> str:
     update_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(processed_data["__update_time"]))
 
     # 整理载具数据，返回实体对象列表
-    vehicles_objects = prepare_vehicles_data(processed_data, 50)
-
-    html = VEHICLES_TEMPLATE.render(
-        banner=banner,
-        update_time=update_time,
-        d=player_stats, # 传递 PlayerStats 对象的字典表示
-        vehicle_data=vehicles_objects,
-        game=game,
-        background_color=background_color,
-    )
+    vehicles_objects = prepare_vehicles_data(processed_data, 50, game)
+    pages = page_count(len(vehicles_objects), page_size)
+    vehicles_objects = page_slice(vehicles_objects, page, page_size)
+
+    with span("template"):
+        html = TemplateConstants.get_template("gt_vehicles").render(
+            banner=banner,
+            update_time=update_time,
+            d=player_stats, # 传递 PlayerStats 对象的字典表示
+            vehicle_data=vehicles_objects,
+            page=page,
+            pages=pages,
+            game=game,
+            background_color=background_color,
+            card=render_card,
+        )
     return html
 
 
@@ -204,12 +210,19 @@ def gt_servers_html_builder(raw_data: Dict[str, Any], game: str) -> str:
     servers_list_raw = raw_data.get("servers", [])
     servers_objects = [Server.from_dict(s_data) for s_data in servers_list_raw]
 
-    html = SERVERS_TEMPLATE.render(
-        banner=banner,
-        logo=logo,
-        update_time=update_time,
-        servers_data=servers_objects,
-        game=game,
-        background_color=background_color,
-    )
+    with span("template"):
+        html = TemplateConstants.get_template("gt_servers").render(
+            banner=banner,
+            logo=logo,
+            update_time=update_time,
+            servers_data=servers_objects,
+            game=game,
+            background_color=background_color,
+        )
     return html
+
+
+def gt_list_total(raw_data: dict, data_type: str) -> int:
+    """weapons/vehicles 卡片中的条目数，与 prepare_weapons_data/prepare_vehicles_data 的筛选一致"""
+    items = sort_list_of_dicts(raw_data.get(data_type, []), "kills")[:50]
+    return sum(1 for item in items if item.get("kills", 0) > 0)
@@ -0,0 +1,88 @@
+from astrbot.api import logger
+
+from typing import Optional
+
+import aiohttp
+
+
+def _accept_encoding() -> str:
+    """根据已安装的解压库协商压缩方式"""
+    encodings = ["gzip", "deflate"]
+    try:
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append("br")
+        except ImportError:
+            pass
+    return ", ".join(encodings)
+
+
+class HttpClient:
+    """插件共享的HTTP客户端，统一管理连接池、长连接和DNS缓存"""
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30,
+                 dns_cache_ttl: int = 300):
+        """
+        Args:
+            limit: 连接池总连接数上限
+            limit_per_host: 单个主机的连接数上限
+            keepalive_timeout: 空闲长连接保持时间(秒)
+            dns_cache_ttl: DNS缓存时间(秒)
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def configure(self, limit: int = None, limit_per_host: int = None, keepalive_timeout: float = None,
+                  dns_cache_ttl: int = None):
+        """更新连接池配置，在下次创建会话时生效"""
+        if limit is not None:
+            self.limit = limit
+        if limit_per_host is not None:
+            self.limit_per_host = limit_per_host
+        if keepalive_timeout is not None:
+            self.keepalive_timeout = keepalive_timeout
+        if dns_cache_ttl is not None:
+            self.dns_cache_ttl = dns_cache_ttl
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """获取共享会话，不存在或已关闭时重新创建"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Accept-Encoding": _accept_encoding()},
+                auto_decompress=True,
+            )
+            logger.debug(
+                f"Battlefield Tool 创建HTTP连接池: limit={self.limit}, limit_per_host={self.limit_per_host}, "
+                f"keepalive={self.keepalive_timeout}s, dns_ttl={self.dns_cache_ttl}s"
+            )
+        return self._session
+
+    async def close(self):
+        """关闭共享会话"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+http_client = HttpClient()
+
+
+def get_session() -> aiohttp.ClientSession:
+    """获取插件共享的aiohttp会话"""
+    return http_client.session
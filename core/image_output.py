@@ -0,0 +1,165 @@
+from astrbot.api import logger
+from astrbot.api.event import AstrMessageEvent
+
+from .request_util import fetch_image
+from .render_backend import cleanup_render_outputs
+from .timing import span
+
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple
+
+import asyncio
+import functools
+import os
+import uuid
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 为可选依赖，未安装时直接发送渲染结果
+    Image = None
+
+_SAVE_FORMATS = {"jpeg": "JPEG", "png": "PNG", "webp": "WEBP"}
+_MIN_QUALITY = 30
+
+
+class ImageOutputPolicy:
+    """根据配置转换渲染结果的格式、体积和宽度，减少图片上传耗时和带宽"""
+
+    def __init__(self, output_dir: Path, image_format: str = "jpeg", quality: int = 90, max_bytes: int = 0,
+                 mobile_width: int = 0, mobile_channels: Iterable[str] = (),
+                 webp_platforms: Iterable[str] = ("telegram", "discord"), timeout: int = 15):
+        """
+        Args:
+            output_dir: 转换后图片的保存目录
+            image_format: jpeg、png、webp 或 auto(按平台选择webp或jpeg)
+            quality: 初始图片质量
+            max_bytes: 图片体积上限，超出时逐步降低质量，为0时不限制
+            mobile_width: 移动端会话的图片宽度，为0时不缩放
+            mobile_channels: 按移动端处理的会话渠道
+            webp_platforms: 支持webp的消息平台，auto时使用
+            timeout: 下载远程渲染结果的超时时间(秒)
+        """
+        self.output_dir = Path(output_dir)
+        self.image_format = image_format
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.mobile_width = mobile_width
+        self.mobile_channels = {str(c) for c in mobile_channels}
+        self.webp_platforms = set(webp_platforms)
+        self.timeout = timeout
+        if Image is None and (image_format != "jpeg" or max_bytes or mobile_width):
+            logger.warning("Battlefield Tool 未安装Pillow，图片格式、体积和宽度设置不会生效")
+
+    def resolve(self, event: AstrMessageEvent, channel_id: str) -> Tuple[str, int]:
+        """
+        确定本次回复使用的图片格式和宽度
+        Returns:
+            (格式, 宽度)，宽度为0表示不缩放
+        """
+        image_format = self.image_format
+        if image_format == "auto":
+            image_format = "webp" if event.get_platform_name() in self.webp_platforms else "jpeg"
+        width = self.mobile_width if channel_id in self.mobile_channels else 0
+        return image_format, width
+
+    def needs_processing(self, image_format: str, width: int) -> bool:
+        return Image is not None and (image_format != "jpeg" or bool(self.max_bytes) or bool(width))
+
+    def wrap(self, html_render_func: Callable, image_format: str, width: int) -> Callable:
+        """包装渲染函数，渲染完成后按本次回复的设置转换图片"""
+        if not self.needs_processing(image_format, width):
+            return html_render_func
+
+        @functools.wraps(html_render_func)
+        async def wrapper(html, data=None, return_url=True, options=None):
+            options = dict(options or {})
+            if image_format != "jpeg":
+                # 先渲染为无损的png，避免两次有损压缩
+                options["type"] = "png"
+                options.pop("quality", None)
+            result = await html_render_func(html, data, return_url, options)
+            # 转换在渲染槽位之外进行，单独计时
+            with span("encode"):
+                return await self.process(result, image_format, width)
+
+        return wrapper
+
+    async def process(self, result: str, image_format: str, width: int) -> str:
+        """
+        转换渲染结果
+        Args:
+            result: 渲染结果的URL或本地路径
+            image_format: 目标格式
+            width: 目标宽度，为0时不缩放
+        Returns:
+            转换后图片的本地路径，无法转换时返回原结果
+        """
+        if not isinstance(result, str) or not self.needs_processing(image_format, width):
+            return result
+        if os.path.isfile(result):
+            with open(result, "rb") as f:
+                data = f.read()
+        elif result.startswith("http"):
+            data = await fetch_image(result, self.timeout)
+        else:
+            return result
+        if not data:
+            return result
+
+        try:
+            encoded = await asyncio.to_thread(self._encode, data, image_format, width)
+        except Exception as e:
+            logger.warning(f"Battlefield Tool 图片转换失败，发送原图: {e}")
+            return result
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"render_{uuid.uuid4().hex}.{'jpg' if image_format == 'jpeg' else image_format}"
+        path.write_bytes(encoded)
+        cleanup_render_outputs(self.output_dir)
+        return str(path)
+
+    def _save(self, img: "Image.Image", image_format: str, quality: int) -> bytes:
+        buffer = BytesIO()
+        if image_format == "png":
+            img.save(buffer, "PNG", optimize=True)
+        else:
+            img.save(buffer, _SAVE_FORMATS[image_format], quality=quality)
+        return buffer.getvalue()
+
+    def _encode(self, data: bytes, image_format: str, width: int) -> bytes:
+        """缩放并编码图片，设置了体积上限时先降质量，仍超出再缩小尺寸"""
+        with Image.open(BytesIO(data)) as src:
+            img = src.convert("RGB") if image_format != "png" else src.convert("RGBA")
+        if width and img.width > width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+
+        encoded = self._save(img, image_format, self.quality)
+        if not self.max_bytes or len(encoded) <= self.max_bytes:
+            return encoded
+
+        for _ in range(4):
+            if image_format != "png":
+                best = self._fit_quality(img, image_format)
+                if best is not None:
+                    return best
+            # 最低质量仍然超出时缩小尺寸
+            img = img.resize((round(img.width * 0.8), round(img.height * 0.8)), Image.LANCZOS)
+            encoded = self._save(img, image_format, _MIN_QUALITY if image_format != "png" else 0)
+            if len(encoded) <= self.max_bytes:
+                return encoded
+        return encoded
+
+    def _fit_quality(self, img: "Image.Image", image_format: str) -> Optional[bytes]:
+        """二分查找不超过体积上限的最高质量"""
+        low, high = _MIN_QUALITY, self.quality
+        best = None
+        while low <= high:
+            mid = (low + high) // 2
+            encoded = self._save(img, image_format, mid)
+            if len(encoded) <= self.max_bytes:
+                best = encoded
+                low = mid + 1
+            else:
+                high = mid - 1
+        return best
@@ -0,0 +1,111 @@
+from astrbot.api import logger
+
+from . import json_util
+from .translation import normalize
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import time
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "constants" / "image_overrides.json"
+ALL_GAMES = "*"
+
+
+class ImageOverrideRegistry:
+    """
+    上游图片有问题的武器、载具、士兵的替换图片。
+    数据文件格式为 {类型: {游戏代号或*: {名称: 图片URL}}}，* 对所有游戏生效，同名时具体游戏优先。
+    插件数据目录中的同名文件覆盖内置条目，修改后无需重启即可生效。
+    """
+
+    def __init__(self, data_file: Path = DATA_FILE, check_interval: float = 10):
+        """
+        Args:
+            data_file: 内置的替换图片文件
+            check_interval: 检查数据目录文件是否修改的最短间隔(秒)
+        """
+        self.data_file = data_file
+        self.override_file: Optional[Path] = None
+        self.check_interval = check_interval
+        # (类型, 游戏代号, 规范化名称) -> 图片URL
+        self._index: Optional[Dict[Tuple[str, str, str], str]] = None
+        self._override_mtime: Optional[float] = None
+        self._checked_at = 0.0
+
+    def configure(self, override_file: Optional[Path]):
+        """
+        Args:
+            override_file: 插件数据目录中的替换图片文件
+        """
+        self.override_file = override_file
+        self._index = None
+
+    def _mtime(self) -> Optional[float]:
+        try:
+            return self.override_file.stat().st_mtime if self.override_file is not None else None
+        except OSError:
+            return None
+
+    def _build(self) -> Dict[Tuple[str, str, str], str]:
+        index: Dict[Tuple[str, str, str], str] = {}
+        self._override_mtime = self._mtime()
+        sources = [self.data_file]
+        if self._override_mtime is not None:
+            sources.append(self.override_file)
+        for path in sources:
+            try:
+                data = json_util.loads(path.read_bytes())
+            except Exception as e:
+                logger.error(f"Battlefield Tool 读取替换图片文件失败 {path}: {e}")
+                continue
+            for kind, games in data.items():
+                for game, entries in games.items():
+                    for name, url in entries.items():
+                        index[(kind, game.strip().lower(), normalize(name))] = url
+        return index
+
+    def _get_index(self) -> Dict[Tuple[str, str, str], str]:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            if self._mtime() != self._override_mtime:
+                logger.info("Battlefield Tool 替换图片文件已修改，重新加载")
+                self._index = None
+        if self._index is None:
+            self._checked_at = now
+            self._index = self._build()
+        return self._index
+
+    def reload(self):
+        self._index = self._build()
+
+    def resolve(self, kind: str, name: str, url: str, game: str = None) -> str:
+        """
+        获取替换后的图片
+        Args:
+            kind: weapon/vehicle/soldier
+            name: 接口返回的名称(未翻译)
+            url: 接口返回的图片URL
+            game: 游戏代号
+        Returns:
+            有替换图片时返回替换图片，否则返回原URL
+        """
+        if not name:
+            return url
+        index = self._get_index()
+        if not index:
+            return url
+        key = normalize(name)
+        if game:
+            override = index.get((kind, game, key))
+            if override:
+                return override
+        return index.get((kind, ALL_GAMES, key), url)
+
+
+image_overrides = ImageOverrideRegistry()
+
+
+def override_image(kind: str, name: str, url: str, game: str = None) -> str:
+    return image_overrides.resolve(kind, name, url, game)
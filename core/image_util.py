@@ -2,14 +2,26 @@ import base64
 import os
 from typing import Optional
 from urllib.parse import urlparse
-from astrbot.api import logger
 from astrbot.api.star import StarTools
 import mimetypes # 导入 mimetypes 模块
+from pathlib import Path
 
 from .request_util import fetch_image
+from .timing import span
+from .log_policy import get_logger
 
-image_dir = StarTools.get_data_dir("battleField_tool_plugin/images")
-image_dir.mkdir(parents=True, exist_ok=True)
+_log = get_logger("image")
+
+_image_dir: Optional[Path] = None
+
+
+def get_image_dir() -> Path:
+    """获取图片缓存目录，首次使用时才创建"""
+    global _image_dir
+    if _image_dir is None:
+        _image_dir = StarTools.get_data_dir("battleField_tool_plugin/images")
+        _image_dir.mkdir(parents=True, exist_ok=True)
+    return _image_dir
 
 
 def _get_mime_type(file_path: str) -> str:
@@ -34,7 +46,7 @@ def get_local_image_path(image_url: str) -> str:
     """
     parsed_url = urlparse(image_url)
     file_name = os.path.basename(parsed_url.path)
-    return os.path.join(image_dir, file_name)
+    return os.path.join(get_image_dir(), file_name)
 
 
 def image_to_base64(image_path: str) -> Optional[str]:
@@ -49,7 +61,7 @@ def image_to_base64(image_path: str) -> Optional[str]:
         如果文件不存在或读取失败则返回None。
     """
     if not os.path.exists(image_path):
-        logger.debug(f"图片文件未找到: {image_path}")
+        _log.debug("图片文件未找到: %s", image_path)
         return None
     
     try:
@@ -58,7 +70,7 @@ def image_to_base64(image_path: str) -> Optional[str]:
         mime_type = _get_mime_type(image_path)
         return f"data:{mime_type};base64,{encoded_string}"
     except Exception as e:
-        logger.error(f"读取或编码图片文件失败: {e}")
+        _log.error("读取或编码图片文件失败: %s", e)
         return None
 
 
@@ -74,7 +86,7 @@ def svg_to_base64(svg_path: str) -> Optional[str]:
         如果文件不存在或读取失败则返回None。
     """
     if not os.path.exists(svg_path):
-        logger.debug(f"SVG文件未找到: {svg_path}")
+        _log.debug("SVG文件未找到: %s", svg_path)
         return None
     
     try:
@@ -84,7 +96,7 @@ def svg_to_base64(svg_path: str) -> Optional[str]:
         # SVG的MIME类型通常是 image/svg+xml
         return f"data:image/svg+xml;base64,{encoded_string}"
     except Exception as e:
-        logger.error(f"读取或编码SVG文件失败: {e}")
+        _log.error("读取或编码SVG文件失败: %s", e)
         return None
 
 
@@ -98,9 +110,9 @@ def save_image_to_local(image_path: str, image_data: bytes):
     try:
         with open(image_path, "wb") as f:
             f.write(image_data)
-        logger.debug(f"图片已保存到本地: {image_path}")
+        _log.debug("图片已保存到本地: %s", image_path)
     except Exception as e:
-        logger.error(f"保存图片到本地失败: {e}")
+        _log.error("保存图片到本地失败: %s", e)
 
 
 async def get_image_base64(image_url: str, timeout: int = 15) -> Optional[str]:
@@ -124,12 +136,13 @@ async def get_image_base64(image_url: str, timeout: int = 15) -> Optional[str]:
         base64_data = image_to_base64(local_path)
 
     if base64_data:
-        logger.debug(f"图片已从本地获取并转换为Base64: {local_path}")
+        _log.debug("图片已从本地获取并转换为Base64: %s", local_path)
         return base64_data
     
-    logger.debug(f"本地未找到图片，尝试从远程获取: {image_url}")
+    _log.debug("本地未找到图片，尝试从远程获取: %s", image_url)
     # 本地不存在，从远程获取
-    image_data = await fetch_image(image_url, timeout)
+    with span("asset_fetch"):
+        image_data = await fetch_image(image_url, timeout)
     if image_data:
         # 保存到本地
         save_image_to_local(local_path, image_data)
@@ -140,8 +153,8 @@ async def get_image_base64(image_url: str, timeout: int = 15) -> Optional[str]:
             base64_data = image_to_base64(local_path)
 
         if base64_data:
-            logger.debug(f"图片已从远程获取、保存到本地并转换为Base64: {local_path}")
+            _log.debug("图片已从远程获取、保存到本地并转换为Base64: %s", local_path)
             return base64_data
     
-    logger.error(f"无法获取图片并转换为Base64: {image_url}")
+    _log.error("无法获取图片并转换为Base64: %s", image_url)
     return None
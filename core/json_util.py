@@ -0,0 +1,101 @@
+import json
+
+from typing import Any, Dict, Iterable
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库
+    orjson = None
+
+
+def loads(data: bytes) -> Any:
+    """解析JSON字节串，安装了orjson时使用orjson"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为JSON字节串，安装了orjson时使用orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# PlayerStats.from_gt_dict 以及各html/llm构建函数用到的字段
+GT_PLAYER_FIELDS = (
+    "avatar", "userName", "userId", "rankImg", "rank", "secondsPlayed", "kills", "killDeath", "killsPerMinute",
+    "headshots", "accuracy", "revives", "headShots", "longestHeadShot", "wins", "highestKillStreak",
+    "errors", "code",
+)
+# Weapon.from_dict 用到的字段
+GT_WEAPON_FIELDS = (
+    "weaponName", "image", "kills", "headshotKills", "shotsFired", "shotsHit", "headshots", "accuracy",
+    "killsPerMinute", "timeEquipped", "type",
+)
+# Vehicle.from_dict 用到的字段
+GT_VEHICLE_FIELDS = (
+    "vehicleName", "image", "kills", "destroyed", "killsPerMinute", "timeIn", "type",
+)
+# 需要裁剪的GameTools玩家数据接口
+GT_PROJECTED_PROPS = {"all", "stats", "weapons", "vehicles"}
+
+
+def _project_items(items: Iterable[Dict[str, Any]], fields: tuple) -> list:
+    """只保留有击杀的条目及其需要的字段，展示时本来就会过滤掉零击杀的条目"""
+    return [
+        {k: item[k] for k in fields if k in item}
+        for item in items
+        if isinstance(item, dict) and item.get("kills", 0) > 0
+    ]
+
+
+def project_gt_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    裁剪GameTools玩家数据，丢弃职业、配件等用不到的字段，减少缓存占用
+    Args:
+        data: GameTools接口返回的原始字典
+    Returns:
+        只包含实体类需要字段的新字典
+    """
+    projected = {k: data[k] for k in GT_PLAYER_FIELDS if k in data}
+    if isinstance(data.get("weapons"), list):
+        projected["weapons"] = _project_items(data["weapons"], GT_WEAPON_FIELDS)
+    if isinstance(data.get("vehicles"), list):
+        projected["vehicles"] = _project_items(data["vehicles"], GT_VEHICLE_FIELDS)
+    return projected
+
+
+# BTR接口中实体类会读取的 metadata 字段
+BTR_METADATA_FIELDS = ("name", "category", "categoryName", "imageUrl")
+
+
+def _project_btr_segment(segment: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = segment.get("metadata") or {}
+    return {
+        "type": segment.get("type"),
+        "metadata": {k: metadata[k] for k in BTR_METADATA_FIELDS if k in metadata},
+        "stats": segment.get("stats") or {},
+    }
+
+
+def project_btr_payload(data: Any) -> Any:
+    """
+    裁剪BTR接口数据，只保留实体类需要的字段
+    Args:
+        data: BTR接口返回的数据，可能是带segments的字典、segment列表或多用户列表
+    Returns:
+        裁剪后的数据，无法识别的结构原样返回
+    """
+    if isinstance(data, dict) and isinstance(data.get("segments"), list):
+        platform_info = data.get("platformInfo") or {}
+        projected = {
+            "platformInfo": {"platformUserHandle": platform_info.get("platformUserHandle", "--")},
+            "segments": [_project_btr_segment(s) for s in data["segments"] if isinstance(s, dict)],
+        }
+        if "avatar" in data:
+            projected["avatar"] = data["avatar"]
+        return projected
+    if isinstance(data, list) and data and all(isinstance(s, dict) and "stats" in s for s in data):
+        return [_project_btr_segment(s) for s in data]
+    return data
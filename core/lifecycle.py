@@ -0,0 +1,93 @@
+from astrbot.api import logger
+
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+import asyncio
+import functools
+import inspect
+
+
+class PluginLifecycle:
+    """跟踪插件持有的后台任务、渲染请求和资源，在插件卸载时按顺序回收"""
+
+    def __init__(self, drain_timeout: float = 10):
+        """
+        Args:
+            drain_timeout: 卸载时等待正在进行的渲染完成的最长时间(秒)
+        """
+        self.drain_timeout = drain_timeout
+        self.closing = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._closers: List[Tuple[str, Callable]] = []
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def track(self, task: Optional[asyncio.Task]) -> Optional[asyncio.Task]:
+        """登记一个已创建的任务，任务结束后自动移除"""
+        if task is None:
+            return None
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def create_task(self, coro: Awaitable, name: str = None) -> asyncio.Task:
+        """创建并登记后台任务"""
+        return self.track(asyncio.create_task(coro, name=name))
+
+    def add_closer(self, name: str, closer: Callable):
+        """登记卸载时需要关闭的资源，按登记的逆序关闭"""
+        self._closers.append((name, closer))
+
+    @property
+    def in_flight(self) -> int:
+        """正在进行的渲染数量"""
+        return self._in_flight
+
+    def wrap_render(self, html_render_func: Callable) -> Callable:
+        """包装渲染函数，记录正在进行的渲染，卸载开始后拒绝新的渲染"""
+
+        @functools.wraps(html_render_func)
+        async def wrapper(*args, **kwargs):
+            if self.closing:
+                raise RuntimeError("插件正在卸载，暂停渲染")
+            self._in_flight += 1
+            self._idle.clear()
+            try:
+                return await html_render_func(*args, **kwargs)
+            finally:
+                self._in_flight -= 1
+                if self._in_flight == 0:
+                    self._idle.set()
+
+        return wrapper
+
+    async def shutdown(self):
+        """等待渲染完成、取消后台任务并关闭所有资源"""
+        if self.closing:
+            return
+        self.closing = True
+
+        if self._in_flight:
+            logger.info(f"Battlefield Tool 等待 {self._in_flight} 个渲染完成后卸载")
+            try:
+                await asyncio.wait_for(self._idle.wait(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Battlefield Tool 渲染未在 {self.drain_timeout} 秒内完成，强制卸载")
+
+        tasks = [task for task in self._tasks if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        while self._closers:
+            name, closer = self._closers.pop()
+            try:
+                result = closer()
+                if inspect.isawaitable(result):
+                    await result
+                logger.debug(f"Battlefield Tool 已关闭资源: {name}")
+            except Exception as e:
+                logger.error(f"Battlefield Tool 关闭资源 {name} 失败: {e}")
@@ -0,0 +1,187 @@
+from astrbot.api import logger
+
+from typing import Any, Dict, Iterable, Optional
+
+import logging
+import random
+import re
+import time
+
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "off": logging.CRITICAL + 10,
+}
+# 需要脱敏的参数和请求头
+_SENSITIVE_KEYS = {"x-api-key", "ssc_token"}
+_PLAYER_KEYS = {"name", "player_name", "pider", "ea_name", "ea_id", "qq_id"}
+_API_KEY_PATTERN = re.compile(r"(['\"]?x-api-key['\"]?\s*[:=]\s*['\"]?)[^'\"\s,}]+", re.IGNORECASE)
+
+
+def mask(value: Any) -> str:
+    """只保留首尾字符，例如 ExamplePlayer -> E***r"""
+    text = str(value)
+    if len(text) <= 2:
+        return "*" * len(text)
+    return f"{text[0]}***{text[-1]}"
+
+
+def truncate(text: Any, limit: int = 300) -> str:
+    """截断过长的内容(如接口返回的错误数据)，保留开头部分"""
+    text = str(text)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(共{len(text)}字符)"
+
+
+class LogPolicy:
+    """插件日志的统一策略：按子系统设置级别、采样高频日志、限制同一条日志的频率、对玩家信息和密钥脱敏"""
+
+    def __init__(self):
+        self.default_level = logging.DEBUG
+        self.levels: Dict[str, int] = {}
+        self.sample_rate = 1.0
+        self.rate_limit = 0
+        self.rate_window = 60.0
+        self.redact = True
+        # 限流状态: 消息模板 -> [窗口开始时间, 窗口内已输出条数, 被省略条数]
+        self._windows: Dict[str, list] = {}
+
+    def configure(self, levels: Iterable[str] = (), sample_rate: float = 1.0, rate_limit: int = 0,
+                  redact: bool = True):
+        """
+        Args:
+            levels: ["子系统=级别", ...]，级别为 debug/info/warning/error/off，子系统为 * 时设置默认级别
+            sample_rate: 标记为可采样的日志的输出比例
+            rate_limit: 同一条日志每分钟最多输出的次数，0为不限制
+            redact: 是否对玩家名和密钥脱敏
+        """
+        self.default_level = logging.DEBUG
+        self.levels = {}
+        for item in levels or ():
+            subsystem, _, level = str(item).partition("=")
+            level_no = _LEVELS.get(level.strip().lower())
+            if level_no is None:
+                logger.warning(f"Battlefield Tool 无法识别的日志级别设置: {item}")
+                continue
+            if subsystem.strip() == "*":
+                self.default_level = level_no
+            else:
+                self.levels[subsystem.strip()] = level_no
+        self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+        self.rate_limit = max(int(rate_limit), 0)
+        self.redact = redact
+        self._windows.clear()
+
+    def enabled(self, subsystem: str, level: int) -> bool:
+        if level < self.levels.get(subsystem, self.default_level):
+            return False
+        is_enabled_for = getattr(logger, "isEnabledFor", None)
+        return is_enabled_for is None or is_enabled_for(level)
+
+    def allow(self, key: str) -> Optional[int]:
+        """
+        判断该条日志是否超出频率限制
+        Returns:
+            允许输出时返回此前被省略的条数，超出限制时返回None
+        """
+        if not self.rate_limit:
+            return 0
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.rate_window:
+            suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            return suppressed
+        if window[1] >= self.rate_limit:
+            window[2] += 1
+            return None
+        window[1] += 1
+        return 0
+
+    def redact_params(self, params: Optional[dict]) -> Any:
+        """请求参数脱敏"""
+        if not self.redact or not isinstance(params, dict):
+            return params
+        result = {}
+        for key, value in params.items():
+            lowered = str(key).lower()
+            if lowered in _SENSITIVE_KEYS:
+                result[key] = "***"
+            elif lowered in _PLAYER_KEYS and value:
+                result[key] = mask(value)
+            else:
+                result[key] = value
+        return result
+
+    def redact_text(self, text: str) -> str:
+        """文本中的 X-API-Key 脱敏"""
+        if not self.redact:
+            return text
+        return _API_KEY_PATTERN.sub(r"\1***", text)
+
+    def redact_name(self, name: Any) -> Any:
+        if not self.redact or not name:
+            return name
+        return mask(name)
+
+
+log_policy = LogPolicy()
+
+
+class PolicyLogger:
+    """
+    按子系统输出日志。消息使用 % 格式，参数可以是无参函数，只有确实需要输出时才会调用和格式化。
+        log = get_logger("request")
+        log.info("请求接口: %s 参数: %s", url, lambda: log_policy.redact_params(params), sample=True)
+    """
+
+    def __init__(self, subsystem: str):
+        self.subsystem = subsystem
+
+    def _log(self, level: int, msg: str, args: tuple, sample: bool = False, key: str = None,
+             exc_info: bool = False):
+        if not log_policy.enabled(self.subsystem, level):
+            return
+        if sample and log_policy.sample_rate < 1 and random.random() >= log_policy.sample_rate:
+            return
+        suppressed = log_policy.allow(key or f"{self.subsystem}:{msg}")
+        if suppressed is None:
+            return
+        text = msg % tuple(arg() if callable(arg) else arg for arg in args) if args else msg
+        text = log_policy.redact_text(text)
+        if suppressed:
+            text += f" (此前{log_policy.rate_window:.0f}秒内省略了{suppressed}条相同日志)"
+        if level >= logging.ERROR:
+            if exc_info:
+                logger.exception(text)
+            else:
+                logger.error(text)
+        elif level >= logging.WARNING:
+            logger.warning(text)
+        elif level >= logging.INFO:
+            logger.info(text)
+        else:
+            logger.debug(text)
+
+    def debug(self, msg: str, *args, sample: bool = False, key: str = None):
+        self._log(logging.DEBUG, msg, args, sample, key)
+
+    def info(self, msg: str, *args, sample: bool = False, key: str = None):
+        self._log(logging.INFO, msg, args, sample, key)
+
+    def warning(self, msg: str, *args, sample: bool = False, key: str = None):
+        self._log(logging.WARNING, msg, args, sample, key)
+
+    def error(self, msg: str, *args, sample: bool = False, key: str = None):
+        self._log(logging.ERROR, msg, args, sample, key)
+
+    def exception(self, msg: str, *args, key: str = None):
+        """error 级别并附带当前异常的堆栈，在 except 块中调用"""
+        self._log(logging.ERROR, msg, args, key=key, exc_info=True)
+
+
+def get_logger(subsystem: str) -> PolicyLogger:
+    return PolicyLogger(subsystem)
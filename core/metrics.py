@@ -0,0 +1,231 @@
+from astrbot.api import logger
+from aiohttp import web
+
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import bisect
+
+# 默认直方图桶上限(秒)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+LabelValues = Tuple[str, ...]
+_LE_INF = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """指标基类，按标签值区分多条时间序列"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def exposition(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self.samples()]
+
+
+class Counter(Metric):
+    """只增不减的计数"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """可任意设置的当前值"""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class CallbackMetric(Metric):
+    """导出时才调用函数取值，用于暴露其他组件已有的统计"""
+
+    def __init__(self, name: str, documentation: str, metric_type: str,
+                 func: Callable[[], Iterable[Tuple[Dict[str, str], float]]], labelnames: Iterable[str] = ()):
+        """
+        Args:
+            func: 返回 (标签字典, 值) 的可迭代对象
+        """
+        super().__init__(name, documentation, labelnames)
+        self.type = metric_type
+        self.func = func
+
+    def samples(self) -> List[str]:
+        try:
+            values = list(self.func())
+        except Exception as e:
+            logger.warning(f"Battlefield Tool 采集指标 {self.name} 失败: {e}")
+            return []
+        return [f"{self.name}{_format_labels(self.labelnames, self._key(labels))} {_format_value(value)}"
+                for labels, value in values]
+
+
+class Histogram(Metric):
+    """按固定桶统计分布，单位为秒"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 每条序列: [各桶计数..., 总数, 总和]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._values.get(key)
+        if series is None:
+            series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += 1
+        series[-1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, _LE_INF)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series[-2]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表，导出为 Prometheus 文本格式"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """注册指标，同名指标会被替换(插件重载时重新登记回调)"""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, metric_type: str, func: Callable,
+                 labelnames: Iterable[str] = ()) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, metric_type, func, labelnames))
+
+    def render(self, prefix: str = "") -> str:
+        """
+        导出所有指标
+        Args:
+            prefix: 只导出名称以此开头的指标
+        Returns:
+            Prometheus 文本格式
+        """
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            if prefix and not name.startswith(prefix):
+                continue
+            lines += metric.exposition()
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+upstream_requests = metrics.counter(
+    "bf_upstream_requests_total", "Upstream API requests by host and status", ("host", "status"))
+upstream_latency = metrics.histogram(
+    "bf_upstream_request_seconds", "Upstream API request latency", ("host",))
+db_query_latency = metrics.histogram(
+    "bf_db_query_seconds", "SQLite query latency", ("op",), buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1))
+commands_total = metrics.counter(
+    "bf_commands_total", "Handled commands by command and game", ("command", "game"))
+command_latency = metrics.histogram(
+    "bf_command_seconds", "End to end command latency", ("command", "game"))
+
+
+def record_upstream(host: str, status, latency: float):
+    """记录一次上游请求，status 为HTTP状态码或异常类别"""
+    upstream_requests.inc(host=host, status=status)
+    upstream_latency.observe(latency, host=host)
+
+
+class MetricsExporter:
+    """在本地端口上提供 /metrics 接口"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def _handle(self, request):
+        return web.Response(text=self.registry.render(), content_type="text/plain")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Battlefield Tool 指标接口已启动: http://{self.host}:{self.port}/metrics")
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
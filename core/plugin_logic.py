@@ -1,7 +1,7 @@
 from astrbot.api.event import AstrMessageEvent
 from astrbot.api import logger
 
-from typing import Union, Pattern
+from typing import Awaitable, Callable, Union, Pattern
 from ..database.battlefield_db_service import (
     BattleFieldDBService,
 )
@@ -10,26 +10,39 @@ from .gametool.gt_template import (
     gt_weapons_html_builder,
     gt_vehicles_html_builder,
     gt_servers_html_builder,
+    gt_list_total,
 )
 from .btr.btr_template import (
     btr_main_html_builder,
     btr_weapons_html_builder,
     btr_vehicles_html_builder,
     btr_soldier_html_builder,
+    btr_list_total,
 )
 
 from .gametool.gt_llm import gt_main_llm_builder
 from .btr.btr_llm import btr_main_llm_builder
 from .gametool.gt_image_generator import GtImageGenerator
 from .btr.btr_image_generator import BtrImageGenerator
+from .render_scheduler import RenderRejectedError
+from .timing import span, set_trace_game
+from .translation import DEFAULT_LANG, normalize_lang, set_locale, current_locale
+from .utils import page_count
 
 from ..models.player_data import PlayerDataRequest
 
+import asyncio
+import functools
 import re
 import time
 
 
 class BattlefieldPluginLogic:
+    # 可以分页发送的查询类型
+    PAGED_TYPES = ("weapons", "vehicles")
+    # 分页发送时提前渲染的页数
+    PAGE_PREFETCH = 2
+
     def __init__(self, db_service: BattleFieldDBService, default_game: str, timeout_config: int, img_quality: int,
                  session, bf_prompt: str, default_platform: str = "pc"):
         self.db_service = db_service
@@ -40,6 +53,7 @@ class BattlefieldPluginLogic:
         self.default_platform = default_platform  # 添加默认平台配置
         self.LANG_CN = "zh-cn"
         self.LANG_TW = "zh-tw"
+        self.LANG_EN = "en-us"
         self.bf_prompt = bf_prompt
         self.SUPPORTED_GAMES = ["bf4", "bf1", "bfv", "bf6", "bf2042"]
         self.STAT_PATTERN = re.compile(
@@ -50,6 +64,73 @@ class BattlefieldPluginLogic:
         # )
         self.gt_image_generator = GtImageGenerator(img_quality)
         self.btr_image_generator = BtrImageGenerator(img_quality)
+        self.refresh_scheduler = None  # 后台刷新任务，由插件初始化时注入
+        self.raster_renderer = None  # stat卡片的快速渲染器，由插件初始化时注入
+        self.raster_stat_all = False  # 所有会话的stat都使用快速渲染
+        self.raster_stat_channels = set()  # 使用快速渲染的会话渠道
+        self.image_output = None  # 图片格式/体积/宽度设置，由插件初始化时注入
+        self.default_locale = DEFAULT_LANG  # 卡片和译名默认使用的语言
+        self.locale_channels = {}  # 会话渠道ID -> 语言
+        self.list_page_size = 0  # weapons/vehicles 每张图片的条目数，0为整张发送
+
+    def configure_locale(self, default_locale: str, locale_channels: list):
+        """
+        Args:
+            default_locale: 默认语言 zh-cn/zh-tw/en
+            locale_channels: ["会话渠道ID=语言", ...]
+        """
+        self.default_locale = normalize_lang(default_locale)
+        self.locale_channels = {}
+        for item in locale_channels or []:
+            channel_id, _, lang = str(item).partition("=")
+            if channel_id.strip() and lang.strip():
+                self.locale_channels[channel_id.strip()] = normalize_lang(lang)
+
+    def resolve_locale(self, session_channel_id: str) -> str:
+        """获取会话使用的语言"""
+        return self.locale_channels.get(str(session_channel_id), self.default_locale)
+
+    def get_request_lang(self, game: str) -> str:
+        """获取请求GameTools时使用的语言，跟随会话语言，简中会话的战地1使用繁中"""
+        locale = current_locale()
+        if locale == "en":
+            return self.LANG_EN
+        if locale == "zh-tw":
+            return self.LANG_TW
+        return self.LANG_TW if game == "bf1" else self.LANG_CN
+
+    def _image_output_settings(self, event: AstrMessageEvent) -> tuple:
+        """获取当前会话的图片格式和宽度"""
+        if self.image_output is None:
+            return "jpeg", 0
+        return self.image_output.resolve(event, self.get_session_channel_id(event))
+
+    def _apply_image_output(self, event: AstrMessageEvent, html_render_func):
+        """按当前会话的图片设置包装渲染函数"""
+        if self.image_output is None:
+            return html_render_func
+        return self.image_output.wrap(html_render_func, *self._image_output_settings(event))
+
+    def use_raster_stat(self, event: AstrMessageEvent) -> bool:
+        """当前会话的stat查询是否使用快速渲染"""
+        if self.raster_renderer is None:
+            return False
+        return self.raster_stat_all or self.get_session_channel_id(event) in self.raster_stat_channels
+
+    SERVER_WATCH_ACTIONS = {"watch": "watch", "监控": "watch", "unwatch": "unwatch", "取消监控": "unwatch"}
+
+    def parse_server_watch_action(self, message_str: str) -> tuple[Union[str, None], str, str]:
+        """
+        识别 servers watch/unwatch 子指令
+        Args:
+            message_str: 消息原文
+        Returns:
+            (watch/unwatch, 子指令原文, 剩余参数)，不是子指令时第一项为None
+        """
+        parts = message_str.strip().split(maxsplit=2)
+        if len(parts) >= 2 and parts[1].lower() in self.SERVER_WATCH_ACTIONS:
+            return self.SERVER_WATCH_ACTIONS[parts[1].lower()], parts[1], parts[2] if len(parts) > 2 else ""
+        return None, "", ""
 
     def get_session_channel_id(self, event: AstrMessageEvent) -> str:
         """根据事件类型获取会话渠道ID"""
@@ -123,11 +204,18 @@ class BattlefieldPluginLogic:
             }
 
             generator_func, html_builder_func = handler_map[data_type]
+            html_render_func = self._apply_image_output(event, html_render_func)
+            pages = self._list_pages(data_type, btr_list_total(weapon_data, vehicle_data, data_type))
 
-            pic_url = await generator_func(game, html_render_func, html_builder_func, stat_data, weapon_data,
-                                           vehicle_data,
-                                           soldier_data)
-            yield pic_url
+            def render_page(page: int):
+                return generator_func(game, html_render_func, self._page_builder(html_builder_func, page, pages),
+                                      stat_data, weapon_data, vehicle_data, soldier_data)
+
+            try:
+                async for pic_url in self._stream_pages(render_page, pages):
+                    yield pic_url
+            except RenderRejectedError as e:
+                yield e.message
 
     def _handle_error_response(self, api_data: dict) -> Union[str, None]:
         """统一处理API响应中的错误信息"""
@@ -150,7 +238,7 @@ class BattlefieldPluginLogic:
                 yield event.plain_result(error_msg)
                 return
 
-            api_data["__update_time"] = time.time()
+            api_data.setdefault("__update_time", time.time())
 
             # 根据数据类型调用对应的图片生成方法
             handler_map = {
@@ -160,12 +248,74 @@ class BattlefieldPluginLogic:
                 "servers": (self.gt_image_generator.generate_servers_gt_data_pic, gt_servers_html_builder),
             }
 
+            if data_type == "stat" and self.use_raster_stat(event):
+                try:
+                    with span("render"):
+                        pic_path = await self.raster_renderer.render_main(api_data, game)
+                    if self.image_output is not None:
+                        with span("encode"):
+                            pic_path = await self.image_output.process(pic_path, *self._image_output_settings(event))
+                    yield pic_path
+                    return
+                except Exception as e:
+                    logger.warning(f"Battlefield Tool 快速渲染失败，改用html渲染: {e}")
+
             generator_func, html_builder_func = handler_map[data_type]
-            pic_url = await generator_func(api_data, game, html_render_func, html_builder_func)
-            if isinstance(pic_url, str) and "https://campux.shooting-star-c.top" in pic_url:
-                yield event.plain_result(pic_url)
-            else:
-                yield pic_url
+            html_render_func = self._apply_image_output(event, html_render_func)
+            pages = self._list_pages(data_type, gt_list_total(api_data, data_type)) \
+                if data_type in self.PAGED_TYPES else 1
+
+            def render_page(page: int):
+                return generator_func(api_data, game, html_render_func,
+                                      self._page_builder(html_builder_func, page, pages))
+
+            try:
+                async for pic_url in self._stream_pages(render_page, pages):
+                    if isinstance(pic_url, str) and "https://campux.shooting-star-c.top" in pic_url:
+                        yield event.plain_result(pic_url)
+                    else:
+                        yield pic_url
+            except RenderRejectedError as e:
+                yield event.plain_result(e.message)
+
+    def _list_pages(self, data_type: str, total: int) -> int:
+        """weapons/vehicles 分页发送的页数，其他类型为1"""
+        if data_type not in self.PAGED_TYPES:
+            return 1
+        return page_count(total, self.list_page_size)
+
+    def _page_builder(self, html_builder_func: Callable, page: int, pages: int) -> Callable:
+        """分页时把页码绑定到html构建函数上"""
+        if pages <= 1:
+            return html_builder_func
+        return functools.partial(html_builder_func, page=page, page_size=self.list_page_size)
+
+    async def _stream_pages(self, render_page: Callable[[int], Awaitable], pages: int):
+        """
+        按页码顺序渲染并逐页返回，第一页完成后立即返回，同时最多提前渲染 PAGE_PREFETCH 页
+        Args:
+            render_page: 渲染指定页码并返回图片的函数
+            pages: 总页数
+        """
+        if pages <= 1:
+            yield await render_page(0)
+            return
+
+        pending = {}
+        next_page = 0
+        try:
+            for page in range(pages):
+                while next_page < pages and next_page < page + self.PAGE_PREFETCH:
+                    pending[next_page] = asyncio.create_task(render_page(next_page))
+                    next_page += 1
+                yield await pending.pop(page)
+        finally:
+            # 出错或消息发送中断时取消还未完成的页
+            for task in pending.values():
+                if task.done() and not task.cancelled():
+                    task.exception()
+                else:
+                    task.cancel()
 
     async def handle_player_data_request(
             self, event: AstrMessageEvent, str_to_remove_list: list
@@ -182,6 +332,7 @@ class BattlefieldPluginLogic:
         lang = self.LANG_CN
         qq_id = event.get_sender_id()
         session_channel_id = self.get_session_channel_id(event)
+        set_locale(self.resolve_locale(session_channel_id))
         error_msg = None
         ea_name = None
         game = None
@@ -190,31 +341,34 @@ class BattlefieldPluginLogic:
 
         try:
             # 解析命令
-            ea_name, game,pider = await self._parse_input_regex(
-                str_to_remove_list, self.STAT_PATTERN, message_str
-            )
+            with span("parse"):
+                ea_name, game,pider = await self._parse_input_regex(
+                    str_to_remove_list, self.STAT_PATTERN, message_str
+                )
             # 由于共用解析方法所以这里赋个值
-            if str_to_remove_list == ["servers", "服务器"]:
+            if "servers" in str_to_remove_list:
                 server_name = ea_name
 
             # 处理游戏代号
-            game, game_error = await self._resolve_game_tag(game, session_channel_id)
+            with span("db"):
+                game, game_error = await self._resolve_game_tag(game, session_channel_id)
             if game_error:
                 error_msg = game_error
                 raise ValueError(error_msg)  # 抛出异常以便被捕获
+            set_trace_game(game)
 
             # 处理EA账号名
             if not ea_name and  not pider:
-                ea_name,pider, ea_name_error = await self._resolve_ea_name(ea_name, qq_id)
+                with span("db"):
+                    ea_name,pider, ea_name_error = await self._resolve_ea_name(ea_name, qq_id)
                 if ea_name_error:
                     error_msg = ea_name_error
                     raise ValueError(error_msg)  # 抛出异常以便被捕获
+                # 记录绑定用户的活跃情况，供后台刷新使用
+                if self.refresh_scheduler is not None:
+                    self.refresh_scheduler.mark_active(qq_id, game, current_locale())
 
-
-
-            # 战地1使用繁中
-            if game == "bf1":
-                lang = self.LANG_TW
+            lang = self.get_request_lang(game)
         except Exception as e:
             error_msg = str(e)
 
@@ -233,6 +387,7 @@ class BattlefieldPluginLogic:
                                         game: str = None):
         """解析LLM请求参数、构建PlayerDataRequest"""
         session_channel_id = self.get_session_channel_id(event)
+        set_locale(self.resolve_locale(session_channel_id))
         lang = self.LANG_CN
 
         # 处理EA_NAME
@@ -254,9 +409,7 @@ class BattlefieldPluginLogic:
         if game_error:
             error_msg = game_error
 
-        # 战地1使用繁中
-        if game == "bf1":
-            lang = self.LANG_TW
+        lang = self.get_request_lang(game)
         return PlayerDataRequest(
             message_str=event.message_str,
             lang=lang,
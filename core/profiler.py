@@ -0,0 +1,151 @@
+from astrbot.api import logger
+
+from pathlib import Path
+
+import cProfile
+import functools
+import io
+import itertools
+import pstats
+import time
+
+try:
+    from pyinstrument import Profiler as _PyinstrumentProfiler
+except ImportError:  # pyinstrument 为可选依赖，未安装时使用 cProfile
+    _PyinstrumentProfiler = None
+
+
+class _Session:
+    """一次采样，封装 pyinstrument 和 cProfile 的差异"""
+
+    def __init__(self):
+        if _PyinstrumentProfiler is not None:
+            self._profiler = _PyinstrumentProfiler(async_mode="enabled")
+        else:
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        if _PyinstrumentProfiler is not None:
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self):
+        if _PyinstrumentProfiler is not None:
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def report(self, top: int) -> str:
+        if _PyinstrumentProfiler is not None:
+            return self._profiler.output_text(unicode=True, show_all=False)
+        stream = io.StringIO()
+        pstats.Stats(self._profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+        return stream.getvalue()
+
+
+class CommandProfiler:
+    """
+    按需对指令处理进行性能采样，每N次请求采样一次，或采样后只保留超过耗时阈值的结果。
+    同一时间只采样一个请求，采样期间事件循环中其他协程的耗时也会被计入。
+    """
+
+    def __init__(self, output_dir: Path = None, every_n: int = 0, slow_ms: float = 0, keep: int = 20,
+                 top: int = 40):
+        """
+        Args:
+            output_dir: 采样结果保存目录
+            every_n: 每N次请求采样一次，0为不按次数采样
+            slow_ms: 大于0时每次请求都采样，只保存耗时超过该值(毫秒)的结果
+            keep: 最多保留的采样文件数
+            top: 每个结果保存的函数数量(cProfile)
+        """
+        self.output_dir = output_dir
+        self.every_n = every_n
+        self.slow_ms = slow_ms
+        self.keep = keep
+        self.top = top
+        self.enabled = False
+        self._counter = itertools.count(1)
+        self._active = False
+        self.saved = 0
+
+    def configure(self, output_dir: Path, enabled: bool, every_n: int, slow_ms: float, keep: int):
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.every_n = every_n
+        self.slow_ms = slow_ms
+        self.keep = keep
+
+    @property
+    def backend(self) -> str:
+        return "pyinstrument" if _PyinstrumentProfiler is not None else "cProfile"
+
+    def status(self) -> str:
+        return (f"性能采样: {'开启' if self.enabled else '关闭'} 方式:{self.backend} "
+                f"每{self.every_n or '-'}次 慢请求阈值:{self.slow_ms or '-'}ms 已保存:{self.saved} 保留:{self.keep}")
+
+    def _should_sample(self) -> bool:
+        if not self.enabled or self._active or self.output_dir is None:
+            return False
+        if self.slow_ms > 0:
+            return True
+        return self.every_n > 0 and next(self._counter) % self.every_n == 0
+
+    def _save(self, command: str, elapsed_ms: float, session: _Session):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = f"profile_{time.strftime('%Y%m%d_%H%M%S')}_{self.saved:04d}_{command}_{elapsed_ms:.0f}ms.txt"
+        path = self.output_dir / name
+        path.write_text(f"{command} {elapsed_ms:.1f}ms\n\n{session.report(self.top)}", encoding="utf-8")
+        self.saved += 1
+        logger.info(f"Battlefield Tool 已保存性能采样: {path}")
+        # 按修改时间只保留最新的 keep 个文件
+        files = sorted(self.output_dir.glob("profile_*.txt"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in files[self.keep:]:
+            old.unlink(missing_ok=True)
+
+    def wrap(self, command: str):
+        """装饰指令处理函数(异步生成器)"""
+
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if not self._should_sample():
+                    async for result in func(*args, **kwargs):
+                        yield result
+                    return
+
+                session = _Session()
+                self._active = True
+                start = time.perf_counter()
+                try:
+                    try:
+                        session.start()
+                    except Exception as e:
+                        # 如已有其他采样器在运行，本次不采样，指令照常执行
+                        logger.warning(f"Battlefield Tool 启动性能采样失败: {e}")
+                        session = None
+                    async for result in func(*args, **kwargs):
+                        yield result
+                finally:
+                    self._active = False
+                    if session is not None:
+                        session.stop()
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    if session is not None and elapsed_ms >= self.slow_ms:
+                        try:
+                            self._save(command, elapsed_ms, session)
+                        except Exception as e:
+                            logger.warning(f"Battlefield Tool 保存性能采样失败: {e}")
+
+            return wrapper
+
+        return decorator
+
+
+command_profiler = CommandProfiler()
+
+
+def profiled_command(command: str):
+    """使用全局的 command_profiler 装饰指令处理函数"""
+    return command_profiler.wrap(command)
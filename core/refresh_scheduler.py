@@ -0,0 +1,154 @@
+from astrbot.api import logger
+
+from .request_util import upstream_health, get_host, GAMETOOLS_API_SITE, BTR_API_SITE
+from .translation import DEFAULT_LANG, current_locale, set_locale
+from ..models.player_data import PlayerDataRequest
+
+from typing import Dict, Optional, Tuple
+
+import asyncio
+import random
+import time
+
+
+class RateLimiter:
+    """令牌桶限流器，按每分钟次数控制请求速率"""
+
+    def __init__(self, per_minute: float):
+        if per_minute <= 0:
+            raise ValueError("每分钟次数必须大于0")
+        self.capacity = max(per_minute, 1)
+        self.rate = per_minute / 60
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    async def acquire(self):
+        """等待直到获取一个令牌"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class BindRefreshScheduler:
+    """后台定时刷新最近活跃的绑定玩家数据，让交互查询直接命中缓存"""
+
+    def __init__(self, db_service, api_handlers, plugin_logic, interval: int = 240, active_hours: int = 24,
+                 btr_per_minute: float = 2, max_per_round: int = 20, jitter: float = 0.2):
+        """
+        Args:
+            db_service: 数据库服务
+            api_handlers: 接口处理器，提供缓存预热方法
+            plugin_logic: 插件逻辑，用于获取请求语言和平台
+            interval: 每轮刷新的间隔(秒)
+            active_hours: 多少小时内查询过的绑定用户视为活跃
+            btr_per_minute: 后台任务每分钟最多请求BTR接口的次数，给交互查询留出余量，0为不刷新bf2042/bf6
+            max_per_round: 每轮最多刷新的玩家数
+            jitter: 间隔抖动比例
+        """
+        self.db_service = db_service
+        self.api_handlers = api_handlers
+        self.plugin_logic = plugin_logic
+        self.interval = interval
+        self.active_seconds = active_hours * 3600
+        self.max_per_round = max_per_round
+        self.jitter = jitter
+        self.btr_limiter = RateLimiter(btr_per_minute) if btr_per_minute > 0 else None
+        self._active: Dict[str, Tuple[float, str, str]] = {}  # qq_id -> (最后活跃时间, 游戏, 会话语言)
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_active(self, qq_id: str, game: str, locale: str = None):
+        """
+        记录绑定用户的一次查询
+        Args:
+            qq_id: 用户标识
+            game: 查询的游戏
+            locale: 查询所在会话的语言，为空时使用当前请求的语言。刷新时按该语言请求，缓存键才能与交互查询一致
+        """
+        self._active[qq_id] = (time.time(), game, locale or current_locale())
+
+    def start(self):
+        """启动后台刷新任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        """停止后台刷新任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _sleep_time(self, base: float) -> float:
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _recent_active(self) -> Dict[str, Tuple[str, str]]:
+        """清理过期的活跃记录，返回最近活跃的 qq_id -> (游戏, 会话语言)，最近查询的优先"""
+        deadline = time.time() - self.active_seconds
+        for qq_id in [k for k, (t, _, _) in self._active.items() if t < deadline]:
+            del self._active[qq_id]
+        ordered = sorted(self._active.items(), key=lambda item: item[1][0], reverse=True)
+        return {qq_id: (game, locale) for qq_id, (_, game, locale) in ordered[:self.max_per_round]}
+
+    async def _run(self):
+        logger.debug("Battlefield Tool 后台刷新任务已启动")
+        while True:
+            await asyncio.sleep(self._sleep_time(self.interval))
+            try:
+                await self.refresh_round()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Battlefield Tool 后台刷新失败: {e}")
+
+    async def refresh_round(self):
+        """执行一轮刷新"""
+        active = self._recent_active()
+        if not active:
+            return
+        binds = await self.db_service.query_bind_users(list(active.keys()))
+        if not binds:
+            return
+
+        # 把本轮请求分散在半个间隔内，避免集中打到上游
+        spread = self.interval * 0.5 / len(binds)
+        refreshed = 0
+        for bind in binds:
+            game, locale = active.get(bind["qq_id"], (None, DEFAULT_LANG))
+            is_btr = game in ["bf2042", "bf6"]
+            if is_btr and self.btr_limiter is None:
+                continue
+            host = get_host(BTR_API_SITE if is_btr else GAMETOOLS_API_SITE)
+            if not upstream_health.is_healthy(host):
+                logger.debug(f"Battlefield Tool 上游 {host} 不健康，暂停本轮后台刷新")
+                break
+
+            # 后台任务没有会话，恢复查询时的语言，请求语言与交互查询一致才能命中缓存
+            set_locale(locale)
+            request_data = PlayerDataRequest(
+                message_str="",
+                lang=self.plugin_logic.get_request_lang(game),
+                qq_id=bind["qq_id"],
+                pider=bind.get("ea_id") or "",
+                ea_name=bind.get("ea_name"),
+                game=game,
+                server_name=None,
+                error_msg=None,
+            )
+            try:
+                # 一名bf2042玩家需要请求多次BTR接口，每次请求都消耗一个令牌
+                await self.api_handlers.warm_stat_cache(
+                    request_data, self.btr_limiter.acquire if is_btr else None)
+                refreshed += 1
+            except Exception as e:
+                logger.debug(f"Battlefield Tool 后台刷新 {request_data.ea_name} 失败: {e}")
+            await asyncio.sleep(self._sleep_time(spread))
+        logger.debug(f"Battlefield Tool 后台刷新完成，共刷新 {refreshed}/{len(binds)} 名玩家")
@@ -0,0 +1,210 @@
+from astrbot.api import logger
+
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import asyncio
+import time
+import uuid
+
+from jinja2 import Template
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # playwright 为可选依赖，未安装时使用远程渲染
+    async_playwright = None
+
+
+def cleanup_render_outputs(output_dir: Path, keep_seconds: float = 600):
+    """删除保存目录中过期的渲染结果文件"""
+    now = time.time()
+    for path in Path(output_dir).glob("render_*.*"):
+        try:
+            if now - path.stat().st_mtime > keep_seconds:
+                path.unlink()
+        except OSError:
+            pass
+
+
+class RenderBackend:
+    """渲染后端接口，调用方式与 Star.html_render 一致，返回图片的URL或本地路径"""
+
+    name = "base"
+
+    async def render(self, html: str, data: dict = None, return_url: bool = True, options: dict = None) -> str:
+        raise NotImplementedError
+
+    async def close(self):
+        """释放后端持有的资源"""
+
+    async def __call__(self, html: str, data: dict = None, return_url: bool = True, options: dict = None) -> str:
+        return await self.render(html, data, return_url, options)
+
+
+class RemoteRenderBackend(RenderBackend):
+    """使用AstrBot自带的 html_render 渲染(可能是远程文转图服务)"""
+
+    name = "remote"
+
+    def __init__(self, html_render_func: Callable):
+        self.html_render_func = html_render_func
+
+    async def render(self, html: str, data: dict = None, return_url: bool = True, options: dict = None) -> str:
+        return await self.html_render_func(html, data or {}, return_url, options or {})
+
+
+class PlaywrightRenderBackend(RenderBackend):
+    """
+    进程内的Chromium渲染，浏览器只启动一次，页面放在池中复用。
+    playwright 未安装或渲染失败时交给 fallback 渲染。
+    """
+
+    name = "local"
+
+    def __init__(self, output_dir: Path, pool_size: int = 2, fallback: Optional[RenderBackend] = None,
+                 keep_seconds: float = 600, browser_args: Optional[List[str]] = None):
+        """
+        Args:
+            output_dir: 渲染结果的保存目录
+            pool_size: 复用的页面数量
+            fallback: 本地渲染不可用时使用的后端
+            keep_seconds: 渲染结果文件的保留时间(秒)
+            browser_args: Chromium 启动参数，例如容器中以root运行时需要 --no-sandbox
+        """
+        self.output_dir = Path(output_dir)
+        self.pool_size = max(1, pool_size)
+        self.browser_args = list(browser_args or [])
+        self.fallback = fallback
+        self.keep_seconds = keep_seconds
+        self._playwright = None
+        self._browser = None
+        self._pages: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+        self._disabled = async_playwright is None
+        self._last_cleanup = 0.0
+
+    @property
+    def available(self) -> bool:
+        return not self._disabled
+
+    async def _ensure_started(self):
+        if self._pages is not None:
+            return
+        async with self._start_lock:
+            if self._pages is not None:
+                return
+            if self._disabled:
+                raise RuntimeError("本地渲染已停用")
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            pages = asyncio.Queue()
+            try:
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(args=self.browser_args)
+                for _ in range(self.pool_size):
+                    pages.put_nowait(await self._browser.new_page())
+            except Exception:
+                # 启动失败(如未安装浏览器)时释放已启动的部分，之后直接使用备用渲染，不再反复启动
+                self._disabled = True
+                self._pages = pages
+                await self.close()
+                raise
+            self._pages = pages
+            logger.info(f"Battlefield Tool 本地渲染已启动，页面池大小: {self.pool_size}")
+
+    async def _render_local(self, html: str, data: dict, options: dict) -> str:
+        await self._ensure_started()
+        if data:
+            html = Template(html).render(**data)
+        timeout = options.get("timeout", 10000)
+        clip = dict(options.get("clip") or {})
+        page = await self._pages.get()
+        try:
+            if page.is_closed():
+                page = await self._browser.new_page()
+            if clip.get("width"):
+                await page.set_viewport_size({"width": int(clip["width"]), "height": 1000})
+            await page.set_content(html, wait_until="networkidle", timeout=timeout)
+            image_type = options.get("type", "jpeg")
+            screenshot_options = {"type": image_type, "timeout": timeout}
+            if image_type == "jpeg":
+                screenshot_options["quality"] = options.get("quality", 90)
+            if clip:
+                # 与远程渲染一致，裁剪高度不超过页面实际高度
+                content_height = await page.evaluate("document.documentElement.scrollHeight")
+                clip["height"] = min(clip.get("height", content_height), content_height)
+                screenshot_options["clip"] = clip
+            else:
+                screenshot_options["full_page"] = True
+            path = self.output_dir / f"render_{uuid.uuid4().hex}.{'jpg' if image_type == 'jpeg' else image_type}"
+            await page.screenshot(path=str(path), **screenshot_options)
+            return str(path)
+        finally:
+            self._pages.put_nowait(page)
+
+    def _cleanup_outputs(self):
+        now = time.time()
+        if now - self._last_cleanup < 60:
+            return
+        self._last_cleanup = now
+        cleanup_render_outputs(self.output_dir, self.keep_seconds)
+
+    async def render(self, html: str, data: dict = None, return_url: bool = True, options: dict = None) -> str:
+        if self._disabled:
+            return await self._render_fallback(html, data, return_url, options)
+        try:
+            path = await self._render_local(html, data or {}, options or {})
+        except Exception as e:
+            logger.warning(f"Battlefield Tool 本地渲染失败，改用远程渲染: {e}")
+            return await self._render_fallback(html, data, return_url, options)
+        self._cleanup_outputs()
+        return path
+
+    async def _render_fallback(self, html: str, data: dict, return_url: bool, options: dict) -> str:
+        if self.fallback is None:
+            raise RuntimeError("本地渲染不可用且没有配置备用渲染")
+        return await self.fallback.render(html, data, return_url, options)
+
+    async def close(self):
+        pages, self._pages = self._pages, None
+        if pages is not None:
+            while not pages.empty():
+                page = pages.get_nowait()
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning(f"Battlefield Tool 关闭本地渲染浏览器失败: {e}")
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception as e:
+                logger.warning(f"Battlefield Tool 停止playwright失败: {e}")
+
+
+def create_render_backend(name: str, html_render_func: Callable, output_dir: Path,
+                          pool_size: int = 2, browser_args: Optional[List[str]] = None) -> RenderBackend:
+    """
+    根据配置创建渲染后端
+    Args:
+        name: 后端名称，local 或 remote
+        html_render_func: AstrBot 的 html_render
+        output_dir: 本地渲染结果的保存目录
+        pool_size: 本地渲染的页面池大小
+        browser_args: 本地渲染的 Chromium 启动参数
+    Returns:
+        渲染后端，local 不可用时退回 remote
+    """
+    remote = RemoteRenderBackend(html_render_func)
+    if name != "local":
+        return remote
+    backend = PlaywrightRenderBackend(output_dir, pool_size, fallback=remote, browser_args=browser_args)
+    if not backend.available:
+        logger.warning("Battlefield Tool 未安装playwright，使用远程渲染")
+        return remote
+    return backend
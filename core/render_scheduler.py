@@ -0,0 +1,118 @@
+from astrbot.api import logger
+
+from .timing import span
+
+from typing import Callable
+
+import asyncio
+import functools
+import time
+
+
+class RenderRejectedError(Exception):
+    """渲染请求被拒绝，message 可直接回复给用户"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class RenderQueueFullError(RenderRejectedError):
+    """渲染队列已满"""
+
+
+class RenderQueueTimeoutError(RenderRejectedError):
+    """排队等待超时"""
+
+
+class RenderScheduler:
+    """限制同时进行的渲染数量，超出的请求按先来后到排队，队列满时直接拒绝"""
+
+    def __init__(self, concurrency: int = 2, max_queue: int = 10, queue_timeout: float = 60):
+        """
+        Args:
+            concurrency: 同时进行的渲染数量上限
+            max_queue: 排队等待的渲染数量上限
+            queue_timeout: 排队等待的最长时间(秒)
+        """
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        # asyncio.Semaphore 按等待顺序唤醒，即先进先出
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._render_total = 0.0
+        self._render_max = 0.0
+
+    async def submit(self, render_func: Callable, *args, **kwargs):
+        """排队执行一次渲染"""
+        if self.running + self.waiting >= self.concurrency + self.max_queue:
+            self.rejected += 1
+            raise RenderQueueFullError(f"当前图片生成请求过多({self.waiting}个排队中)，请稍后再试")
+
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            with span("render_queue"):
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise RenderQueueTimeoutError(f"图片生成排队超过{self.queue_timeout}秒，请稍后再试")
+        finally:
+            self.waiting -= 1
+
+        wait = time.perf_counter() - queued_at
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        self.running += 1
+        started_at = time.perf_counter()
+        try:
+            # 只统计拿到渲染槽位之后的耗时，排队时间记在 render_queue
+            with span("render"):
+                result = await render_func(*args, **kwargs)
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self._render_total += elapsed
+            self._render_max = max(self._render_max, elapsed)
+            self.running -= 1
+            self._semaphore.release()
+            logger.debug(f"Battlefield Tool 渲染完成: 排队{wait * 1000:.0f}ms, 渲染{elapsed * 1000:.0f}ms")
+
+    def wrap(self, render_func: Callable) -> Callable:
+        """包装渲染函数，使其经过调度器排队"""
+
+        @functools.wraps(render_func)
+        async def wrapper(*args, **kwargs):
+            return await self.submit(render_func, *args, **kwargs)
+
+        return wrapper
+
+    def stats(self) -> dict:
+        """返回队列和耗时统计，时间单位为毫秒"""
+        finished = self.completed + self.failed
+        started = finished + self.running
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(self._wait_total / started * 1000, 1) if started else 0.0,
+            "max_wait_ms": round(self._wait_max * 1000, 1),
+            "avg_render_ms": round(self._render_total / finished * 1000, 1) if finished else 0.0,
+            "max_render_ms": round(self._render_max * 1000, 1),
+        }
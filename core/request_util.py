@@ -1,9 +1,15 @@
 import json
+import time
 import asyncio
 import aiohttp
 
-from astrbot.api import logger
 from typing import Optional
+from urllib.parse import urlparse
+
+from .http_client import get_session
+from . import json_util
+from .metrics import record_upstream
+from .log_policy import get_logger, log_policy, truncate
 
 
 
@@ -12,6 +18,76 @@ BTR_API_SITE = "https://battlefield.shooting-star-c.top/api"
 # BTR_API_SITE = "http://localhost:8766/api"
 SUPPORTED_GAMES = ["bf4","bf1", "bfv"]
 
+_log = get_logger("request")
+
+
+class UpstreamHealth:
+    """记录各上游接口的健康状况，连续失败达到阈值后熔断一段时间"""
+
+    def __init__(self, failure_threshold: int = 3, recovery_time: float = 60):
+        """
+        Args:
+            failure_threshold: 连续失败多少次后熔断
+            recovery_time: 熔断持续时间(秒)，之后允许再次尝试
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self._hosts = {}
+
+    def _get(self, host: str) -> dict:
+        return self._hosts.setdefault(host, {
+            "last_latency": None,
+            "last_error": None,
+            "last_status": None,
+            "consecutive_failures": 0,
+            "opened_at": None,
+        })
+
+    def record_success(self, host: str, latency: float, status: int = 200):
+        """记录一次成功请求"""
+        record_upstream(host, status, latency)
+        state = self._get(host)
+        state["last_latency"] = latency
+        state["last_status"] = status
+        state["consecutive_failures"] = 0
+        state["opened_at"] = None
+
+    def record_failure(self, host: str, latency: float, error: str, status: Optional[int] = None):
+        """记录一次失败请求"""
+        record_upstream(host, status or "error", latency)
+        state = self._get(host)
+        state["last_latency"] = latency
+        state["last_status"] = status
+        state["last_error"] = error
+        state["consecutive_failures"] += 1
+        if state["consecutive_failures"] >= self.failure_threshold:
+            state["opened_at"] = time.monotonic()
+
+    def circuit_state(self, host: str) -> str:
+        """返回熔断状态：closed / open / half_open"""
+        state = self._hosts.get(host)
+        if state is None or state["opened_at"] is None:
+            return "closed"
+        if time.monotonic() - state["opened_at"] < self.recovery_time:
+            return "open"
+        return "half_open"
+
+    def is_healthy(self, host: str) -> bool:
+        """熔断打开期间视为不健康"""
+        return self.circuit_state(host) != "open"
+
+    def snapshot(self) -> dict:
+        """返回所有上游的状态副本"""
+        return {host: {**state, "circuit": self.circuit_state(host)} for host, state in self._hosts.items()}
+
+
+upstream_health = UpstreamHealth()
+
+
+def get_host(url: str) -> str:
+    """获取URL中的主机名"""
+    return urlparse(url).netloc
+
 
 async def gt_request_api(game, prop="stats", params=None, timeout=15, session=None):
     """
@@ -21,7 +97,7 @@ async def gt_request_api(game, prop="stats", params=None, timeout=15, session=No
         prop: 请求属性(stats/servers等)
         params: 查询参数
         timeout: 超时时间(秒)
-        session: 可选的aiohttp.ClientSession实例
+        session: 可选的aiohttp.ClientSession实例，不传时使用共享连接池
     Returns:
         JSON响应数据
     Raises:
@@ -31,21 +107,27 @@ async def gt_request_api(game, prop="stats", params=None, timeout=15, session=No
     if params is None:
         params = {}
     url = GAMETOOLS_API_SITE + f"{game}/{prop}"
-    logger.info(f"Battlefield Tool Request Gametools API: {url}，请求参数: {params}")
+    _log.info("Battlefield Tool Request Gametools API: %s，请求参数: %s", url,
+              lambda: log_policy.redact_params(params), sample=True)
 
-    should_close = session is None
-    if should_close:
-        session = aiohttp.ClientSession()
+    if session is None:
+        session = get_session()
 
+    host = get_host(url)
+    start = time.monotonic()
     try:
         timeout_obj = aiohttp.ClientTimeout(total=timeout)
         async with session.get(url, params=params, timeout=timeout_obj) as response:
             if response.status == 200:
-                result = await response.json()
+                result = json_util.loads(await response.read())
+                if prop in json_util.GT_PROJECTED_PROPS and isinstance(result, dict):
+                    result = json_util.project_gt_payload(result)
                 result["code"] = response.status
+                upstream_health.record_success(host, time.monotonic() - start)
                 return result
             else:
                 # 携带状态码和错误信息抛出
+                _record_status(host, response.status, time.monotonic() - start)
                 error_dict = await response.json()
                 error_dict["code"] = response.status
                 error_msg = (
@@ -55,23 +137,31 @@ async def gt_request_api(game, prop="stats", params=None, timeout=15, session=No
                     f"• 可用代号: {', '.join(SUPPORTED_GAMES)}"
                     f"• 原始错误: {error_dict}"
                 )
-                logger.error(f"Battlefield Tool 调用接口失败，错误信息{error_dict}")
+                _log.error("Battlefield Tool 调用接口失败，错误信息%s", lambda: truncate(error_dict))
                 return error_msg
     except aiohttp.ClientError as e:
         error_msg = f"网络请求异常: {str(e)}"
-        logger.error(error_msg)
+        _log.error("%s", error_msg, key=f"request:{host}:{type(e).__name__}")
+        upstream_health.record_failure(host, time.monotonic() - start, error_msg)
         raise ConnectionError(error_msg) from e
     except json.JSONDecodeError as e:
         error_msg = f"JSON解析失败: {str(e)}"
-        logger.error(error_msg)
+        _log.error("%s", error_msg, key=f"request:{host}:{type(e).__name__}")
+        upstream_health.record_failure(host, time.monotonic() - start, error_msg)
         raise ValueError(error_msg) from e
     except asyncio.TimeoutError as e:
         error_msg = f"请求超时: {timeout}秒内未收到响应"
-        logger.error(error_msg)
+        _log.error("%s", error_msg, key=f"request:{host}:{type(e).__name__}")
+        upstream_health.record_failure(host, time.monotonic() - start, error_msg)
         raise TimeoutError(error_msg) from e
-    finally:
-        if should_close and session is not None:
-            await session.close()
+
+
+def _record_status(host: str, status: int, latency: float):
+    """根据HTTP状态码记录上游健康状况，只有限流和服务端错误算作失败"""
+    if status == 429 or status >= 500:
+        upstream_health.record_failure(host, latency, f"HTTP {status}", status)
+    else:
+        upstream_health.record_success(host, latency, status)
 
 
 async def fetch_image(url: str, timeout: int = 15, session: Optional[aiohttp.ClientSession] = None) -> Optional[bytes]:
@@ -80,16 +170,15 @@ async def fetch_image(url: str, timeout: int = 15, session: Optional[aiohttp.Cli
     Args:
         url: 图片的URL
         timeout: 超时时间(秒)
-        session: 可选的aiohttp.ClientSession实例
+        session: 可选的aiohttp.ClientSession实例，不传时使用共享连接池
     Returns:
         图片的二进制内容，如果失败则返回None
     Raises:
         aiohttp.ClientError: 网络或HTTP错误
         asyncio.TimeoutError: 请求超时
     """
-    should_close = session is None
-    if should_close:
-        session = aiohttp.ClientSession()
+    if session is None:
+        session = get_session()
 
     try:
         timeout_obj = aiohttp.ClientTimeout(total=timeout)
@@ -97,17 +186,14 @@ async def fetch_image(url: str, timeout: int = 15, session: Optional[aiohttp.Cli
             if response.status == 200:
                 return await response.read()
             else:
-                logger.error(f"Battlefield Tool Failed to fetch image from {url}, status: {response.status}")
+                _log.error("Battlefield Tool Failed to fetch image from %s, status: %s", url, response.status)
                 return None
     except aiohttp.ClientError as e:
-        logger.error(f"Battlefield Tool Network request error while fetching image from {url}: {str(e)}")
+        _log.error("Battlefield Tool Network request error while fetching image from %s: %s", url, e)
         return None
     except asyncio.TimeoutError:
-        logger.error(f"Battlefield Tool Request timeout while fetching image from {url} after {timeout} seconds")
+        _log.error("Battlefield Tool Request timeout while fetching image from %s after %s seconds", url, timeout)
         return None
-    finally:
-        if should_close and session is not None:
-            await session.close()
 
 
 
@@ -118,7 +204,7 @@ async def btr_request_api(prop: str, params: Optional[dict] = None, timeout: int
         prop: 请求属性
         params: 查询参数
         timeout: 超时时间(秒)
-        session: 可选的aiohttp.ClientSession实例
+        session: 可选的aiohttp.ClientSession实例，不传时使用共享连接池
         headers: 可选的请求头字典
     Returns:
         JSON响应数据
@@ -143,37 +229,42 @@ async def btr_request_api(prop: str, params: Optional[dict] = None, timeout: int
     if params.get("pider") is None:
         params["pider"] = ""
 
-    logger.info(f"Battlefield Tool Request API: {url}，请求参数: {params}, 是否有ssc_token: {has_token}")
+    _log.info("Battlefield Tool Request API: %s，请求参数: %s, 是否有ssc_token: %s", url,
+              lambda: log_policy.redact_params(params), has_token, sample=True)
 
-    should_close = session is None
-    if should_close:
-        session = aiohttp.ClientSession()
+    if session is None:
+        session = get_session()
 
+    host = get_host(url)
+    start = time.monotonic()
     try:
         timeout_obj = aiohttp.ClientTimeout(total=timeout)
         async with session.get(url, params=params, timeout=timeout_obj, headers=headers) as response:
             if response.status == 200:
-                result = await response.json()
+                result = json_util.loads(await response.read())
+                upstream_health.record_success(host, time.monotonic() - start)
                 return result
             else:
+                _record_status(host, response.status, time.monotonic() - start)
                 error_dict = await response.json()
                 error_msg = (
                     f"Battlefield Tool 调用接口失败，状态码: {response.status}, 错误信息: {error_dict}"
                 )
-                logger.error(error_msg)
+                _log.error("Battlefield Tool 调用接口失败，状态码: %s, 错误信息: %s", response.status,
+                           lambda: truncate(error_dict))
                 raise ValueError(error_msg)
     except aiohttp.ClientError as e:
         error_msg = f"API网络请求异常: {str(e)}"
-        logger.error(error_msg)
+        _log.error("%s", error_msg, key=f"request:{host}:{type(e).__name__}")
+        upstream_health.record_failure(host, time.monotonic() - start, error_msg)
         raise ConnectionError(error_msg) from e
     except json.JSONDecodeError as e:
         error_msg = f"API JSON解析失败: {str(e)}"
-        logger.error(error_msg)
+        _log.error("%s", error_msg, key=f"request:{host}:{type(e).__name__}")
+        upstream_health.record_failure(host, time.monotonic() - start, error_msg)
         raise ValueError(error_msg) from e
     except asyncio.TimeoutError as e:
         error_msg = f"API请求超时: {timeout}秒内未收到响应"
-        logger.error(error_msg)
+        _log.error("%s", error_msg, key=f"request:{host}:{type(e).__name__}")
+        upstream_health.record_failure(host, time.monotonic() - start, error_msg)
         raise TimeoutError(error_msg) from e
-    finally:
-        if should_close and session is not None:
-            await session.close()
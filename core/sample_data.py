@@ -0,0 +1,65 @@
+"""
+按GameTools真实响应结构生成的玩家数据，供渲染自检和基准测试使用，不依赖网络。
+"""
+from typing import Any, Dict
+
+import random
+import time
+
+WEAPON_CATEGORIES = ("Assault Rifles", "LMG", "Sniper Rifles", "Carbines", "SMG", "Shotguns", "Pistols")
+
+
+def gt_player(weapons: int = 30, vehicles: int = 20, seed: int = 1) -> Dict[str, Any]:
+    """GameTools的 all 接口数据，包含接口会返回但插件用不到的字段"""
+    rng = random.Random(seed)
+    return {
+        "avatar": "https://secure.download.dm.origin.com/production/avatar/prod/1/599/208x208.JPEG",
+        "userName": f"BenchPlayer{seed}",
+        "userId": 1000000000 + seed,
+        "id": 1000000000 + seed,
+        "rank": rng.randint(1, 500),
+        "rankImg": "https://cdn.gametools.network/bfv/rank/500.png",
+        "secondsPlayed": rng.randint(10000, 9000000),
+        "kills": rng.randint(100, 300000),
+        "deaths": rng.randint(100, 200000),
+        "killDeath": round(rng.uniform(0.3, 6), 2),
+        "killsPerMinute": round(rng.uniform(0.2, 3), 2),
+        "headshots": f"{rng.uniform(5, 40):.2f}%",
+        "accuracy": f"{rng.uniform(5, 40):.2f}%",
+        "revives": float(rng.randint(0, 50000)),
+        "headShots": rng.randint(0, 60000),
+        "longestHeadShot": round(rng.uniform(10, 1500), 1),
+        "wins": rng.randint(0, 8000),
+        "loses": rng.randint(0, 8000),
+        "highestKillStreak": rng.randint(1, 120),
+        "classes": [{"className": name, "kills": rng.randint(0, 9000), "secondsPlayed": rng.randint(0, 900000),
+                     "image": "https://cdn.gametools.network/class.png"} for name in ("Assault", "Medic", "Support", "Recon")],
+        "gadgets": [{"gadgetName": f"Gadget {i}", "kills": rng.randint(0, 900), "image": ""} for i in range(40)],
+        "weapons": [{
+            "weaponName": f"Weapon {i}",
+            "type": rng.choice(WEAPON_CATEGORIES),
+            "image": f"https://cdn.gametools.network/bfv/weapons/{i}.png",
+            "kills": rng.randint(0, 20000) if i % 5 else 0,
+            "killsPerMinute": round(rng.uniform(0, 3), 2),
+            "damage": rng.randint(0, 900000),
+            "bodyKills": rng.randint(0, 9000),
+            "headshotKills": rng.randint(0, 9000),
+            "headshots": f"{rng.uniform(0, 40):.2f}%",
+            "accuracy": f"{rng.uniform(0, 40):.2f}%",
+            "shotsFired": rng.randint(0, 900000),
+            "shotsHit": rng.randint(0, 300000),
+            "timeEquipped": rng.randint(0, 900000),
+            "hitVKills": round(rng.uniform(0, 10), 2),
+        } for i in range(weapons)],
+        "vehicles": [{
+            "vehicleName": f"Vehicle {i}",
+            "type": "Tank",
+            "image": f"https://cdn.gametools.network/bfv/vehicles/{i}.png",
+            "kills": rng.randint(0, 9000) if i % 4 else 0,
+            "killsPerMinute": round(rng.uniform(0, 3), 2),
+            "destroyed": rng.randint(0, 3000),
+            "timeIn": rng.randint(0, 900000),
+        } for i in range(vehicles)],
+        "__update_time": time.time(),
+        "code": 200,
+    }
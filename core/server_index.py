@@ -0,0 +1,81 @@
+from .translation import normalize
+
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
+
+import time
+
+
+class ServerSearchIndex:
+    """
+    最近搜索过的服务器名索引。
+    GameTools 按名称包含关系搜索服务器，某个关键字的结果未达到数量上限时即为完整结果，
+    之后包含该关键字的更长搜索(如搜过 "bob" 后搜 "[bob]#2")的结果必然是其子集，直接在本地过滤即可。
+    """
+
+    def __init__(self, ttl: float = 60, max_terms: int = 256):
+        """
+        Args:
+            ttl: 搜索结果在本地可用的时间(秒)
+            max_terms: 最多保留的搜索关键字数
+        """
+        self.ttl = ttl
+        self.max_terms = max_terms
+        # (范围, 规范化关键字) -> (查询时间, 结果是否完整, 上游返回的服务器列表)
+        # 同名服务器(如同一服主的多个服)各自保留，命中时返回的数量与上游一致
+        self._terms: "OrderedDict[Tuple[Hashable, str], Tuple[float, bool, List[dict]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, scope: Hashable, term: str, servers: List[dict], limit: int, fetched_at: float = None):
+        """
+        记录一次上游搜索结果
+        Args:
+            scope: 搜索范围(游戏、地区、语言、平台)
+            term: 搜索关键字
+            servers: 返回的服务器列表
+            limit: 请求时的数量上限
+            fetched_at: 查询时间
+        """
+        fetched_at = fetched_at or time.time()
+        key = (scope, normalize(term))
+        self._terms[key] = (fetched_at, len(servers) < limit, [dict(server) for server in servers])
+        self._terms.move_to_end(key)
+        while len(self._terms) > self.max_terms:
+            self._terms.popitem(last=False)
+
+    def lookup(self, scope: Hashable, term: str) -> Optional[Tuple[float, List[dict]]]:
+        """
+        在本地解析搜索
+        Args:
+            scope: 搜索范围
+            term: 搜索关键字
+        Returns:
+            (查询时间, 服务器列表)，本地无法给出完整结果时返回None
+        """
+        query = normalize(term)
+        deadline = time.time() - self.ttl
+        best = None
+        for (term_scope, known), entry in reversed(self._terms.items()):
+            fetched_at, complete, _ = entry
+            if term_scope != scope or fetched_at < deadline or known not in query:
+                continue
+            # 同一关键字的结果即使不完整也可以直接使用
+            if known != query and not complete:
+                continue
+            if best is None or len(known) > len(best[0]):
+                best = (known, entry)
+            if known == query:
+                break
+        if best is None:
+            self.misses += 1
+            return None
+
+        known, (fetched_at, _, servers) = best
+        if known != query:
+            servers = [server for server in servers if query in normalize(server.get("prefix", ""))]
+        self.hits += 1
+        return fetched_at, servers
+
+    def clear(self):
+        self._terms.clear()
@@ -0,0 +1,237 @@
+from astrbot.api import logger
+
+from .request_util import upstream_health, get_host, GAMETOOLS_API_SITE
+from .translation import normalize, set_locale
+from .gametool.gt_template import gt_servers_html_builder
+from ..models.player_data import PlayerDataRequest
+
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import asyncio
+import re
+import time
+
+_PLAYERS_PATTERN = re.compile(r"(\d+)\s*/\s*\d+")
+
+# 服务器名 -> (地图, 模式, 人数)
+ServerSnapshot = Dict[str, Tuple[str, str, int]]
+
+
+def _players(server: dict) -> int:
+    amount = server.get("playerAmount")
+    if isinstance(amount, int):
+        return amount
+    match = _PLAYERS_PATTERN.search(str(server.get("serverInfo", "")))
+    return int(match.group(1)) if match else 0
+
+
+def take_snapshot(servers_data: dict) -> ServerSnapshot:
+    """提取服务器列表中用于比较的字段"""
+    return {
+        server.get("prefix", ""): (server.get("currentMap", ""), server.get("mode", ""), _players(server))
+        for server in (servers_data.get("servers") or [])
+    }
+
+
+def diff_snapshots(old: ServerSnapshot, new: ServerSnapshot, min_player_delta: int) -> List[str]:
+    """
+    比较两次快照
+    Args:
+        old: 上一次推送时的快照
+        new: 本次快照
+        min_player_delta: 人数变化达到该值才视为有变化
+    Returns:
+        变化说明，没有明显变化时为空
+    """
+    changes = []
+    for name, (current_map, mode, players) in new.items():
+        previous = old.get(name)
+        if previous is None:
+            changes.append(f"{name} 上线")
+            continue
+        old_map, old_mode, old_players = previous
+        if current_map != old_map or mode != old_mode:
+            changes.append(f"{name} 换图: {old_map} -> {current_map}")
+        elif abs(players - old_players) >= min_player_delta:
+            changes.append(f"{name} 人数: {old_players} -> {players}")
+    for name in old.keys() - new.keys():
+        changes.append(f"{name} 离线")
+    return changes
+
+
+class ServerWatch:
+    """一个被监控的服务器搜索，多个会话监控同一搜索时共用"""
+
+    def __init__(self, game: str, server_name: str, lang: str):
+        self.game = game
+        self.server_name = server_name
+        self.lang = lang
+        self.subscribers: Dict[str, str] = {}  # 会话标识(unified_msg_origin) -> 语言
+        self.snapshot: Optional[ServerSnapshot] = None
+        self.last_polled = 0.0
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.game, normalize(self.server_name)
+
+
+class ServerWatcher:
+    """
+    定时轮询被监控的服务器列表，只有地图、模式或人数明显变化时才重新渲染并推送给订阅的会话。
+    同一游戏和服务器名的监控只请求一次上游，按订阅会话的语言各渲染一次。
+    """
+
+    def __init__(self, api_handlers, plugin_logic, html_render_func: Callable,
+                 notify: Callable[[str, str, str], Awaitable], interval: int = 120, min_player_delta: int = 5,
+                 max_watches: int = 20):
+        """
+        Args:
+            api_handlers: 接口处理器，提供服务器查询
+            plugin_logic: 插件逻辑，提供图片生成器和平台设置
+            html_render_func: 渲染函数
+            notify: 推送函数 notify(会话标识, 变化说明, 图片)
+            interval: 轮询间隔(秒)
+            min_player_delta: 人数变化达到该值才推送
+            max_watches: 最多同时监控的服务器搜索数
+        """
+        self.api_handlers = api_handlers
+        self.plugin_logic = plugin_logic
+        self.html_render = html_render_func
+        self.notify = notify
+        self.interval = interval
+        self.min_player_delta = min_player_delta
+        self.max_watches = max_watches
+        self._watches: Dict[Tuple[str, str], ServerWatch] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, origin: str, game: str, server_name: str, lang: str, locale: str,
+                  servers_data: dict = None) -> Tuple[Optional[ServerWatch], str]:
+        """
+        订阅服务器变化
+        Args:
+            origin: 会话标识
+            game: 游戏代号
+            server_name: 服务器搜索关键字
+            lang: 请求GameTools使用的语言
+            locale: 推送图片使用的语言
+            servers_data: 订阅时已查询到的数据，作为第一次快照
+        Returns:
+            (监控对象, 提示信息)，超出数量限制时监控对象为None
+        """
+        watch = ServerWatch(game, server_name, lang)
+        existing = self._watches.get(watch.key)
+        if existing is None:
+            if len(self._watches) >= self.max_watches:
+                return None, f"同时监控的服务器已达上限({self.max_watches})"
+            self._watches[watch.key] = existing = watch
+            if servers_data and servers_data.get("code") == 200:
+                existing.snapshot = take_snapshot(servers_data)
+                existing.last_polled = time.monotonic()
+        existing.subscribers[origin] = locale
+        self.start()
+        return existing, f"已开始监控 {server_name}，每{self.interval}秒检查一次，有变化时推送"
+
+    def unsubscribe(self, origin: str, server_name: str = None) -> int:
+        """
+        取消订阅
+        Args:
+            origin: 会话标识
+            server_name: 服务器搜索关键字，为空时取消该会话的所有监控
+        Returns:
+            取消的监控数
+        """
+        removed = 0
+        for key, watch in list(self._watches.items()):
+            if server_name and key[1] != normalize(server_name):
+                continue
+            if watch.subscribers.pop(origin, None) is not None:
+                removed += 1
+            if not watch.subscribers:
+                del self._watches[key]
+        return removed
+
+    def watches_of(self, origin: str) -> List[ServerWatch]:
+        return [watch for watch in self._watches.values() if origin in watch.subscribers]
+
+    def start(self):
+        """有监控时启动轮询任务"""
+        if self._watches and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        """停止轮询任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        logger.debug("Battlefield Tool 服务器监控任务已启动")
+        while self._watches:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll_round()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Battlefield Tool 服务器监控失败: {e}")
+        logger.debug("Battlefield Tool 没有监控的服务器，监控任务结束")
+
+    async def poll_round(self):
+        """轮询一次所有监控"""
+        host = get_host(GAMETOOLS_API_SITE)
+        for watch in list(self._watches.values()):
+            if not upstream_health.is_healthy(host):
+                logger.debug(f"Battlefield Tool 上游 {host} 不健康，暂停本轮服务器监控")
+                return
+            # 刚订阅的监控已有快照，等满一个间隔再查
+            if time.monotonic() - watch.last_polled < self.interval * 0.5:
+                continue
+            try:
+                await self._poll(watch)
+            except Exception as e:
+                logger.warning(f"Battlefield Tool 监控服务器 {watch.server_name} 失败: {e}")
+
+    async def _poll(self, watch: ServerWatch):
+        request_data = PlayerDataRequest(
+            message_str="",
+            lang=watch.lang,
+            qq_id="",
+            pider="",
+            ea_name=None,
+            game=watch.game,
+            server_name=watch.server_name,
+            error_msg=None,
+        )
+        servers_data = await self.api_handlers.fetch_gt_servers_data(
+            request_data, self.api_handlers.timeout_config, self.api_handlers._session, force_refresh=True)
+        watch.last_polled = time.monotonic()
+        if not isinstance(servers_data, dict) or servers_data.get("code") != 200:
+            return
+
+        snapshot = take_snapshot(servers_data)
+        if watch.snapshot is None:
+            watch.snapshot = snapshot
+            return
+        changes = diff_snapshots(watch.snapshot, snapshot, self.min_player_delta)
+        if not changes:
+            return
+        watch.snapshot = snapshot
+        servers_data.setdefault("__update_time", time.time())
+
+        # 每种语言只渲染一次
+        rendered: Dict[str, str] = {}
+        summary = "\n".join(changes[:10])
+        for origin, locale in list(watch.subscribers.items()):
+            if locale not in rendered:
+                set_locale(locale)
+                rendered[locale] = await self.plugin_logic.gt_image_generator.generate_servers_gt_data_pic(
+                    servers_data, watch.game, self.html_render, gt_servers_html_builder)
+            try:
+                await self.notify(origin, summary, rendered[locale])
+            except Exception as e:
+                logger.warning(f"Battlefield Tool 推送服务器变化失败 {origin}: {e}")
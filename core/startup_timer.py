@@ -0,0 +1,50 @@
+from astrbot.api import logger
+
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+import time
+
+
+class StartupTimer:
+    """记录插件加载各阶段的耗时，并在超出预算时给出警告"""
+
+    def __init__(self, start: Optional[float] = None, budget_ms: float = 500):
+        """
+        Args:
+            start: 计时起点(time.perf_counter)，默认为当前时间
+            budget_ms: 启动耗时预算(毫秒)
+        """
+        self.budget_ms = budget_ms
+        self._last = start if start is not None else time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+
+    def mark(self, name: str):
+        """记录从上一次标记到现在的耗时"""
+        now = time.perf_counter()
+        self.stages.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    @contextmanager
+    def stage(self, name: str):
+        """记录一个代码块的耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, (time.perf_counter() - start) * 1000))
+            self._last = time.perf_counter()
+
+    @property
+    def total_ms(self) -> float:
+        return sum(ms for _, ms in self.stages)
+
+    def report(self) -> str:
+        """输出一行启动耗时报告"""
+        detail = ", ".join(f"{name}={ms:.1f}ms" for name, ms in self.stages)
+        msg = f"Battlefield Tool 启动耗时 {self.total_ms:.1f}ms ({detail})"
+        if self.total_ms > self.budget_ms:
+            logger.warning(f"{msg}，超出预算 {self.budget_ms}ms")
+        else:
+            logger.info(msg)
+        return msg
@@ -0,0 +1,186 @@
+from .metrics import commands_total, command_latency
+from .log_policy import get_logger
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+import bisect
+import functools
+import time
+
+_log = get_logger("command")
+
+# 直方图桶上限(毫秒)
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class RequestTrace:
+    """一次指令处理过程中各阶段的耗时"""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.game = "-"
+        self.stages: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self.total_ms: Optional[float] = None
+
+    def add(self, stage: str, ms: float):
+        """同一阶段多次执行时累加"""
+        self.stages[stage] = self.stages.get(stage, 0.0) + ms
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+
+    def summary_line(self) -> str:
+        detail = ", ".join(f"{stage}={ms:.0f}ms" for stage, ms in self.stages.items())
+        return f"Battlefield Tool 指令耗时 {self.command}/{self.game} 总计{self.total_ms:.0f}ms ({detail})"
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("bf_request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+def set_trace_game(game: str):
+    """记录当前指令查询的游戏，解析出游戏代号后调用"""
+    trace = _current_trace.get()
+    if trace is not None and game:
+        trace.game = game
+
+
+# 当前正在计时的阶段中，嵌套阶段已用的毫秒数
+_child_ms: ContextVar[Optional[List[float]]] = ContextVar("bf_span_child_ms", default=None)
+
+
+@contextmanager
+def span(stage: str):
+    """
+    记录代码块的耗时到当前指令，不在指令中时不做任何事。
+    嵌套的阶段(如 build 中的 template)只计入内层，外层记录的是扣除内层后的耗时，各阶段相加不超过总耗时。
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    parent = _child_ms.get()
+    children = [0.0]
+    token = _child_ms.set(children)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        try:
+            _child_ms.reset(token)
+        except ValueError:
+            _child_ms.set(parent)
+        # 并发的子任务可能使内层合计超过外层耗时
+        trace.add(stage, max(elapsed - children[0], 0.0))
+        if parent is not None:
+            parent[0] += elapsed
+
+
+class Histogram:
+    """固定桶的耗时直方图"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def quantile(self, q: float) -> float:
+        """返回分位数所在桶的上限，不超过最大值"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(BUCKETS_MS[i], self.max) if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+
+class TimingRegistry:
+    """按 指令/游戏/阶段 汇总耗时直方图"""
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, str, str], Histogram] = {}
+
+    def observe(self, command: str, game: str, stage: str, ms: float):
+        key = (command, game, stage)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(ms)
+
+    def record(self, trace: RequestTrace):
+        for stage, ms in trace.stages.items():
+            self.observe(trace.command, trace.game, stage, ms)
+        if trace.total_ms is not None:
+            self.observe(trace.command, trace.game, "total", trace.total_ms)
+
+    def reset(self):
+        self.histograms.clear()
+
+    def summary(self, command: str = None) -> List[str]:
+        """
+        生成耗时汇总
+        Args:
+            command: 只汇总该指令，为空时汇总全部
+        Returns:
+            每个 指令/游戏/阶段 一行
+        """
+        lines = []
+        for (cmd, game, stage), h in sorted(self.histograms.items()):
+            if command and cmd != command:
+                continue
+            lines.append(
+                f"{cmd}/{game} {stage}: n={h.count} avg={h.total / h.count:.0f}ms "
+                f"p50≤{h.quantile(0.5):.0f}ms p90≤{h.quantile(0.9):.0f}ms p99≤{h.quantile(0.99):.0f}ms "
+                f"max={h.max:.0f}ms"
+            )
+        return lines
+
+
+timing_registry = TimingRegistry()
+
+
+def traced_command(command: str):
+    """为指令处理函数(异步生成器)记录各阶段耗时，结束时输出一行汇总日志"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            trace = RequestTrace(command)
+            token = _current_trace.set(trace)
+            try:
+                async for result in func(*args, **kwargs):
+                    yield result
+            finally:
+                try:
+                    _current_trace.reset(token)
+                except ValueError:
+                    # 生成器在其他上下文中被关闭
+                    _current_trace.set(None)
+                trace.finish()
+                timing_registry.record(trace)
+                commands_total.inc(command=trace.command, game=trace.game)
+                command_latency.observe(trace.total_ms / 1000, command=trace.command, game=trace.game)
+                _log.info("%s", trace.summary_line, key=f"command:summary:{trace.command}")
+
+        return wrapper
+
+    return decorator
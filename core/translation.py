@@ -0,0 +1,122 @@
+from astrbot.api import logger
+
+from . import json_util
+
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_LANG = "zh-cn"
+SUPPORTED_LANGS = ("zh-cn", "zh-tw", "en")
+LOCALES_DIR = Path(__file__).resolve().parent.parent / "constants" / "locales"
+
+# 当前请求使用的语言，由指令处理开始时根据会话设置
+_current_locale: ContextVar[str] = ContextVar("bf_locale", default=DEFAULT_LANG)
+
+
+def normalize(name: str) -> str:
+    """忽略大小写和多余空白，"M5C  " 与 "m5c" 视为同一个名称"""
+    return " ".join(str(name).split()).casefold()
+
+
+def normalize_lang(lang: Optional[str]) -> str:
+    """zh_TW、ZH-TW 等写法统一为 zh-tw，不支持的语言返回默认语言"""
+    lang = str(lang or "").strip().lower().replace("_", "-")
+    return lang if lang in SUPPORTED_LANGS else DEFAULT_LANG
+
+
+def current_locale() -> str:
+    return _current_locale.get()
+
+
+def set_locale(lang: Optional[str]) -> str:
+    """
+    设置当前请求的语言
+    Returns:
+        规范化后的语言
+    """
+    lang = normalize_lang(lang)
+    _current_locale.set(lang)
+    return lang
+
+
+class TranslationIndex:
+    """
+    地图、模式、武器/载具类别、载具、士兵名称以及卡片文字的多语言翻译表。
+    每种语言一个数据文件，首次使用该语言时加载并建立索引。
+    """
+
+    def __init__(self, locales_dir: Path = LOCALES_DIR):
+        self.locales_dir = locales_dir
+        self.override_dir: Optional[Path] = None
+        # 语言 -> kind -> 规范化名称 -> 译名
+        self._bundles: Dict[str, Dict[str, Dict[str, str]]] = {}
+
+    def configure(self, override_dir: Optional[Path]):
+        """
+        Args:
+            override_dir: 插件数据目录中的翻译目录，其中的 <语言>.json 格式与内置文件相同，同名条目覆盖内置翻译
+        """
+        self.override_dir = override_dir
+        self._bundles = {}
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, Dict[str, str]]:
+        return json_util.loads(path.read_bytes())
+
+    def _build(self, lang: str) -> Dict[str, Dict[str, str]]:
+        index: Dict[str, Dict[str, str]] = {}
+        sources = [self.locales_dir / f"{lang}.json"]
+        if self.override_dir is not None:
+            sources.append(self.override_dir / f"{lang}.json")
+        for path in sources:
+            if not path.exists():
+                continue
+            try:
+                data = self._read(path)
+            except Exception as e:
+                logger.error(f"Battlefield Tool 读取翻译文件失败 {path}: {e}")
+                continue
+            for kind, entries in data.items():
+                table = index.setdefault(kind, {})
+                for name, text in entries.items():
+                    table[normalize(name)] = text
+        return index
+
+    def reload(self):
+        self._bundles = {lang: self._build(lang) for lang in self._bundles}
+
+    def bundle(self, lang: str) -> Dict[str, Dict[str, str]]:
+        bundle = self._bundles.get(lang)
+        if bundle is None:
+            bundle = self._bundles[lang] = self._build(lang)
+        return bundle
+
+    def translate(self, kind: str, name: str, lang: Optional[str] = None) -> str:
+        """
+        翻译名称
+        Args:
+            kind: map/mode/weapon_category/vehicle_category/vehicle/soldier_class/soldier/ui
+            name: 接口返回的名称，ui 为简体中文原文
+            lang: 语言，为空时使用当前请求的语言
+        Returns:
+            译名，没有对应翻译时返回原名称
+        """
+        if not name:
+            return name
+        table = self.bundle(lang or _current_locale.get()).get(kind)
+        if not table:
+            return name
+        return table.get(normalize(name), name)
+
+
+translation_index = TranslationIndex()
+
+
+def translate(kind: str, name: str, lang: Optional[str] = None) -> str:
+    return translation_index.translate(kind, name, lang)
+
+
+def ui(text: str) -> str:
+    """卡片上的固定文字，模板中通过 {{ _("击杀") }} 调用"""
+    return translation_index.translate("ui", text)
@@ -10,3 +10,17 @@ def format_large_number(number: int) -> str:
         return f"{round(number / 1_000, 1)}K"
     else:
         return str(number)
+
+
+def page_count(total: int, page_size: int) -> int:
+    """列表分页后的页数，page_size 为0时不分页"""
+    if page_size <= 0 or total <= page_size:
+        return 1
+    return (total + page_size - 1) // page_size
+
+
+def page_slice(items: list, page: int, page_size: int) -> list:
+    """取出第 page 页(从0开始)，page_size 为0时返回整个列表"""
+    if page_size <= 0:
+        return items
+    return items[page * page_size:(page + 1) * page_size]
@@ -1,9 +1,13 @@
 from typing import Tuple, Optional, Union, Dict, List
 from astrbot.api.star import StarTools
-from astrbot.api import logger
+from ..core.metrics import db_query_latency
+from ..core.log_policy import get_logger, log_policy
 
 import aiosqlite
 import os
+import time
+
+_log = get_logger("db")
 
 
 class BattleFieldDataBase:
@@ -25,38 +29,38 @@ class BattleFieldDataBase:
         current_dir = os.path.dirname(os.path.abspath(__file__))
         sql_path = os.path.join(current_dir, "sql", "battleField_tool_plugin_init.sql")
 
-        logger.debug(f"尝试从路径加载初始化SQL: {sql_path}")
+        _log.debug("尝试从路径加载初始化SQL: %s", sql_path)
 
         if not os.path.exists(sql_path):
-            logger.error(f"初始化SQL文件不存在: {sql_path}")
+            _log.error("初始化SQL文件不存在: %s", sql_path)
             raise FileNotFoundError(f"初始化SQL文件不存在: {sql_path}")
 
         try:
             with open(sql_path, "r", encoding="utf-8") as f:
                 sql_script = f.read()
 
-            logger.debug(f"开始执行数据库初始化脚本，文件大小: {len(sql_script)} 字节")
+            _log.debug("开始执行数据库初始化脚本，文件大小: %s 字节", len(sql_script))
             await conn.executescript(sql_script)
             await conn.commit()
-            logger.debug("数据库表结构初始化成功")
+            _log.debug("数据库表结构初始化成功")
 
         except aiosqlite.Error as e:
-            logger.exception(f"数据库初始化失败: {e}")
+            _log.exception("数据库初始化失败: %s", e)
             raise RuntimeError(f"数据库初始化失败: {e}") from e
         except Exception as e:
-            logger.exception("未知错误发生在数据库初始化过程中")
+            _log.exception("未知错误发生在数据库初始化过程中")
             raise
 
     async def initialize(self):
         """异步初始化数据库"""
-        logger.debug("开始初始化战地风云工具数据库...")
+        _log.debug("开始初始化战地风云工具数据库...")
         # 先获取主连接
         self._conn = await self._get_conn()
-        logger.debug(f"数据库连接已建立: {self._conn}")
+        _log.debug("数据库连接已建立: %s", self.bf_db_path)
 
         # 使用主连接初始化表结构
         await self._init_db(self._conn)
-        logger.debug("战地风云数据库初始化完成")
+        _log.debug("战地风云数据库初始化完成")
 
     async def _get_conn(self) -> aiosqlite.Connection:
         """获取异步数据库连接(复用现有连接或创建新连接)
@@ -76,7 +80,7 @@ class BattleFieldDataBase:
             conn.text_factory = str
             return conn
         except aiosqlite.Error as e:
-            logger.error(f"数据库连接失败: {e}")
+            _log.error("数据库连接失败: %s", e)
             raise RuntimeError(f"无法连接到数据库: {e}")
 
     async def close(self):
@@ -94,6 +98,7 @@ class BattleFieldDataBase:
             params: 查询参数，可以是元组或字典
         """
         conn = await self._get_conn()
+        start = time.perf_counter()
         try:
             cursor = await conn.cursor()
             await cursor.execute(sql, params or ())
@@ -101,6 +106,8 @@ class BattleFieldDataBase:
         except aiosqlite.Error:
             await conn.rollback()
             raise
+        finally:
+            db_query_latency.observe(time.perf_counter() - start, op="exec")
 
     async def query(
         self,
@@ -124,6 +131,7 @@ class BattleFieldDataBase:
             aiosqlite.Error: 数据库操作失败时抛出
         """
         conn = await self._get_conn()
+        start = time.perf_counter()
         try:
             conn.row_factory = aiosqlite.Row  # 使结果可转为字典
             cursor = await conn.cursor()
@@ -142,5 +150,7 @@ class BattleFieldDataBase:
                 return None
 
         except aiosqlite.Error as e:
-            logger.error(f"查询失败: {e}\nSQL: {sql}\nParams: {params}")
+            _log.error("查询失败: %s\nSQL: %s\nParams: %s", e, sql, lambda: "***" if log_policy.redact else params)
             raise
+        finally:
+            db_query_latency.observe(time.perf_counter() - start, op="query")
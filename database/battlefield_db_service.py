@@ -1,4 +1,4 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from .battlefield_database import (
     BattleFieldDataBase,
 )
@@ -62,3 +62,21 @@ class BattleFieldDBService:
             (session_channel_id,),
             fetch_all=False,
         )
+
+    async def query_bind_users(self, qq_ids: List[str]) -> List[Dict]:
+        """批量查询绑定用户"""
+        if not qq_ids:
+            return []
+        placeholders = ",".join("?" for _ in qq_ids)
+        return await self.db.query(
+            f"SELECT * FROM battleField_user_binds WHERE qq_id IN ({placeholders})",
+            tuple(qq_ids),
+        )
+
+    async def count_rows(self) -> Dict[str, int]:
+        """统计各表的行数"""
+        counts = {}
+        for table in ("battleField_user_binds", "battleField_session_tags"):
+            row = await self.db.query(f"SELECT COUNT(*) AS total FROM {table}", fetch_all=False)
+            counts[table] = row["total"] if row else 0
+        return counts
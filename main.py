@@ -1,4 +1,9 @@
-from astrbot.api.event import filter, AstrMessageEvent
+import os
+import time
+
+_LOAD_START = time.perf_counter()
+
+from astrbot.api.event import filter, AstrMessageEvent, MessageChain
 from astrbot.api.star import Context, Star, StarTools, register
 from astrbot.api.all import AstrBotConfig
 from astrbot.api import logger
@@ -7,8 +12,25 @@ from .database.battlefield_database import BattleFieldDataBase
 from .database.battlefield_db_service import BattleFieldDBService
 from .core.plugin_logic import BattlefieldPluginLogic
 from .core.api_handlers import ApiHandlers
-
-import aiohttp
+from .core.refresh_scheduler import BindRefreshScheduler
+from .core.server_watch import ServerWatcher
+from .core.lifecycle import PluginLifecycle
+from .core.http_client import http_client
+from .core.startup_timer import StartupTimer
+from .core.render_scheduler import RenderScheduler
+from .core.render_backend import create_render_backend
+from .core.gametool.gt_raster import GtRasterRenderer, raster_available
+from .core.image_output import ImageOutputPolicy
+from .core.timing import traced_command, timing_registry
+from .core.metrics import metrics, MetricsExporter
+from .core import diagnostics
+from .core.profiler import command_profiler, profiled_command
+from .core.log_policy import get_logger, log_policy
+from .core.translation import translation_index
+from .core.image_override import image_overrides
+from .constants.battlefield_constants import TemplateConstants
+
+_log = get_logger("command")
 
 
 @register(
@@ -21,6 +43,8 @@ class BattlefieldTool(Star):
 
     def __init__(self, context: Context, config: AstrBotConfig = None):
         super().__init__(context)
+        self.startup_timer = StartupTimer(_LOAD_START)
+        self.startup_timer.mark("import")
         self.config = config
         self.wake_prefix = context.get_config().get("wake_prefix")
 
@@ -31,6 +55,51 @@ class BattlefieldTool(Star):
             self.timeout_config = 15
             self.img_quality = 90
             self.ssc_token = ""
+            self.cache_ttl = 300
+            self.cache_max_mb = 64
+            self.refresh_enabled = True
+            self.refresh_interval = 240
+            self.refresh_active_hours = 24
+            self.refresh_btr_per_minute = 2
+            self.http_pool_limit = 100
+            self.http_pool_limit_per_host = 10
+            self.http_keepalive_timeout = 30
+            self.http_dns_cache_ttl = 300
+            self.precompile_templates = False
+            self.template_dev_reload = False
+            self.render_concurrency = 2
+            self.render_queue_size = 10
+            self.render_queue_timeout = 60
+            self.render_backend = "remote"
+            self.render_pool_size = 2
+            self.render_browser_args = []
+            self.stat_renderer = "html"
+            self.raster_stat_channels = []
+            self.raster_font_path = ""
+            self.image_format = "jpeg"
+            self.image_max_kb = 0
+            self.mobile_width = 480
+            self.mobile_channels = []
+            self.webp_platforms = ["telegram", "discord"]
+            self.startup_budget_ms = 500
+            self.metrics_exporter_enabled = False
+            self.metrics_exporter_host = "127.0.0.1"
+            self.metrics_exporter_port = 9464
+            self.profile_enabled = False
+            self.profile_every_n = 100
+            self.profile_slow_ms = 0
+            self.profile_keep = 20
+            self.log_levels = []
+            self.log_sample_rate = 1.0
+            self.log_rate_limit = 30
+            self.log_redact = True
+            self.locale = "zh-cn"
+            self.locale_channels = []
+            self.server_watch_interval = 120
+            self.server_watch_min_player_delta = 5
+            self.server_watch_max = 20
+            self.server_search_ttl = 60
+            self.list_page_size = 10
             self.bf_prompt = "请根据以下评判标准和数据从多个方面评价用户的游戏水平，注意要结合人设和上下文，保证对话不冲突，1.K/D(击杀/死亡比):薯薯:小于1，Pro:大于2.5说明： 高KD是Pro哥基础，但单纯KD高可能是架枪蹲人。Pro哥的KD是在高强度突击和救点中打出来的。2.KPM(每分钟击杀):薯薯:小于0.7，Pro:大于1.5说明： 这是衡量你击杀效率的关键指标。KPM低而KD高，大概率是喜欢偷偷地躲起来蹲人，可以适当调侃这些胆小鬼。3.命中率&爆头率这个指标要综合判断，不能直接根据这个参数判断是不是pro哥命中率要根据枪械来看，喷子命中即使超过100%也是正常的，其他种类枪械正常玩家也不会太高爆头率狙击枪超过90%也可以算正常玩家过低的爆头率可能是载具玩家两个指标都超过50%很有可能是挂钩，遇到挂钩直接开喷，谨慎使用，枪械数据量较少时可能是巧合4.急救数神医专属指标5.载具注意击杀和摧毁，击杀特别多但摧毁特别少的那就是捞薯凶手、恐怖铁皮人(只能用来调侃坦克)补充：可以根据玩家使用武器、载具、飞机的偏好分为不同的Pro哥"
         else:
             logger.debug("BattlefieldTool: 使用用户配置文件")
@@ -38,28 +107,165 @@ class BattlefieldTool(Star):
             self.timeout_config = config.get("timeout_config", 15)
             self.img_quality = config.get("img_quality", 90)
             self.ssc_token = config.get("ssc_token", "")
+            self.cache_ttl = config.get("cache_ttl", 300)
+            self.cache_max_mb = config.get("cache_max_mb", 64)
+            self.refresh_enabled = config.get("refresh_enabled", True)
+            self.refresh_interval = config.get("refresh_interval", 240)
+            self.refresh_active_hours = config.get("refresh_active_hours", 24)
+            self.refresh_btr_per_minute = config.get("refresh_btr_per_minute", 2)
+            self.http_pool_limit = config.get("http_pool_limit", 100)
+            self.http_pool_limit_per_host = config.get("http_pool_limit_per_host", 10)
+            self.http_keepalive_timeout = config.get("http_keepalive_timeout", 30)
+            self.http_dns_cache_ttl = config.get("http_dns_cache_ttl", 300)
+            self.precompile_templates = config.get("precompile_templates", False)
+            self.template_dev_reload = config.get("template_dev_reload", False)
+            self.render_concurrency = config.get("render_concurrency", 2)
+            self.render_queue_size = config.get("render_queue_size", 10)
+            self.render_queue_timeout = config.get("render_queue_timeout", 60)
+            self.render_backend = config.get("render_backend", "remote")
+            self.render_pool_size = config.get("render_pool_size", 2)
+            self.render_browser_args = config.get("render_browser_args", [])
+            self.stat_renderer = config.get("stat_renderer", "html")
+            self.raster_stat_channels = config.get("raster_stat_channels", [])
+            self.raster_font_path = config.get("raster_font_path", "")
+            self.image_format = config.get("image_format", "jpeg")
+            self.image_max_kb = config.get("image_max_kb", 0)
+            self.mobile_width = config.get("mobile_width", 480)
+            self.mobile_channels = config.get("mobile_channels", [])
+            self.webp_platforms = config.get("webp_platforms", ["telegram", "discord"])
+            self.startup_budget_ms = config.get("startup_budget_ms", 500)
+            self.metrics_exporter_enabled = config.get("metrics_exporter_enabled", False)
+            self.metrics_exporter_host = config.get("metrics_exporter_host", "127.0.0.1")
+            self.metrics_exporter_port = config.get("metrics_exporter_port", 9464)
+            self.profile_enabled = config.get("profile_enabled", False)
+            self.profile_every_n = config.get("profile_every_n", 100)
+            self.profile_slow_ms = config.get("profile_slow_ms", 0)
+            self.profile_keep = config.get("profile_keep", 20)
+            self.log_levels = config.get("log_levels", [])
+            self.log_sample_rate = config.get("log_sample_rate", 1.0)
+            self.log_rate_limit = config.get("log_rate_limit", 30)
+            self.log_redact = config.get("log_redact", True)
+            self.locale = config.get("locale", "zh-cn")
+            self.locale_channels = config.get("locale_channels", [])
+            self.server_watch_interval = config.get("server_watch_interval", 120)
+            self.server_watch_min_player_delta = config.get("server_watch_min_player_delta", 5)
+            self.server_watch_max = config.get("server_watch_max", 20)
+            self.server_search_ttl = config.get("server_search_ttl", 60)
+            self.list_page_size = config.get("list_page_size", 10)
             self.bf_prompt = config.get("bf_prompt",
                                         "请根据以下评判标准和数据从多个方面评价用户的游戏水平，注意要结合人设和上下文，保证对话不冲突，1.K/D(击杀/死亡比):薯薯:小于1，Pro:大于2.5说明： 高KD是Pro哥基础，但单纯KD高可能是架枪蹲人。Pro哥的KD是在高强度突击和救点中打出来的。2.KPM(每分钟击杀):薯薯:小于0.7，Pro:大于1.5说明： 这是衡量你击杀效率的关键指标。KPM低而KD高，大概率是喜欢偷偷地躲起来蹲人，可以适当调侃这些胆小鬼。3.命中率&爆头率这个指标要综合判断，不能直接根据这个参数判断是不是pro哥命中率要根据枪械来看，喷子命中即使超过100%也是正常的，其他种类枪械正常玩家也不会太高爆头率狙击枪超过90%也可以算正常玩家过低的爆头率可能是载具玩家两个指标都超过50%很有可能是挂钩，遇到挂钩直接开喷，谨慎使用，枪械数据量较少时可能是巧合4.急救数神医专属指标5.载具注意击杀和摧毁，击杀特别多但摧毁特别少的那就是捞薯凶手、恐怖铁皮人(只能用来调侃坦克)补充：可以根据玩家使用武器、载具、飞机的偏好分为不同的Pro哥")
 
+        log_policy.configure(self.log_levels, self.log_sample_rate, self.log_rate_limit, self.log_redact)
+        self.startup_timer.budget_ms = self.startup_budget_ms
+        self.startup_timer.mark("config")
+        self.lifecycle = PluginLifecycle()  # 管理后台任务和资源的回收
         self.bf_data_path = StarTools.get_data_dir("battleField_tool_plugin")
+        self.renderer = create_render_backend(self.render_backend, self.html_render, self.bf_data_path / "renders",
+                                              self.render_pool_size, self.render_browser_args)
+        self.render_scheduler = RenderScheduler(self.render_concurrency, self.render_queue_size,
+                                                self.render_queue_timeout)  # 限制同时进行的渲染数量
+        self.render_func = self.lifecycle.wrap_render(self.render_scheduler.wrap(self.renderer))
         self.db = BattleFieldDataBase(self.bf_data_path)  # 初始化数据库
+        TemplateConstants.configure(self.bf_data_path / "template_cache", self.template_dev_reload)
+        translation_index.configure(self.bf_data_path / "locales")  # 数据目录中的翻译覆盖内置翻译
+        image_overrides.configure(self.bf_data_path / "image_overrides.json")  # 数据目录中的替换图片，修改后自动生效
         self.db_service = BattleFieldDBService(self.db)  # 初始化数据库服务
         self._session = None
         self.default_platform = "pc"  # 默认平台
         self.plugin_logic = BattlefieldPluginLogic(self.db_service, self.default_game, self.timeout_config,
                                                    self.img_quality,
                                                    self._session, self.bf_prompt, self.default_platform)
-        self.api_handlers = ApiHandlers(self.plugin_logic, self.html_render, self.timeout_config, self.ssc_token,
-                                        self._session)
+        self.plugin_logic.configure_locale(self.locale, self.locale_channels)
+        self.plugin_logic.list_page_size = self.list_page_size
+        if self.stat_renderer == "raster" or self.raster_stat_channels:
+            if raster_available():
+                self.plugin_logic.raster_renderer = GtRasterRenderer(self.bf_data_path / "renders", self.img_quality,
+                                                                     self.raster_font_path,
+                                                                     timeout=self.timeout_config)
+                self.plugin_logic.raster_stat_all = self.stat_renderer == "raster"
+                self.plugin_logic.raster_stat_channels = {str(c) for c in self.raster_stat_channels}
+            else:
+                logger.warning("Battlefield Tool 未安装Pillow，stat仍使用html渲染")
+        self.plugin_logic.image_output = ImageOutputPolicy(self.bf_data_path / "renders", self.image_format,
+                                                           self.img_quality, self.image_max_kb * 1024,
+                                                           self.mobile_width, self.mobile_channels,
+                                                           self.webp_platforms, self.timeout_config)
+        self.api_handlers = ApiHandlers(self.plugin_logic, self.render_func, self.timeout_config, self.ssc_token,
+                                        self._session, self.cache_ttl, self.cache_max_mb * 1024 * 1024,
+                                        self.server_search_ttl)
+        self.refresh_scheduler = BindRefreshScheduler(self.db_service, self.api_handlers, self.plugin_logic,
+                                                      self.refresh_interval, self.refresh_active_hours,
+                                                      self.refresh_btr_per_minute)
+        self.server_watcher = ServerWatcher(self.api_handlers, self.plugin_logic, self.render_func,
+                                            self._push_server_update, self.server_watch_interval,
+                                            self.server_watch_min_player_delta, self.server_watch_max)
+        self._register_metrics()
+        command_profiler.configure(self.bf_data_path / "profiles", self.profile_enabled, self.profile_every_n,
+                                   self.profile_slow_ms, self.profile_keep)
+        self.startup_timer.mark("components")
 
     async def initialize(self):
         """可选择实现异步的插件初始化方法，当实例化该插件类之后会自动调用该方法。"""
-        self._session = aiohttp.ClientSession()
-        await self.db.initialize()  # 添加数据库初始化调用
+        with self.startup_timer.stage("http"):
+            http_client.configure(self.http_pool_limit, self.http_pool_limit_per_host, self.http_keepalive_timeout,
+                                  self.http_dns_cache_ttl)
+            self._session = http_client.session
+            self.lifecycle.add_closer("aiohttp_session", http_client.close)
+        with self.startup_timer.stage("database"):
+            await self.db.initialize()  # 添加数据库初始化调用
+            self.lifecycle.add_closer("database", self.db.close)
+        self.lifecycle.add_closer("render_backend", self.renderer.close)
+        if self.precompile_templates:
+            with self.startup_timer.stage("templates"):
+                TemplateConstants.precompile(self.bf_data_path / "templates_compiled")
         self.plugin_logic._session = self._session  # 更新handlers中的session
         self.api_handlers._session = self._session  # 更新api_handlers中的session
+        self.lifecycle.add_closer("server_watch", self.server_watcher.stop)
+        if self.refresh_enabled:
+            self.plugin_logic.refresh_scheduler = self.refresh_scheduler
+            self.lifecycle.track(self.refresh_scheduler.start())
+        if self.metrics_exporter_enabled:
+            exporter = MetricsExporter(metrics, self.metrics_exporter_host, self.metrics_exporter_port)
+            try:
+                await exporter.start()
+                self.lifecycle.add_closer("metrics_exporter", exporter.close)
+            except OSError as e:
+                # 端口被占用等绑定失败时 runner 已经 setup，需要释放
+                await exporter.close()
+                logger.error(f"Battlefield Tool 指标接口启动失败: {e}")
+        self.startup_timer.report()
+
+    def _register_metrics(self):
+        """把缓存和渲染队列已有的统计登记为指标，导出时读取"""
+        cache = self.api_handlers.cache
+        scheduler = self.render_scheduler
+        metrics.callback("bf_cache_hits_total", "API cache hits", "counter", lambda: [({}, cache.hits)])
+        metrics.callback("bf_cache_misses_total", "API cache misses", "counter", lambda: [({}, cache.misses)])
+        metrics.callback("bf_cache_entries", "API cache entries", "gauge", lambda: [({}, len(cache))])
+        metrics.callback("bf_cache_bytes", "API cache size in bytes", "gauge", lambda: [({}, cache.total_bytes)])
+        server_index = self.api_handlers.server_index
+        metrics.callback("bf_server_search_local_total", "Server searches resolved locally", "counter",
+                         lambda: [({}, server_index.hits)])
+        metrics.callback("bf_server_search_upstream_total", "Server searches sent upstream", "counter",
+                         lambda: [({}, server_index.misses)])
+        metrics.callback("bf_render_queue_depth", "Renders waiting for a slot", "gauge",
+                         lambda: [({}, scheduler.waiting)])
+        metrics.callback("bf_render_running", "Renders in progress", "gauge", lambda: [({}, scheduler.running)])
+        metrics.callback("bf_render_rejected_total", "Renders rejected by the queue", "counter",
+                         lambda: [({}, scheduler.rejected + scheduler.timed_out)])
+
+    @staticmethod
+    def _to_message_result(event: AstrMessageEvent, result):
+        """把查询结果转换为消息：图片地址或本地渲染的图片发送图片，其他文本(如错误提示)直接发送"""
+        if isinstance(result, str):
+            if "http" in result or os.path.isfile(result):
+                return event.image_result(result)
+            return event.plain_result(result)
+        return result
 
     @filter.command("stat")
+    @traced_command("stat")
+    @profiled_command("stat")
     async def bf_stat(self, event: AstrMessageEvent):
         """查询用户数据"""
 
@@ -68,19 +274,18 @@ class BattlefieldTool(Star):
         if request_data.error_msg:
             yield event.plain_result(request_data.error_msg)
             return
-        logger.info(f"玩家id:{request_data.ea_name}，所查询游戏:{request_data.game}")
+        _log.info("玩家id:%s，所查询游戏:%s", lambda: log_policy.redact_name(request_data.ea_name), request_data.game)
 
         if request_data.game in ["bf2042", "bf6"]:
             async for result in self.api_handlers.handle_btr_game(event, request_data, "stat"):
-                if not "http" in result:
-                    yield event.plain_result(result)
-                else:
-                    yield event.image_result(result)
+                yield self._to_message_result(event, result)
         else:
             async for result in self.api_handlers.fetch_gt_data(event, request_data, "stat", "all"):
-                yield event.image_result(result)
+                yield self._to_message_result(event, result)
 
     @filter.command("weapons", alias=["武器"])
+    @traced_command("weapons")
+    @profiled_command("weapons")
     async def bf_weapons(self, event: AstrMessageEvent):
         """查询用户武器数据"""
         request_data = await self.plugin_logic.handle_player_data_request(event, ["weapons", "武器"])
@@ -89,16 +294,18 @@ class BattlefieldTool(Star):
             yield event.plain_result(request_data.error_msg)
             return
 
-        logger.info(f"玩家id:{request_data.ea_name}，所查询游戏:{request_data.game}")
+        _log.info("玩家id:%s，所查询游戏:%s", lambda: log_policy.redact_name(request_data.ea_name), request_data.game)
 
         if request_data.game in ["bf2042", "bf6"]:
             async for result in self.api_handlers.handle_btr_game(event, request_data, "weapons"):
-                yield event.image_result(result)
+                yield self._to_message_result(event, result)
         else:
             async for result in self.api_handlers.fetch_gt_data(event, request_data, "weapons", "weapons"):
-                yield event.image_result(result)
+                yield self._to_message_result(event, result)
 
     @filter.command("vehicles", alias=["载具"])
+    @traced_command("vehicles")
+    @profiled_command("vehicles")
     async def bf_vehicles(self, event: AstrMessageEvent):
         """查询载具数据"""
         request_data = await self.plugin_logic.handle_player_data_request(event, ["vehicles", "载具"])
@@ -107,15 +314,17 @@ class BattlefieldTool(Star):
             yield event.plain_result(request_data.error_msg)
             return
 
-        logger.info(f"玩家id:{request_data.ea_name}，所查询游戏:{request_data.game}")
+        _log.info("玩家id:%s，所查询游戏:%s", lambda: log_policy.redact_name(request_data.ea_name), request_data.game)
         if request_data.game in ["bf2042", "bf6"]:
             async for result in self.api_handlers.handle_btr_game(event, request_data, "vehicles"):
-                yield event.image_result(result)
+                yield self._to_message_result(event, result)
         else:
             async for result in self.api_handlers.fetch_gt_data(event, request_data, "vehicles", "vehicles"):
-                yield event.image_result(result)
+                yield self._to_message_result(event, result)
 
     @filter.command("soldiers", alias=["士兵"])
+    @traced_command("soldiers")
+    @profiled_command("soldiers")
     async def bf_soldier(self, event: AstrMessageEvent):
         """查询士兵数据 (仅限bf2042,bf6)"""
         request_data = await self.plugin_logic.handle_player_data_request(event, ["soldiers", "士兵"])
@@ -128,13 +337,21 @@ class BattlefieldTool(Star):
             yield event.plain_result("士兵查询目前仅支持战地2042、bf6。")
             return
 
-        logger.info(f"玩家id:{request_data.ea_name}，所查询游戏:{request_data.game}")
+        _log.info("玩家id:%s，所查询游戏:%s", lambda: log_policy.redact_name(request_data.ea_name), request_data.game)
         async for result in self.api_handlers.handle_btr_game(event, request_data, "soldiers"):
-            yield event.image_result(result)
+            yield self._to_message_result(event, result)
 
     @filter.command("servers", alias=["服务器"])
+    @traced_command("servers")
+    @profiled_command("servers")
     async def bf_servers(self, event: AstrMessageEvent):
-        """查询服务器数据"""
+        """查询服务器数据，servers watch/unwatch [服务器名] 监控服务器变化"""
+        action, keyword, args = self.plugin_logic.parse_server_watch_action(event.message_str)
+        if action is not None:
+            async for result in self._handle_server_watch(event, action, keyword, args):
+                yield result
+            return
+
         request_data = await self.plugin_logic.handle_player_data_request(event, ["servers", "服务器"])
 
         if request_data.error_msg:
@@ -149,15 +366,65 @@ class BattlefieldTool(Star):
             yield event.plain_result("请提供服务器名称进行查询哦~")  # 优化提示信息
             return
 
-        logger.info(f"查询服务器:{request_data.server_name}，所查询游戏:{request_data.game}")
+        _log.info("查询服务器:%s，所查询游戏:%s", request_data.server_name, request_data.game)
         servers_data = await self.api_handlers.fetch_gt_servers_data(
             request_data, self.timeout_config, self._session
         )
 
         async for result in self.plugin_logic.process_api_response(
-                event, servers_data, "servers", request_data.game, self.html_render
+                event, servers_data, "servers", request_data.game, self.render_func
+        ):
+            yield self._to_message_result(event, result)
+
+    async def _handle_server_watch(self, event: AstrMessageEvent, action: str, keyword: str, args: str):
+        """处理 servers watch/unwatch"""
+        origin = event.unified_msg_origin
+        if action == "unwatch":
+            server_name = args.split(",")[0].split("，")[0].strip() or None
+            removed = self.server_watcher.unsubscribe(origin, server_name)
+            yield event.plain_result(f"已取消{removed}个服务器监控" if removed else "当前会话没有对应的服务器监控")
+            return
+
+        if not args.strip():
+            watches = self.server_watcher.watches_of(origin)
+            if not watches:
+                yield event.plain_result("当前会话没有监控的服务器，使用 servers watch [服务器名] 开始监控")
+                return
+            lines = [f"{watch.server_name} ({watch.game}) 订阅会话:{len(watch.subscribers)}" for watch in watches]
+            yield event.plain_result("正在监控的服务器:\n" + "\n".join(lines))
+            return
+
+        request_data = await self.plugin_logic.handle_player_data_request(event, ["servers", "服务器", keyword])
+        if request_data.error_msg:
+            yield event.plain_result(request_data.error_msg)
+            return
+        if request_data.game in ["bf2042", "bf6"]:
+            yield event.plain_result("暂不支持bf2042、bf6的服务器查询")
+            return
+        if request_data.server_name is None:
+            yield event.plain_result("请提供要监控的服务器名称哦~")
+            return
+
+        _log.info("监控服务器:%s，所查询游戏:%s", request_data.server_name, request_data.game)
+        servers_data = await self.api_handlers.fetch_gt_servers_data(
+            request_data, self.timeout_config, self._session
+        )
+        locale = self.plugin_logic.resolve_locale(self.plugin_logic.get_session_channel_id(event))
+        watch, message = self.server_watcher.subscribe(origin, request_data.game, request_data.server_name,
+                                                       request_data.lang, locale, servers_data)
+        yield event.plain_result(message)
+        if watch is None:
+            return
+        async for result in self.plugin_logic.process_api_response(
+                event, servers_data, "servers", request_data.game, self.render_func
         ):
-            yield result
+            yield self._to_message_result(event, result)
+
+    async def _push_server_update(self, origin: str, summary: str, pic: str):
+        """推送被监控服务器的变化"""
+        chain = MessageChain().message(summary)
+        chain = chain.url_image(pic) if str(pic).startswith("http") else chain.file_image(pic)
+        await self.context.send_message(origin, chain)
 
     @filter.command("bind", alias=["绑定"])
     async def bf_bind(self, event: AstrMessageEvent):
@@ -192,12 +459,12 @@ class BattlefieldTool(Star):
                 game (string):  游戏代号(可选bf4、bf1、bfv、bf2042、bf6)，用户没有指明就不要填，函数会自动查询
                 ea_name (string): 查询其他人时EA的账户名，注意是EA账户名，不是用户id，用户没有指明就不要填，函数会自动查询
         """
-        logger.debug(f"""{ea_name},{user_id},{game}""")
+        _log.debug("%s,%s,%s", lambda: log_policy.redact_name(ea_name), lambda: log_policy.redact_name(user_id), game)
         request_data = await self.plugin_logic.handle_player_llm_request(event, ea_name, user_id, game)
         if request_data.error_msg:
             yield request_data.error_msg
             return
-        logger.info(f"玩家id:{request_data.ea_name}，所查询游戏:{request_data.game}")
+        _log.info("玩家id:%s，所查询游戏:%s", lambda: log_policy.redact_name(request_data.ea_name), request_data.game)
         if request_data.game in ["bf2042", "bf6"]:
             async for result in self.api_handlers.handle_btr_game(event, request_data, "stat", True):
                 yield result
@@ -237,6 +504,86 @@ class BattlefieldTool(Star):
             )
             yield event.plain_result(msg)
 
+    @filter.command("bf_timing")
+    async def bf_timing(self, event: AstrMessageEvent):
+        """查看各指令分阶段的耗时统计，bf_timing reset 清空统计"""
+        if not event.is_admin():
+            yield event.plain_result("没有权限哦，只有机器人管理员能使用[bf_timing]命令呢")
+            return
+
+        arg = event.message_str.replace("bf_timing", "", 1).strip()
+        if arg == "reset":
+            timing_registry.reset()
+            yield event.plain_result("耗时统计已清空")
+            return
+
+        lines = timing_registry.summary(arg or None)
+        if not lines:
+            yield event.plain_result("暂无耗时统计")
+            return
+        yield event.plain_result("\n".join(lines))
+
+    @filter.command("bf_metrics")
+    async def bf_metrics(self, event: AstrMessageEvent):
+        """查看Prometheus格式的指标，bf_metrics [指标名前缀]"""
+        if not event.is_admin():
+            yield event.plain_result("没有权限哦，只有机器人管理员能使用[bf_metrics]命令呢")
+            return
+
+        prefix = event.message_str.replace("bf_metrics", "", 1).strip()
+        text = metrics.render(prefix)
+        # 聊天中省略直方图的桶，只保留总数和总和
+        lines = [line for line in text.splitlines() if line and not line.startswith("#") and "_bucket{" not in line]
+        yield event.plain_result("\n".join(lines) or "暂无指标")
+
+    @filter.command("bf_status")
+    async def bf_status(self, event: AstrMessageEvent):
+        """查看插件运行状态，bf_status test 额外渲染一张样例卡片"""
+        if not event.is_admin():
+            yield event.plain_result("没有权限哦，只有机器人管理员能使用[bf_status]命令呢")
+            return
+
+        lines = diagnostics.format_upstream_health()
+        lines += diagnostics.format_cache_section(self.api_handlers.cache)
+        lines.append(diagnostics.format_render_stats(self.render_scheduler.stats()))
+        try:
+            lines.append(diagnostics.format_db_stats(self.db.bf_db_path, await self.db_service.count_rows()))
+        except Exception as e:
+            lines.append(f"数据库: 查询失败 {e}")
+
+        self_test = event.message_str.replace("bf_status", "", 1).strip() == "test"
+        if self_test:
+            ok, elapsed_ms, result = await diagnostics.render_self_test(self.render_func, self.img_quality)
+            lines.append(f"渲染自检: {'成功' if ok else '失败'} 耗时{elapsed_ms:.0f}ms" + ("" if ok else f" {result}"))
+        yield event.plain_result("\n".join(lines))
+        if self_test and ok:
+            yield self._to_message_result(event, result)
+
+    @filter.command("bf_profile")
+    async def bf_profile(self, event: AstrMessageEvent):
+        """开关性能采样: bf_profile on/off, bf_profile every [N], bf_profile slow [毫秒]"""
+        if not event.is_admin():
+            yield event.plain_result("没有权限哦，只有机器人管理员能使用[bf_profile]命令呢")
+            return
+
+        args = event.message_str.replace("bf_profile", "", 1).split()
+        try:
+            if args[:1] == ["on"]:
+                command_profiler.enabled = True
+            elif args[:1] == ["off"]:
+                command_profiler.enabled = False
+            elif args[:1] == ["every"] and len(args) == 2:
+                command_profiler.every_n = int(args[1])
+            elif args[:1] == ["slow"] and len(args) == 2:
+                command_profiler.slow_ms = float(args[1])
+            elif args:
+                yield event.plain_result("用法: bf_profile on/off, bf_profile every [N], bf_profile slow [毫秒]")
+                return
+        except ValueError:
+            yield event.plain_result("参数需要是数字哦~")
+            return
+        yield event.plain_result(command_profiler.status())
+
     @filter.command("bf_help")
     async def bf_help(self, event: AstrMessageEvent):
         """显示战地插件帮助信息"""
@@ -285,6 +632,8 @@ class BattlefieldTool(Star):
   server_name - 服务器名称(必填)
   game - 游戏代号(可选)
 示例: {prefix}servers 服务器名称,game=bf1
+监控: {prefix}servers watch [server_name],game=[游戏代号]，换图或人数明显变化时推送
+  {prefix}servers watch 查看当前会话的监控，{prefix}servers unwatch [server_name] 取消监控(不填则取消全部)
 
 注: 实际使用时不需要输入[]。
 """
@@ -292,5 +641,4 @@ class BattlefieldTool(Star):
 
     async def terminate(self):
         """可选择实现异步的插件销毁方法，当插件卸载/停用时会调用。"""
-        if self._session:
-            await self._session.close()
+        await self.lifecycle.shutdown()
@@ -1,6 +1,8 @@
 from typing import List, Optional, Dict, Any
 
 from ..core.image_util import get_image_base64
+from ..core.translation import translate
+from ..core.image_override import override_image
 from ..core.utils import format_large_number
 
 
@@ -249,7 +251,7 @@ class Weapon:
         """从btr字典创建 Weapon 实例"""
         return cls(
             weapon_name=data.get("metadata").get("name", "--"),
-            category=Weapon._get_category(data.get("metadata").get("category", "--")),
+            category=translate("weapon_category", data.get("metadata").get("category", "--")),
             image_url="",
             image="",
             kills=data.get("stats").get("kills").get("value", 0),
@@ -271,13 +273,14 @@ class Weapon:
 
     @classmethod
     async def from_bf6_dict(cls, data: Dict[str, Any]):
-        image_url = Weapon._get_category(data.get("metadata").get("imageUrl", ""))
+        image_url = override_image("weapon", data.get("metadata").get("name", ""),
+                                   data.get("metadata").get("imageUrl", ""), "bf6")
         image = ""
         if image_url:
             image = await get_image_base64(image_url)
         return cls(
             weapon_name=data.get("metadata").get("name", "--"),
-            category=Weapon._get_category(data.get("metadata").get("categoryName", "--")),
+            category=translate("weapon_category", data.get("metadata").get("categoryName", "--")),
             image_url=image_url,
             image=image,
             kills=data.get("stats").get("kills").get("value", 0),
@@ -298,23 +301,6 @@ class Weapon:
             hipfire_kills="",
         )
 
-    @staticmethod
-    def _get_category(category_name):
-        category_map = {
-            "LMG": "轻机枪",
-            "Assault Rifles": "突击步枪",
-            "Sniper Rifles": "狙击步枪",
-            "Carbines": "卡宾枪",
-            "PDW": "冲锋枪",
-            "DMR": "精确射手步枪",
-            "Bolt Action": "狙击步枪",
-            "Lever-Action Carbines": "多功能",
-            "Shotguns": "霰弹枪",
-            "Pistols": "手枪",
-            "SMG": "冲锋枪",
-        }
-        return category_map.get(category_name, category_name)
-
     def to_llm_text(self) -> str:
         """预处理 Weapon 方便 llm 理解"""
         return f"""使用{self.category}{self.weapon_name}{self.time_played}小时，总共击杀了{self.kills}名敌军，该武器平均每分钟击杀{self.kills_per_minute}，爆头率{self.headshot_percentage},命中率{self.shots_accuracy}"""
@@ -371,8 +357,8 @@ class Vehicle:
     def from_btr_dict(cls, data: Dict[str, Any]):
         """从btr字典创建 Vehicle 实例"""
         return cls(
-            vehicle_name=Vehicle._get_vehicle_category(data.get("metadata").get("name", "--")),
-            category=Vehicle._get_category(data.get("metadata").get("category", "--")),
+            vehicle_name=translate("vehicle", data.get("metadata").get("name", "--")),
+            category=translate("vehicle_category", data.get("metadata").get("category", "--")),
             image_url="",
             image="",
             kills=data.get("stats").get("kills").get("value", 0),
@@ -395,13 +381,14 @@ class Vehicle:
 
     @classmethod
     async def from_bf6_dict(cls, data: Dict[str, Any]):
-        image_url = data.get("metadata").get("imageUrl", "")
+        image_url = override_image("vehicle", data.get("metadata").get("name", ""),
+                                   data.get("metadata").get("imageUrl", ""), "bf6")
         image = ""
         if image_url:
             image = await get_image_base64(image_url)
         return cls(
-            vehicle_name=Vehicle._get_vehicle_category(data.get("metadata").get("name", "--")),
-            category=Vehicle._get_category(data.get("metadata").get("categoryName", "--")),
+            vehicle_name=translate("vehicle", data.get("metadata").get("name", "--")),
+            category=translate("vehicle_category", data.get("metadata").get("categoryName", "--")),
             image_url=image_url,
             image=image,
             kills=data.get("stats").get("kills").get("value", 0),
@@ -424,58 +411,6 @@ class Vehicle:
             dmg_per_min="",
         )
 
-    @staticmethod
-    def _get_category(category_name):
-        category_map = {
-            # bf2042
-            "Land": "地载",
-            "Amphibious": "两栖载具",
-            "In-World": "地图载具",
-            "Plane": "空载",
-            "Helicopter": "旋翼",
-            "Stationary": "定点武器",
-            # bf6
-            "Surface - Light Ground Transport": "轻型地面运输",
-            "Surface - Main Battle Tank": "主战坦克",
-            "Surface - Infantry Fighting Vehicle": "步兵战车",
-            "Surface - Mobile Anti-Air": "防空",
-            "Surface - Transport": "运输",
-            "Aircraft - Attack Helicopter": "武装直升机",
-            "Aircraft - Attack Bomber": "攻击机",
-            "Aircraft - Fighter Jet": "空优机",
-            "Aircraft - Transport Helicopter": "运输机",
-
-        }
-        return category_map.get(category_name, category_name)
-
-    @staticmethod
-    def _get_vehicle_category(name):
-        category_map = {
-            # bf2042
-            "LATV4 Recon ": "轻型侦察车",
-            "M5C  ": "博尔特",
-            "EBAA Wildcat ": "小野猫 ",
-            "LCAA Hovercraft": "气垫船",
-            "MAV ": "MAV",
-            "F-35E Panther ": "F-35E",
-            "SU-57 FELON": "SU-57",
-            "MV38-Condor": "秃鹰",
-            "MD540 Nightbird ": "夜莺",
-            "AH-64GX Apache Warchief": "阿帕奇",
-            "KA-52 Alligator": "KA-52",
-            "Mi-240 Super Hind ": "超级雌鹿",
-            "M10 Wolverine": "狼獾",
-            "M4 Sherman": "谢尔曼",
-            "9K22 Tunguska-M": "通古斯卡",
-            "M1161 ITV": "咆哮者",
-            "Mi-28 Havoc": "Mi-28",
-            "Centurion C-RAM": "百夫长",
-            "RAH-68 Huron": "肖肖尼",
-            "YG-99 Hannibal": "汉尼拔",
-            "SU-70": "德鲁格",
-        }
-        return category_map.get(name, name)
-
     def to_llm_text(self) -> str:
         """预处理 Vehicle 方便 llm 理解"""
         return f"""使用{self.category}{self.vehicle_name},{self.time_played}小时,总共击杀了{self.kills}名敌军,该载具平均每分钟击杀{self.kills_per_minute},摧毁了{self.destroyed}辆载具。"""
@@ -518,8 +453,8 @@ class Soldier:
     def from_btr_dict(cls, data: Dict[str, Any]):
         """从btr字典创建 Soldier 实例"""
         return cls(
-            soldier_name=Soldier._get_soldier_name(data.get("metadata").get("name", "--")),
-            category=Soldier._get_category(data.get("metadata").get("category", "--")),
+            soldier_name=translate("soldier", data.get("metadata").get("name", "--")),
+            category=translate("soldier_class", data.get("metadata").get("category", "--")),
             image_url="",
             image="",
             kills=data.get("stats").get("kills").get("value", 0),
@@ -534,12 +469,13 @@ class Soldier:
 
     @classmethod
     async def from_bf6_dict(cls, data: Dict[str, Any]):
-        image_url = data.get("metadata").get("imageUrl", "")
+        image_url = override_image("soldier", data.get("metadata").get("name", ""),
+                                   data.get("metadata").get("imageUrl", ""), "bf6")
         image = ""
         if image_url:
             image = await get_image_base64(image_url)
         return cls(
-            soldier_name=Soldier._get_category(data.get("metadata").get("name", "--")),
+            soldier_name=translate("soldier_class", data.get("metadata").get("name", "--")),
             category="",
             image_url=image_url,
             image=image,
@@ -553,35 +489,6 @@ class Soldier:
             deaths=data.get("stats").get("deaths").get("displayValue", "--"),
         )
 
-    @staticmethod
-    def _get_category(category_name):
-        category_map = {
-            "Assault": "突击",
-            "Engineer": "工程",
-            "Support": "支援",
-            "Recon": "侦察",
-        }
-        return category_map.get(category_name, category_name)
-
-    @staticmethod
-    def _get_soldier_name(name):
-        soldier_map = {
-            "Mackay ": "麦凯",
-            "Sundance ": "日舞",
-            "Irish ": "爱尔兰佬",
-            "Casper ": "卡斯帕",
-            "Rao ": "拉奥",
-            "Dozer ": "推土机",
-            "Boris ": "鲍里斯",
-            "Paik ": "智秀",
-            "Lis": "莉斯",
-            "Crawford": "克劳福德",
-            "Zain": "扎因",
-            "Blasco": "布拉斯科",
-            "Falck ": "法尔克",
-        }
-        return soldier_map.get(name, name)
-
     def to_llm_text(self) -> str:
         """预处理 Soldier 方便 llm 理解"""
         return f"""最擅长使用{self.category}兵士兵{self.soldier_name},{self.time_played}小时中击杀了{self.kills}名敌军,平均每分钟击杀{self.kills_per_minute},击杀死亡比值{self.kd_ratio}。"""
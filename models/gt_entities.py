@@ -1,4 +1,5 @@
 from typing import List, Optional, Dict, Any
+from ..core.translation import translate
 
 class PlayerStats:
     """
@@ -195,8 +196,8 @@ class Server:
         return cls(
             name=data.get("prefix", "N/A"),
             image=data.get("url", ""),
-            current_map=Server._get_name_category(data.get("currentMap", "")),
-            mode=Server._get_mode_category(data.get("mode", "Unknown").lower()),
+            current_map=translate("map", data.get("currentMap", "")),
+            mode=translate("mode", data.get("mode", "Unknown")),
             server_info=data.get("serverInfo", "0/0"),
             country=data.get("country", "Unknown"),
         )
@@ -212,75 +213,5 @@ class Server:
             "country": self.country,
         }
 
-    @staticmethod
-    def _get_mode_category(category_name):
-        category_map = {
-            "conquest": "征服",
-            "conquest large": "大型征服",
-            "conquest small": "小型征服",
-            "domination": "阵地战",
-            "rush": "突袭(突破)",
-            "team deathmatch": "团队死斗",
-            "squad deathmatch": "小队死斗",
-            "obliteration": "拆除炸弹",
-            "defuse": "爆破",
-            "air superiority": "空中优势",
-            "carrier assault": "航母突袭",
-            "chain link": "环环相扣",
-            "capture the flag": "夺旗",
-            "gun master": "枪神",
-            "squad obliteration": "爆破",
-        }
-        return category_map.get(category_name, category_name)
-
-
-    @staticmethod
-    def _get_name_category(category_name):
-        category_map = {
-            # 原版地图
-            "Siege of Shanghai": " 上海之围 ",
-            "Operation Locker": " 极地监狱 ",
-            "Flood Zone": " 水乡泽国 ",
-            "Golmud Railway": " 荒野游踪 ",
-            "Paracel Storm": " 西沙风暴 ",
-            "Lancang Dam": " 水坝风云 ",
-            "Hainan Resort": " 度假胜地 ",
-            "Dawnbreaker": " 破晓行动 ",
-            "Rogue Transmission": " 广播中心 ",
-            "Zavod 311": " 废弃工厂 ",
-            "Zavod: Graveyard Shift": " 废弃工厂：大夜班 ",
-            "Dragon Valley 2015": " 龙之谷2015 ",
-            "Operation Outbreak": " 丛林计划 ",
-            #中国崛起
-            "Altai Range": " 阿尔泰山 ",
-            "Dragon Pass": " 龙隘之战 ",
-            "Guilin Peaks": " 桂林群山 ",
-            "Silk Road": " 丝绸之路 ",
-            #二次进击
-            "Caspian Border 2014": " 里海边境2014 ",
-            "Gulf of Oman 2014": " 阿曼湾2014 ",
-            "Operation Metro 2014": " 地铁行动2014 ",
-            "Firestorm 2014": " 火线风暴2014 ",
-            #海军风暴
-            "Lost Islands": " 失落岛屿 ",
-            "Nansha Strike": " 南沙风暴 ",
-            "Wave Breaker": " 消波礁岸 ",
-            "Operation Mortar": " 迫击行动 ",
-            #龙之獠牙
-            "Lumphini Garden": " 隆披尼花园 ",
-            "Pearl Market": " 红桥市场 ",
-            "Propaganda": " 政宣广场 ",
-            "Sunken Dragon": " 沉龙河畔 ",
-            #最终反击
-            "Giants of Karelia": " 卡雷利亚巨人 ",
-            "Hammerhead": " 双髻鲨基地 ",
-            "Hangar 21": "21 号机库 ",
-            "Operation Whiteout": " 雪盲行动 ",
-            #补充
-            "GUILIN PEAKS": " 桂林群山 ",
-            "SILK ROAD": " 丝绸之路 ",
-        }
-        return category_map.get(category_name, category_name)
-
     def __repr__(self):
         return f"Server(name='{self.name}', mode='{self.mode}', country='{self.country}')"